@@ -3,16 +3,63 @@
 from typing import Annotated
 
 from fastapi import Depends
+from starlette.requests import HTTPConnection
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
 from app.core.database import get_database
+from app.repositories.job_repository import JobRepository
+from app.services.job_service import JobService
+from app.services.probe_cache import MediaProbeCache
 from app.services.video_service import VideoService
 
 
-def get_video_service() -> VideoService:
-    """Get Video service instance.
+def get_video_service(request: HTTPConnection) -> VideoService:
+    """Get the video service created at startup.
+
+    Args:
+        request: Current HTTP request or WebSocket connection
+
+    Returns:
+        VideoService: Service instance shared by all requests (render engine and caches)
+    """
+    return request.app.state.video_service
+
+
+def get_media_probe_cache(request: HTTPConnection) -> MediaProbeCache:
+    """Get the media probe cache created at startup.
+
+    Args:
+        request: Current HTTP request or WebSocket connection
+
+    Returns:
+        MediaProbeCache: Cache instance
+    """
+    return request.app.state.probe_cache
+
+
+def get_job_repository(request: HTTPConnection) -> JobRepository:
+    """Get the job repository created at startup.
+
+    Args:
+        request: Current HTTP request or WebSocket connection
+
+    Returns:
+        JobRepository: Repository instance
+    """
+    return request.app.state.job_repository
+
+
+def get_job_service(
+    repository: Annotated[JobRepository, Depends(get_job_repository)],
+    video_service: Annotated[VideoService, Depends(get_video_service)],
+) -> JobService:
+    """Get Job service instance.
+
+    Args:
+        repository: Job repository
+        video_service: Video service
 
     Returns:
-        VideoService: Service instance
+        JobService: Service instance
     """
-    return VideoService()
+    return JobService(repository, video_service)
@@ -1,7 +1,7 @@
 """Configuration service using Pydantic Settings."""
 
 from functools import lru_cache
-from typing import Optional
+from typing import Literal, Optional
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -33,9 +33,99 @@ class Settings(BaseSettings):
     mongodb_min_pool_size: int = 10
     mongodb_max_pool_size: int = 100
 
+    # Render engine
+    render_workers: int | None = None  # None = available CPUs (cgroup quota aware)
+    render_max_in_flight: int | None = None  # None = 2 * render_workers
+    render_start_method: str = "spawn"  # spawn, forkserver or fork
+    render_max_tasks_per_child: int | None = None
+    render_cpu_budget: float | None = None  # encoder threads shared by renders, None = cgroup quota or CPU count
+    render_min_threads: int = 1  # threads given to a render even when the budget is exhausted
+    render_max_threads: int | None = 16  # x264 gains little beyond ~16 threads
+
+    # Rendering
+    resources_dir: str = "/app/ressources"  # RESOURCES_DIR
+    stream_copy_enabled: bool = True  # loop templates by stream copy when possible
+    render_encoder: Literal["moviepy", "ffmpeg"] = "moviepy"  # moviepy or ffmpeg, when stream copy is not possible
+    thumbnail_samples: int = 24  # keyframes scored when picking a thumbnail automatically
+
+    # Template cache (template encodings normalized with each output profile, under RESOURCES_DIR/template-cache)
+    template_cache_enabled: bool = True
+    template_cache_max_bytes: int = 2 * 1024 * 1024 * 1024
+
+    # Startup warm-up (/ready reports 503 until it has finished)
+    warm_render_processes: bool = True  # start the render processes and import the render modules
+    warm_templates: list[str] = []  # templates normalized at startup (JSON list of paths)
+    warm_template_fps: list[int] = [30]
+    warm_template_resolutions: list[str | None] = [None]  # null = native size
+    warm_music: list[str] = []  # background music decoded at startup (JSON list of paths)
+
+    # Encoded video tracks (RESOURCES_DIR/video-track-cache): audio-only remux when template and length match
+    video_track_cache_enabled: bool = True
+    video_track_cache_max_bytes: int = 2 * 1024 * 1024 * 1024
+
+    # Segmented encoding of long template renders: GOP-aligned segments encoded in parallel, then concatenated
+    segmented_render_enabled: bool = True
+    segment_min_duration: float = 300.0  # renders shorter than this are encoded in one pass
+    segment_seconds: float = 60.0  # target segment length, rounded up to a multiple of the GOP
+    segment_threads: int = 2  # encoder threads per segment
+    segment_workers: int | None = None  # segments encoded at once, None = render threads / SEGMENT_THREADS
+
+    # Remote inputs: http(s) URLs of background music and images (downloads under RESOURCES_DIR/asset-cache)
+    asset_cache_max_bytes: int = 2 * 1024 * 1024 * 1024
+    asset_max_download_bytes: int = 200 * 1024 * 1024  # larger downloads are rejected
+    asset_download_timeout: float = 60.0  # seconds per network operation (connect, read)
+    asset_max_concurrent_downloads: int = 8
+    asset_revalidate_after: float = 300.0  # seconds a cached URL is used before revalidation (ETag, Last-Modified)
+
+    # Decoded background music cache (RESOURCES_DIR/audio-cache)
+    audio_cache_max_bytes: int = 1024 * 1024 * 1024
+
+    # Render result cache (finished outputs under RESOURCES_DIR/render-cache, indexed by content key)
+    result_cache_enabled: bool = True
+    result_cache_max_bytes: int = 5 * 1024 * 1024 * 1024
+    results_collection: str = "render_results"
+
+    # Media probe cache (duration, streams, size of templates and music, keyed by path, size and mtime)
+    probe_cache_max_entries: int = 4096  # per process, least recently used entries are dropped
+    probe_cache_persist: bool = False  # also keep entries in MongoDB (shared by API processes and restarts)
+    probes_collection: str = "media_probes"
+
+    # Image slideshows (requests with images)
+    slideshow_width: int = 1920  # frame size when the profile keeps the source size;
+    slideshow_height: int = 1080  # other profiles keep this aspect ratio at their height
+    image_cache_max_bytes: int = 1024 * 1024 * 1024  # decoded, pre-scaled images (RESOURCES_DIR/image-cache)
+
+    # Scratch space (per-render temporary directories)
+    scratch_dir: str | None = None  # None = <tmp>/video-service
+    scratch_use_tmpfs: bool = False  # use /dev/shm when scratch_dir is not set
+    scratch_quota_bytes: int = 10 * 1024 * 1024 * 1024
+    scratch_stale_after: float = 6 * 3600  # seconds before leftovers are removed at startup
+
+    # Render jobs
+    job_store: str = "mongo"  # mongo or memory (also used for the render result index)
+    jobs_collection: str = "render_jobs"
+    job_worker_enabled: bool = True  # run a job worker inside the API process
+    job_worker_concurrency: int = 1
+    job_poll_interval: float = 1.0  # seconds between polls when the queue is empty
+    job_progress_interval: float = 2.0  # seconds between two progress writes to the job store
+    job_heartbeat_interval: float = 10.0  # seconds between two heartbeats of a running job
+    job_stale_after: float = 60.0  # running jobs without a heartbeat for this long are requeued (crashed worker)
+    worker_metrics_port: int | None = None  # standalone worker (app.worker): serve Prometheus metrics on this port
+
+    # Render progress (frames encoded, fps and ETA streamed to job event subscribers)
+    progress_interval: float = 0.5  # minimum seconds between two progress events of a render
+
+    # Health and readiness (/health, /ready)
+    health_loop_lag_interval: float = 0.5  # seconds between two event loop lag samples
+    health_mongo_timeout: float = 1.0  # seconds before a MongoDB ping is reported as failed
+    ready_max_loop_lag: float = 0.5  # event loop lag (seconds) above which /ready reports not ready
+    ready_min_scratch_free_bytes: int = 1024 * 1024 * 1024  # free scratch disk below which /ready reports not ready
+
     # Logging
     log_level: str = "INFO"
     log_format: str = "text"  # json or text
+    log_span_level: str = "DEBUG"  # level of the per-stage timing records (span ...)
+    log_progress_interval: float = 10.0  # seconds between two logged progress samples of a render, 0 = never
 
 
 @lru_cache
@@ -1,6 +1,7 @@
 """Database connection management."""
 
 import os
+import time
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
 from app.core.logging import get_logger
 from pymongo.server_api import ServerApi
@@ -12,12 +13,12 @@ logger = get_logger(__name__)
 
 # MongoDB client (will be initialized in lifespan)
 mongo_client: AsyncIOMotorClient | None = None
+db_client: AsyncIOMotorClient | None = None
 
 async def connect_to_mongo():
     global db_client, db   
     
-    print(f"📊 Connecting to MongoDB with:")
-    print(f"  - DB Name: {settings.DB_NAME}")
+    logger.info("Connecting to MongoDB database %s", settings.DB_NAME)
     
     # MongoDB connection string
     connection_string = settings.mongodb_url
@@ -28,19 +29,35 @@ async def connect_to_mongo():
         
         # Test connection
         await db_client.admin.command('ping')
-        print(f"✅ Successfully connected to MongoDB database: {settings.DB_NAME}")
+        logger.info("Connected to MongoDB database %s", settings.DB_NAME)
         
     except Exception as e:
-        print(f"❌ Error connecting to MongoDB: {e}")
+        logger.error("Error connecting to MongoDB: %s", e)
         raise
     
 async def close_mongo_connection():
     global db_client
     if db_client:
         db_client.close()
-        print("MongoDB connection closed")
+        logger.info("MongoDB connection closed")
 
 def get_database() -> AsyncIOMotorDatabase:
     if db_client is None:
         raise RuntimeError("Database not initialized")
     return db_client[settings.DB_NAME]
+
+
+async def ping() -> float:
+    """Ping MongoDB.
+
+    Returns:
+        float: Round-trip time in seconds
+
+    Raises:
+        RuntimeError: If the database is not initialized
+    """
+    if db_client is None:
+        raise RuntimeError("Database not initialized")
+    start = time.perf_counter()
+    await db_client.admin.command('ping')
+    return time.perf_counter() - start
@@ -52,6 +52,20 @@ class UnauthorizedException(AppException):
         super().__init__(message=message, status_code=status.HTTP_401_UNAUTHORIZED, details=details)
 
 
+class TooManyRequestsException(AppException):
+    """Too many requests exception (back-pressure)."""
+
+    def __init__(self, message: str = "Too many requests", details: Dict[str, Any] | None = None) -> None:
+        super().__init__(message=message, status_code=status.HTTP_429_TOO_MANY_REQUESTS, details=details)
+
+
+class InsufficientStorageException(AppException):
+    """Insufficient storage exception (scratch space quota)."""
+
+    def __init__(self, message: str = "Insufficient storage", details: Dict[str, Any] | None = None) -> None:
+        super().__init__(message=message, status_code=status.HTTP_507_INSUFFICIENT_STORAGE, details=details)
+
+
 def setup_exception_handlers(app: FastAPI) -> None:
     """Register custom exception handlers.
 
@@ -1,37 +1,89 @@
 """Structured logging configuration."""
 
+import json
 import logging
 import sys
-from typing import Any
-
-import json_logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Iterator
 
 from app.core.config import settings
 
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(log_context)s%(message)s"
+
+# Fields (request_id, job_id...) attached to every record logged in the current context
+_log_context: ContextVar[dict[str, str]] = ContextVar("log_context", default={})
+
+# Attributes of every LogRecord: anything else was passed with ``extra``
+_RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {
+    "message", "asctime", "log_context", "log_fields",
+}
+
+
+@contextmanager
+def log_context(**fields: Any) -> Iterator[None]:
+    """Attach fields to every record logged in this context (task, thread or render process).
+
+    Args:
+        **fields: Context fields such as ``request_id`` or ``job_id`` (None values are ignored)
+    """
+    context = {**_log_context.get(), **{key: str(value) for key, value in fields.items() if value is not None}}
+    token = _log_context.set(context)
+    try:
+        yield
+    finally:
+        _log_context.reset(token)
+
+
+def current_log_context() -> dict[str, str]:
+    """Get the fields of the current log context (to hand them over to a render process)."""
+    return _log_context.get()
+
+
+class ContextFilter(logging.Filter):
+    """Add the current log context to records, as ``log_fields`` and as a ``log_context`` text prefix."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        context = _log_context.get()
+        record.log_fields = context
+        record.log_context = "".join(f"[{key}={value}] " for key, value in context.items())
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record: time, level, logger, message, context and ``extra`` fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        document: dict[str, Any] = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            **getattr(record, "log_fields", {}),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES:
+                document[key] = value
+        if record.exc_info:
+            document["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(document, default=str)
+
 
 def setup_logging() -> None:
     """Configure structured logging for the application.
     
-    Sets up JSON logging when log_format is 'json',
-    otherwise uses standard text format.
+    Records go to stdout, one JSON object per line when log_format is
+    'json', otherwise in the standard text format. Both carry the current
+    log context (request or job id).
     """
     log_level = getattr(logging, settings.log_level.upper(), logging.INFO)
 
-    if settings.log_format == "json":
-        # Enable JSON logging
-        json_logging.init_fastapi(enable_json=True)
-
-        # Configure root logger
-        logger = logging.getLogger()
-        logger.setLevel(log_level)
-        logger.addHandler(logging.StreamHandler(sys.stdout))
-    else:
-        # Standard text logging
-        logging.basicConfig(
-            level=log_level,
-            format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-            handlers=[logging.StreamHandler(sys.stdout)],
-        )
+    handler = logging.StreamHandler(sys.stdout)
+    handler.addFilter(ContextFilter())
+    handler.setFormatter(JsonFormatter() if settings.log_format == "json" else logging.Formatter(TEXT_FORMAT))
+    logging.basicConfig(level=log_level, handlers=[handler])
 
 
 def get_logger(name: str) -> logging.Logger:
@@ -44,3 +96,44 @@ def get_logger(name: str) -> logging.Logger:
         logging.Logger: Configured logger instance
     """
     return logging.getLogger(name)
+
+
+def log_span(logger: logging.Logger, name: str, duration: float, **fields: Any) -> None:
+    """Log the duration of a processing stage as a structured record.
+
+    Spans are logged at ``log_span_level`` (DEBUG by default). The record carries ``span`` and ``duration`` (seconds) plus ``fields`` as
+    extra attributes, which become top-level keys with the JSON formatter.
+
+    Args:
+        logger: Logger to write the record to
+        name: Stage name
+        duration: Stage duration in seconds
+        **fields: Additional context (render path, output size...)
+    """
+    level = getattr(logging, settings.log_span_level.upper(), logging.DEBUG)
+    logger.log(level, "span %s %.3fs", name, duration, extra={"span": name, "duration": round(duration, 6), **fields})
+
+
+@contextmanager
+def span(
+    logger: logging.Logger,
+    name: str,
+    timings: dict[str, float] | None = None,
+    **fields: Any,
+) -> Iterator[None]:
+    """Time a block and log it with :func:`log_span`.
+
+    Args:
+        logger: Logger to write the record to
+        name: Stage name
+        timings: Optional mapping the duration is added to, under ``name``
+        **fields: Additional context for the record
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - start
+        if timings is not None:
+            timings[name] = timings.get(name, 0.0) + duration
+        log_span(logger, name, duration, **fields)
@@ -1,18 +1,33 @@
 """FastAPI application entry point."""
 
+import asyncio
 import logging
 from contextlib import asynccontextmanager
-from typing import AsyncIterator
+from typing import AsyncIterator, Awaitable, Callable
+from uuid import uuid4
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from motor.motor_asyncio import AsyncIOMotorClient
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 
-from app.routes import video_route
+from app.routes import job_route, video_route
 from app.core.config import settings
 from app.core import database
 from app.core.exceptions import setup_exception_handlers
-from app.core.logging import get_logger, setup_logging
+from app.core.logging import get_logger, log_context, setup_logging
+from app.models.health_model import HealthStatus
+from app.repositories.job_repository import create_job_repository
+from app.repositories.media_probe_repository import create_media_probe_repository
+from app.repositories.render_result_repository import create_render_result_repository
+from app.services import metrics
+from app.services.health_service import HealthService
+from app.services.job_worker import JobWorker
+from app.services.probe_cache import MediaProbeCache
+from app.services.result_cache import ResultCache
+from app.services.scratch import ScratchSpace
+from app.services.video_service import VideoService
 
 # Setup logging
 setup_logging()
@@ -23,14 +38,51 @@ logger = get_logger(__name__)
 async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     # Startup
     await database.connect_to_mongo()
-    print("✅ Connected to MongoDB Atlas")
+    logger.info("Connected to MongoDB")
+
+    # Scratch directories left behind by render processes killed mid-render
+    ScratchSpace.from_settings().cleanup_stale(settings.scratch_stale_after)
+
+    app.state.job_repository = create_job_repository()
+    await app.state.job_repository.ensure_indexes()
+    app.state.result_cache = ResultCache.from_settings(create_render_result_repository())
+    probe_repository = create_media_probe_repository()
+    if probe_repository is not None:
+        await probe_repository.ensure_indexes()
+    app.state.probe_cache = MediaProbeCache.from_settings(probe_repository)
+    # Single video service: render engine and caches shared by requests and the job worker
+    video_service = VideoService(result_cache=app.state.result_cache, probe_cache=app.state.probe_cache)
+    app.state.video_service = video_service
+    metrics.bind_engine(video_service.engine)
+    # Warm-up in the background: /health answers at once, /ready once it has finished
+    warm_up = asyncio.create_task(video_service.warm_up())
+    app.state.health = HealthService(video_service, app.state.job_repository)
+    app.state.health.start()
+
+    job_worker: JobWorker | None = None
+    if settings.job_worker_enabled:
+        job_worker = JobWorker(
+            app.state.job_repository,
+            video_service,
+            concurrency=settings.job_worker_concurrency,
+            poll_interval=settings.job_poll_interval,
+            progress_interval=settings.job_progress_interval,
+            heartbeat_interval=settings.job_heartbeat_interval,
+            stale_after=settings.job_stale_after,
+        )
+        await job_worker.start()
 
     yield
 
     # Shutdown
     logger.info("Shutting down application")
+    warm_up.cancel()
+    await app.state.health.stop()
+    if job_worker is not None:
+        await job_worker.stop()
+    await video_service.shutdown()
     await database.close_mongo_connection()
-    print("❌ Disconnected from MongoDB Atlas")
+    logger.info("Disconnected from MongoDB")
 
 
 def create_app() -> FastAPI:
@@ -58,22 +110,52 @@ def create_app() -> FastAPI:
     # Exception handlers
     setup_exception_handlers(app)
 
+    @app.middleware("http")
+    async def request_log_context(
+        request: Request, call_next: Callable[[Request], Awaitable[Response]]
+    ) -> Response:
+        """Tag the logs of a request (API and render processes) with its X-Request-ID."""
+        request_id = request.headers.get("x-request-id") or uuid4().hex
+        with log_context(request_id=request_id):
+            response = await call_next(request)
+        response.headers["X-Request-ID"] = request_id
+        return response
+
     # Health check endpoint
-    @app.get("/health", tags=["Health"])
-    async def health_check() -> dict[str, str]:
-        """Health check endpoint.
+    @app.get("/health", tags=["Health"], response_model=HealthStatus)
+    async def health_check(request: Request) -> HealthStatus:
+        """Health check endpoint, with the load of this process.
+
+        Returns:
+            HealthStatus: Health status, render engine load, job queue, event loop lag,
+            free scratch disk and MongoDB ping latency
+        """
+        return await request.app.state.health.health()
+
+    @app.get("/ready", tags=["Health"])
+    async def readiness_check(request: Request) -> JSONResponse:
+        """Readiness endpoint: 503 while warming up, saturated, lagging or short of scratch disk.
+
+        Returns:
+            JSONResponse: Readiness status and the reasons this process should not get new renders
+        """
+        readiness = request.app.state.health.readiness()
+        status_code = status.HTTP_200_OK if readiness.status == "ready" else status.HTTP_503_SERVICE_UNAVAILABLE
+        return JSONResponse(readiness.model_dump(), status_code=status_code)
+
+    @app.get("/metrics", tags=["Health"], response_class=Response)
+    async def metrics_endpoint(request: Request) -> Response:
+        """Prometheus metrics endpoint.
 
         Returns:
-            dict: Health status
+            Response: Render counters, stage histograms and render engine gauges
         """
-        return {
-            "status": "healthy",
-            "version": settings.app_version,
-            "environment": settings.environment,
-        }
+        await metrics.refresh_job_queue(request.app.state.job_repository)
+        return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
 
     # Include routers
     app.include_router(video_route.router, prefix=settings.api_v1_prefix)
+    app.include_router(job_route.router, prefix=settings.api_v1_prefix)
 
     return app
 
@@ -0,0 +1,43 @@
+"""Modèles Pydantic pour la santé et la disponibilité du service."""
+
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class RenderLoad(BaseModel):
+    """Charge du moteur de rendu du processus."""
+    in_flight: int = Field(..., description="Rendus acceptés (en cours ou en attente d'un processus)")
+    running: int = Field(..., description="Rendus en cours dans un processus de rendu")
+    queue_depth: int = Field(..., description="Rendus acceptés en attente d'un processus libre")
+    max_in_flight: int = Field(..., description="Rendus acceptés au-delà desquels les demandes sont refusées")
+    workers: int = Field(..., description="Processus de rendu")
+    utilization: float = Field(..., description="Part des processus de rendu occupés (0 à 1)")
+    threads_allocated: int = Field(..., description="Threads d'encodage attribués aux rendus en cours")
+    threads_total: int = Field(..., description="Budget de threads d'encodage")
+    realtime_factor: Optional[float] = Field(
+        None, description="Secondes de vidéo produites par seconde d'encodage, moyenne des derniers rendus"
+    )
+
+
+class HealthStatus(BaseModel):
+    """État de santé et charge du processus."""
+    status: str = Field(..., description="healthy, ou degraded si MongoDB ne répond pas")
+    version: str = Field(..., description="Version de l'application")
+    environment: str = Field(..., description="Environnement")
+    ready: bool = Field(..., description="Le processus accepte de nouveaux rendus (voir /ready)")
+    render: RenderLoad = Field(..., description="Charge du moteur de rendu")
+    jobs_queued: Optional[int] = Field(None, description="Jobs en attente dans la file (null si illisible)")
+    event_loop_lag_ms: float = Field(..., description="Retard récent de la boucle d'événements en millisecondes")
+    scratch_free_bytes: Optional[int] = Field(None, description="Espace disque libre de l'espace de travail")
+    mongo_ping_ms: Optional[float] = Field(None, description="Latence d'un ping MongoDB (null si non utilisé ou en échec)")
+    mongo_error: Optional[str] = Field(None, description="Erreur du ping MongoDB")
+
+
+class ReadinessStatus(BaseModel):
+    """Disponibilité du processus pour de nouveaux rendus."""
+    status: str = Field(..., description="ready, ou not_ready")
+    reasons: List[str] = Field(
+        default_factory=list,
+        description="Raisons de l'indisponibilité (warming_up, saturated, event_loop_lag, scratch_disk_low)"
+    )
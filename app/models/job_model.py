@@ -0,0 +1,124 @@
+"""Modèles Pydantic pour les jobs de rendu asynchrones."""
+
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Dict, Optional
+from uuid import uuid4
+
+from pydantic import BaseModel, Field
+
+from app.models.video_model import VideoGenerationRequest, VideoGenerationResponse
+
+
+def utcnow() -> datetime:
+    """Date courante en UTC (timezone-aware)."""
+    return datetime.now(timezone.utc)
+
+
+class JobStatus(str, Enum):
+    """Statut d'un job de rendu."""
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+class RenderJob(BaseModel):
+    """Document d'un job de rendu tel que stocké dans la collection des jobs."""
+    id: str = Field(default_factory=lambda: uuid4().hex, description="Identifiant du job")
+    status: JobStatus = Field(JobStatus.QUEUED, description="Statut du job")
+    request: VideoGenerationRequest = Field(..., description="Requête de génération vidéo")
+    progress: float = Field(0.0, ge=0.0, le=1.0, description="Progression du rendu (0 à 1)")
+    result: Optional[VideoGenerationResponse] = Field(None, description="Résultat du rendu")
+    error: Optional[str] = Field(None, description="Message d'erreur si le job a échoué")
+    worker_id: Optional[str] = Field(None, description="Worker ayant pris le job")
+    created_at: datetime = Field(default_factory=utcnow, description="Date de création")
+    started_at: Optional[datetime] = Field(None, description="Début du rendu")
+    heartbeat_at: Optional[datetime] = Field(None, description="Dernier signe de vie du worker pendant le rendu")
+    finished_at: Optional[datetime] = Field(None, description="Fin du rendu")
+
+    def timings(self) -> Dict[str, float]:
+        """Calculer les durées d'attente, de traitement et par étape du rendu.
+
+        Returns:
+            Durées en secondes
+        """
+        timings: Dict[str, float] = {}
+        if self.started_at:
+            timings["queue_wait"] = (self.started_at - self.created_at).total_seconds()
+        if self.started_at and self.finished_at:
+            timings["processing"] = (self.finished_at - self.started_at).total_seconds()
+        if self.finished_at:
+            timings["total"] = (self.finished_at - self.created_at).total_seconds()
+        if self.result:
+            timings.update(self.result.timings)
+        return timings
+
+
+class RenderJobCreated(BaseModel):
+    """Réponse à la création d'un job de rendu."""
+    job_id: str = Field(..., description="Identifiant du job")
+    status: JobStatus = Field(..., description="Statut du job")
+
+
+class RenderJobStatus(BaseModel):
+    """Statut d'un job de rendu."""
+    job_id: str = Field(..., description="Identifiant du job")
+    status: JobStatus = Field(..., description="Statut du job")
+    progress: float = Field(..., description="Progression du rendu (0 à 1)")
+    result: Optional[VideoGenerationResponse] = Field(None, description="Résultat du rendu")
+    error: Optional[str] = Field(None, description="Message d'erreur si le job a échoué")
+    created_at: datetime = Field(..., description="Date de création")
+    started_at: Optional[datetime] = Field(None, description="Début du rendu")
+    finished_at: Optional[datetime] = Field(None, description="Fin du rendu")
+    timings: Dict[str, float] = Field(default_factory=dict, description="Durées en secondes")
+
+    @classmethod
+    def from_job(cls, job: RenderJob) -> "RenderJobStatus":
+        """Construire le statut public d'un job.
+
+        Args:
+            job: Document du job
+
+        Returns:
+            RenderJobStatus: Statut du job
+        """
+        return cls(
+            job_id=job.id,
+            status=job.status,
+            progress=job.progress,
+            result=job.result,
+            error=job.error,
+            created_at=job.created_at,
+            started_at=job.started_at,
+            finished_at=job.finished_at,
+            timings=job.timings(),
+        )
+
+
+class RenderProgress(BaseModel):
+    """Progression d'un job de rendu (événement ``progress`` du flux d'événements du job)."""
+    job_id: str = Field(..., description="Identifiant du job")
+    status: JobStatus = Field(..., description="Statut du job")
+    stage: Optional[str] = Field(
+        None, description="Étape en cours (audio_load, template, music_mix, encode, thumbnail)"
+    )
+    progress: float = Field(..., description="Progression du rendu (0 à 1)")
+    frame: Optional[int] = Field(None, description="Images encodées")
+    total_frames: Optional[int] = Field(None, description="Images à encoder")
+    fps: Optional[float] = Field(None, description="Images encodées par seconde")
+    speed: Optional[float] = Field(None, description="Vitesse d'encodage rapportée au temps réel")
+    eta: Optional[float] = Field(None, description="Temps restant estimé pour l'encodage (secondes)")
+    elapsed: Optional[float] = Field(None, description="Durée écoulée depuis le début du rendu (secondes)")
+
+    @classmethod
+    def from_job(cls, job: RenderJob) -> "RenderProgress":
+        """Construire la progression connue d'un job à partir de son document.
+
+        Args:
+            job: Document du job
+
+        Returns:
+            RenderProgress: Progression enregistrée du job (sans détail d'encodage)
+        """
+        return cls(job_id=job.id, status=job.status, progress=job.progress)
@@ -0,0 +1,41 @@
+"""Modèles Pydantic pour le cache des métadonnées des médias d'entrée."""
+
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+from app.models.job_model import utcnow
+
+
+class MediaProbe(BaseModel):
+    """Métadonnées d'un fichier média, valables pour une version (taille, mtime) du fichier."""
+    key: str = Field(..., description="Clé de l'entrée (chemin absolu, taille, mtime)")
+    path: str = Field(..., description="Chemin absolu du fichier")
+    size: int = Field(..., ge=0, description="Taille du fichier en octets")
+    mtime_ns: int = Field(..., description="Date de modification du fichier (ns)")
+    duration: float = Field(..., description="Durée en secondes")
+    video_codec: Optional[str] = Field(None, description="Codec vidéo (null si pas de vidéo)")
+    width: Optional[int] = Field(None, description="Largeur de la vidéo")
+    height: Optional[int] = Field(None, description="Hauteur de la vidéo")
+    fps: Optional[float] = Field(None, description="Cadence de la vidéo")
+    audio_codec: Optional[str] = Field(None, description="Codec audio (null si pas d'audio)")
+    sample_rate: Optional[int] = Field(None, description="Fréquence d'échantillonnage de l'audio")
+    channels: Optional[int] = Field(None, description="Nombre de canaux audio")
+    probed_at: datetime = Field(default_factory=utcnow, description="Date de la lecture des métadonnées")
+
+
+class MediaProbeCacheState(BaseModel):
+    """Contenu et statistiques du cache des métadonnées (processus de l'API)."""
+    entries: List[MediaProbe] = Field(..., description="Entrées en mémoire, de la moins à la plus récemment utilisée")
+    max_entries: int = Field(..., description="Nombre maximum d'entrées en mémoire")
+    hits: int = Field(..., description="Lectures servies par la mémoire ou MongoDB")
+    misses: int = Field(..., description="Lectures ayant nécessité ffmpeg")
+    persistent: bool = Field(..., description="Entrées également conservées dans MongoDB")
+
+
+class MediaProbeInvalidation(BaseModel):
+    """Résultat d'une invalidation du cache des métadonnées."""
+    path: Optional[str] = Field(None, description="Fichier invalidé (null = tout le cache)")
+    removed: int = Field(..., description="Entrées retirées de la mémoire du processus de l'API")
+    removed_persisted: Optional[int] = Field(None, description="Entrées retirées de MongoDB (null si non persistant)")
@@ -0,0 +1,17 @@
+"""Modèles Pydantic pour l'index des rendus terminés."""
+
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+from app.models.job_model import utcnow
+from app.models.video_model import VideoGenerationResponse
+
+
+class RenderResult(BaseModel):
+    """Rendu terminé, indexé par la clé de contenu de sa requête."""
+    key: str = Field(..., description="Clé de contenu (empreintes des entrées et paramètres d'encodage)")
+    path: str = Field(..., description="Chemin de la vidéo dans le cache des rendus")
+    size: int = Field(..., ge=0, description="Taille de la vidéo en octets")
+    response: VideoGenerationResponse = Field(..., description="Réponse du rendu d'origine")
+    created_at: datetime = Field(default_factory=utcnow, description="Date du rendu")
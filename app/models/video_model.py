@@ -1,13 +1,71 @@
 """Modèles Pydantic pour la génération de vidéos."""
 
-from typing import List, Optional
+from typing import Dict, List, Literal, Optional
 from pydantic import BaseModel, Field
 
 
 class ImageScene(BaseModel):
     """Modèle pour une scène d'image."""
     prompt: str = Field(..., description="Prompt de génération")
-    url: str | None = Field(None, description="URL de l'image générée")
+    url: str | None = Field(None, description="Chemin local ou URL http(s) de l'image générée")
+
+
+class DuckingOptions(BaseModel):
+    """Paramètres d'atténuation (ducking) de la musique de fond pendant la voix."""
+    threshold_db: float = Field(
+        -40.0,
+        le=0.0,
+        description="Niveau RMS de la voix (dBFS) au-dessus duquel la musique est atténuée (défaut: -40)"
+    )
+    depth_db: float = Field(
+        12.0,
+        ge=0.0,
+        le=60.0,
+        description="Atténuation de la musique pendant la voix en dB (défaut: 12)"
+    )
+    attack_ms: float = Field(
+        50.0,
+        ge=0.0,
+        le=5000.0,
+        description="Durée de l'atténuation au début de la voix en ms (défaut: 50)"
+    )
+    release_ms: float = Field(
+        400.0,
+        ge=0.0,
+        le=10000.0,
+        description="Durée du retour au volume normal après la voix en ms (défaut: 400)"
+    )
+    window_ms: float = Field(
+        20.0,
+        ge=5.0,
+        le=500.0,
+        description="Taille de la fenêtre RMS en ms (défaut: 20)"
+    )
+
+
+class ThumbnailOptions(BaseModel):
+    """Paramètres de la miniature de la vidéo."""
+    timestamp: Optional[float] = Field(
+        None,
+        ge=0.0,
+        description="Position de la miniature en secondes (défaut: image clé la plus représentative)"
+    )
+    width: int = Field(
+        480,
+        ge=16,
+        le=3840,
+        description="Largeur maximale de la miniature en pixels (défaut: 480)"
+    )
+    format: Literal["jpg", "webp"] = Field(
+        "jpg",
+        description="Format de la miniature (défaut: jpg)"
+    )
+    quality: int = Field(
+        85,
+        ge=1,
+        le=100,
+        description="Qualité de compression de la miniature (défaut: 85)"
+    )
 
 
 class VideoGenerationRequest(BaseModel):
@@ -17,11 +75,18 @@ class VideoGenerationRequest(BaseModel):
     video_relative_path: str = Field(..., description="Chemin relatif de la vidéo par rapport à RESSOURCE_DIR (obligatoire)")
     images: Optional[List[ImageScene]] = Field(
         [],
-        description="Liste des images avec URLs (optionnel, défaut: liste vide)"
+        description=(
+            "Images d'un diaporama (chemins locaux ou URLs http(s) dans url), utilisées à la place du template "
+            "quand toutes les scènes ont une url (optionnel, défaut: liste vide)"
+        )
     )
     resolution: Optional[str] = Field(
         "1080p",
-        description="Résolution de la vidéo (optionnel, défaut: 1080p)"
+        description="Résolution de la vidéo: 1080p, 720p, 480p ou null pour la taille du template (optionnel, défaut: 1080p)"
+    )
+    profile: Optional[str] = Field(
+        None,
+        description="Profil d'encodage (1080p, 720p, 480p, source), prioritaire sur la résolution (optionnel, défaut: selon la résolution)"
     )
     fps: Optional[int] = Field(
         30,
@@ -35,8 +100,76 @@ class VideoGenerationRequest(BaseModel):
     )
     background_music: Optional[str] = Field(
         None,
-        description="chemin absolue ou rul de la musique de fond (optionnel, défaut: none)"
+        description="Chemin absolu ou URL http(s) de la musique de fond (optionnel, défaut: none)"
+    )
+    background_music_volume: float = Field(
+        0.1,
+        ge=0.0,
+        le=2.0,
+        description="Gain linéaire de la musique de fond (optionnel, défaut: 0.1)"
+    )
+    ducking: Optional[DuckingOptions] = Field(
+        None,
+        description="Atténuer la musique de fond pendant la voix (optionnel, défaut: désactivé)"
+    )
+    encoder: Optional[Literal["moviepy", "ffmpeg"]] = Field(
+        None,
+        description="Encodeur utilisé quand la copie de flux est impossible (optionnel, défaut: RENDER_ENCODER)"
+    )
+    stream_copy: Optional[bool] = Field(
+        True,
+        description="Boucler le template par copie de flux, sans ré-encodage vidéo, quand c'est possible (optionnel, défaut: true)"
     )
+    segmented: Optional[bool] = Field(
+        None,
+        description=(
+            "Encoder la vidéo par segments en parallèle puis les assembler (optionnel, défaut: automatique "
+            "au-delà de SEGMENT_MIN_DURATION secondes)"
+        )
+    )
+    thumbnail: Optional[ThumbnailOptions] = Field(
+        default_factory=ThumbnailOptions,
+        description="Miniature écrite à côté de la vidéo, null pour ne pas en créer (optionnel, défaut: image clé automatique, 480px, jpg)"
+    )
+    cache: Optional[bool] = Field(
+        True,
+        description="Réutiliser un rendu identique déjà terminé ou en cours (optionnel, défaut: true)"
+    )
+
+    @property
+    def slideshow_images(self) -> List[str]:
+        """Images du diaporama: les url des scènes si toutes en ont une, sinon aucune (rendu du template)."""
+        images = self.images or []
+        if images and all(scene.url for scene in images):
+            return [scene.url for scene in images if scene.url]
+        return []
+
+
+class TemplateWarmRequest(BaseModel):
+    """Requête de pré-chauffage du cache des templates."""
+    templates: List[str] = Field(..., min_length=1, description="Chemins absolus des templates vidéo")
+    fps: List[int] = Field(
+        [30],
+        description="Cadences à préparer (optionnel, défaut: [30])"
+    )
+    resolutions: List[Optional[str]] = Field(
+        [None],
+        description="Profils de résolution à préparer (1080p, 720p, 480p, source), null pour la taille native (optionnel, défaut: [null])"
+    )
+
+
+class TemplateCacheEntry(BaseModel):
+    """Encodage normalisé d'un template présent dans le cache."""
+    template_path: str = Field(..., description="Chemin du template source")
+    fps: int = Field(..., description="Cadence de l'encodage")
+    resolution: Optional[str] = Field(None, description="Résolution de l'encodage (null = native)")
+    cache_path: str = Field(..., description="Chemin de l'encodage normalisé")
+    duration: float = Field(..., description="Durée du template en secondes")
+
+
+class TemplateWarmResponse(BaseModel):
+    """Réponse de pré-chauffage du cache des templates."""
+    entries: List[TemplateCacheEntry] = Field(..., description="Encodages prêts dans le cache")
 
 
 class VideoGenerationResponse(BaseModel):
@@ -46,3 +179,36 @@ class VideoGenerationResponse(BaseModel):
     duration: float = Field(..., description="Durée de la vidéo en secondes")
     status: str = Field(default="success", description="Statut de la génération")
     message: Optional[str] = Field(None, description="Message d'information")
+    profile: Optional[str] = Field(None, description="Profil d'encodage utilisé")
+    threads: Optional[int] = Field(None, description="Threads d'encodage attribués au rendu")
+    render_path: Optional[str] = Field(
+        None,
+        description=(
+            "Chemin de rendu utilisé (stream_copy, ffmpeg, moviepy, segmented, slideshow, remux pour une piste vidéo "
+            "réutilisée avec un nouvel audio, ou cache / coalesced pour un rendu réutilisé)"
+        )
+    )
+    timings: Dict[str, float] = Field(
+        default_factory=dict,
+        description="Durée de chaque étape du rendu en secondes"
+    )
+
+
+class VideoBatchRequest(BaseModel):
+    """Lot de requêtes de génération vidéo."""
+    requests: List[VideoGenerationRequest] = Field(
+        ...,
+        min_length=1,
+        max_length=200,
+        description="Requêtes de génération (200 au maximum)"
+    )
+
+
+class VideoBatchItemResult(BaseModel):
+    """Résultat d'une requête d'un lot, envoyé dès la fin de son rendu."""
+    index: int = Field(..., description="Position de la requête dans le lot")
+    status: Literal["success", "error"] = Field(..., description="Statut du rendu")
+    status_code: int = Field(..., description="Code HTTP équivalent (200, 400, 429, 500...)")
+    result: Optional[VideoGenerationResponse] = Field(None, description="Réponse du rendu en cas de succès")
+    error: Optional[str] = Field(None, description="Message d'erreur en cas d'échec")
+    elapsed: float = Field(..., description="Temps écoulé depuis la réception du lot en secondes")
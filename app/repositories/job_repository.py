@@ -0,0 +1,196 @@
+"""Accès aux documents des jobs de rendu."""
+
+from abc import ABC, abstractmethod
+from datetime import timedelta, timezone
+from typing import Any, Dict
+
+from bson.codec_options import CodecOptions
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, ReturnDocument
+
+from app.core.config import settings
+from app.core import database
+from app.core.logging import get_logger
+from app.models.job_model import JobStatus, RenderJob, utcnow
+
+logger = get_logger(__name__)
+
+
+class JobRepository(ABC):
+    """Stockage des jobs de rendu."""
+
+    async def ensure_indexes(self) -> None:
+        """Créer les index nécessaires (no-op par défaut)."""
+
+    @abstractmethod
+    async def create(self, job: RenderJob) -> RenderJob:
+        """Enregistrer un nouveau job."""
+
+    @abstractmethod
+    async def get(self, job_id: str) -> RenderJob | None:
+        """Récupérer un job par son identifiant."""
+
+    @abstractmethod
+    async def claim_next(self, worker_id: str, stale_after: float | None = None) -> RenderJob | None:
+        """Passer atomiquement le plus ancien job en attente à l'état running.
+
+        Les jobs running sans signe de vie (``heartbeat_at``) depuis plus de
+        ``stale_after`` secondes, laissés par un worker arrêté brutalement, sont
+        d'abord remis en file.
+
+        Args:
+            worker_id: Identifiant du worker qui prend le job
+            stale_after: Délai (secondes) au-delà duquel un job running est repris (None = jamais)
+
+        Returns:
+            Le job pris, ou None si la file est vide
+        """
+
+    @abstractmethod
+    async def update(self, job_id: str, **fields: Any) -> RenderJob | None:
+        """Mettre à jour des champs d'un job."""
+
+    @abstractmethod
+    async def count(self, status: JobStatus) -> int:
+        """Compter les jobs dans un statut donné."""
+
+
+class MongoJobRepository(JobRepository):
+    """Jobs de rendu stockés dans une collection MongoDB."""
+
+    def __init__(self, db: AsyncIOMotorDatabase, collection_name: str = "render_jobs") -> None:
+        """Initialise le repository.
+
+        Args:
+            db: Base MongoDB
+            collection_name: Nom de la collection des jobs
+        """
+        self.collection = db.get_collection(
+            collection_name,
+            codec_options=CodecOptions(tz_aware=True, tzinfo=timezone.utc),
+        )
+
+    @staticmethod
+    def _to_document(job: RenderJob) -> Dict[str, Any]:
+        document = job.model_dump(mode="python", exclude={"id"})
+        document["_id"] = job.id
+        return document
+
+    @staticmethod
+    def _to_job(document: Dict[str, Any] | None) -> RenderJob | None:
+        if document is None:
+            return None
+        document["id"] = document.pop("_id")
+        return RenderJob.model_validate(document)
+
+    @staticmethod
+    def _to_fields(fields: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            key: value.model_dump(mode="python") if hasattr(value, "model_dump") else value
+            for key, value in fields.items()
+        }
+
+    async def ensure_indexes(self) -> None:
+        await self.collection.create_index([("status", ASCENDING), ("created_at", ASCENDING)])
+        await self.collection.create_index([("status", ASCENDING), ("heartbeat_at", ASCENDING)])
+
+    async def create(self, job: RenderJob) -> RenderJob:
+        await self.collection.insert_one(self._to_document(job))
+        return job
+
+    async def get(self, job_id: str) -> RenderJob | None:
+        return self._to_job(await self.collection.find_one({"_id": job_id}))
+
+    async def claim_next(self, worker_id: str, stale_after: float | None = None) -> RenderJob | None:
+        if stale_after is not None:
+            requeued = await self.collection.update_many(
+                {
+                    "status": JobStatus.RUNNING.value,
+                    "heartbeat_at": {"$lt": utcnow() - timedelta(seconds=stale_after)},
+                },
+                {"$set": {
+                    "status": JobStatus.QUEUED.value,
+                    "worker_id": None,
+                    "started_at": None,
+                    "heartbeat_at": None,
+                }},
+            )
+            if requeued.modified_count:
+                logger.warning("Requeued %d stale render jobs", requeued.modified_count)
+        now = utcnow()
+        document = await self.collection.find_one_and_update(
+            {"status": JobStatus.QUEUED.value},
+            {"$set": {
+                "status": JobStatus.RUNNING.value,
+                "worker_id": worker_id,
+                "started_at": now,
+                "heartbeat_at": now,
+            }},
+            sort=[("created_at", ASCENDING)],
+            return_document=ReturnDocument.AFTER,
+        )
+        return self._to_job(document)
+
+    async def update(self, job_id: str, **fields: Any) -> RenderJob | None:
+        document = await self.collection.find_one_and_update(
+            {"_id": job_id},
+            {"$set": self._to_fields(fields)},
+            return_document=ReturnDocument.AFTER,
+        )
+        return self._to_job(document)
+
+    async def count(self, status: JobStatus) -> int:
+        return await self.collection.count_documents({"status": status.value})
+
+
+class InMemoryJobRepository(JobRepository):
+    """Jobs de rendu en mémoire (tests et développement local, un seul processus)."""
+
+    def __init__(self) -> None:
+        self._jobs: Dict[str, RenderJob] = {}
+
+    async def create(self, job: RenderJob) -> RenderJob:
+        self._jobs[job.id] = job.model_copy(deep=True)
+        return job
+
+    async def get(self, job_id: str) -> RenderJob | None:
+        job = self._jobs.get(job_id)
+        return job.model_copy(deep=True) if job else None
+
+    async def claim_next(self, worker_id: str, stale_after: float | None = None) -> RenderJob | None:
+        if stale_after is not None:
+            cutoff = utcnow() - timedelta(seconds=stale_after)
+            for job in self._jobs.values():
+                if job.status == JobStatus.RUNNING and job.heartbeat_at is not None and job.heartbeat_at < cutoff:
+                    logger.warning("Requeued stale render job %s", job.id)
+                    job.status = JobStatus.QUEUED
+                    job.worker_id = job.started_at = job.heartbeat_at = None
+        queued = [job for job in self._jobs.values() if job.status == JobStatus.QUEUED]
+        if not queued:
+            return None
+        job = min(queued, key=lambda queued_job: queued_job.created_at)
+        job.status = JobStatus.RUNNING
+        job.worker_id = worker_id
+        job.started_at = job.heartbeat_at = utcnow()
+        return job.model_copy(deep=True)
+
+    async def update(self, job_id: str, **fields: Any) -> RenderJob | None:
+        job = self._jobs.get(job_id)
+        if job is None:
+            return None
+        self._jobs[job_id] = job.model_copy(update=fields, deep=True)
+        return self._jobs[job_id].model_copy(deep=True)
+
+    async def count(self, status: JobStatus) -> int:
+        return sum(1 for job in self._jobs.values() if job.status == status)
+
+
+def create_job_repository() -> JobRepository:
+    """Create the job repository selected by ``settings.job_store``.
+
+    Returns:
+        JobRepository: MongoDB repository, or in-memory repository for ``memory``
+    """
+    if settings.job_store == "memory":
+        return InMemoryJobRepository()
+    return MongoJobRepository(database.get_database(), settings.jobs_collection)
@@ -0,0 +1,88 @@
+"""Accès aux métadonnées persistées des médias d'entrée."""
+
+from abc import ABC, abstractmethod
+from datetime import timezone
+from typing import Any, Dict
+
+from bson.codec_options import CodecOptions
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING
+
+from app.core.config import settings
+from app.core import database
+from app.models.probe_model import MediaProbe
+
+
+class MediaProbeRepository(ABC):
+    """Métadonnées des médias par clé (chemin, taille, mtime)."""
+
+    async def ensure_indexes(self) -> None:
+        """Créer les index nécessaires (no-op par défaut)."""
+
+    @abstractmethod
+    async def get(self, key: str) -> MediaProbe | None:
+        """Récupérer les métadonnées d'une version de fichier."""
+
+    @abstractmethod
+    async def put(self, probe: MediaProbe) -> MediaProbe:
+        """Enregistrer (ou remplacer) des métadonnées."""
+
+    @abstractmethod
+    async def delete(self, path: str | None = None) -> int:
+        """Retirer les métadonnées d'un fichier (toutes versions), ou toutes si ``path`` est None.
+
+        Returns:
+            Nombre d'entrées retirées
+        """
+
+
+class MongoMediaProbeRepository(MediaProbeRepository):
+    """Métadonnées stockées dans une collection MongoDB (partagées entre processus et redémarrages)."""
+
+    def __init__(self, db: AsyncIOMotorDatabase, collection_name: str = "media_probes") -> None:
+        """Initialise le repository.
+
+        Args:
+            db: Base MongoDB
+            collection_name: Nom de la collection des métadonnées
+        """
+        self.collection = db.get_collection(
+            collection_name,
+            codec_options=CodecOptions(tz_aware=True, tzinfo=timezone.utc),
+        )
+
+    @staticmethod
+    def _to_document(probe: MediaProbe) -> Dict[str, Any]:
+        document = probe.model_dump(mode="python", exclude={"key"})
+        document["_id"] = probe.key
+        return document
+
+    async def ensure_indexes(self) -> None:
+        await self.collection.create_index([("path", ASCENDING)])
+
+    async def get(self, key: str) -> MediaProbe | None:
+        document = await self.collection.find_one({"_id": key})
+        if document is None:
+            return None
+        document["key"] = document.pop("_id")
+        return MediaProbe.model_validate(document)
+
+    async def put(self, probe: MediaProbe) -> MediaProbe:
+        await self.collection.replace_one({"_id": probe.key}, self._to_document(probe), upsert=True)
+        return probe
+
+    async def delete(self, path: str | None = None) -> int:
+        result = await self.collection.delete_many({} if path is None else {"path": path})
+        return result.deleted_count
+
+
+def create_media_probe_repository() -> MediaProbeRepository | None:
+    """Create the persistent media probe store, if enabled.
+
+    Returns:
+        MediaProbeRepository: MongoDB repository when ``settings.probe_cache_persist`` is set and
+        the job store is MongoDB, otherwise None (memory only)
+    """
+    if not settings.probe_cache_persist or settings.job_store == "memory":
+        return None
+    return MongoMediaProbeRepository(database.get_database(), settings.probes_collection)
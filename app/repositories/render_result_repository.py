@@ -0,0 +1,93 @@
+"""Accès à l'index des rendus terminés."""
+
+from abc import ABC, abstractmethod
+from datetime import timezone
+from typing import Any, Dict
+
+from bson.codec_options import CodecOptions
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from app.core.config import settings
+from app.core import database
+from app.models.render_result_model import RenderResult
+
+
+class RenderResultRepository(ABC):
+    """Index des rendus terminés par clé de contenu."""
+
+    @abstractmethod
+    async def get(self, key: str) -> RenderResult | None:
+        """Récupérer un rendu par sa clé de contenu."""
+
+    @abstractmethod
+    async def put(self, result: RenderResult) -> RenderResult:
+        """Enregistrer (ou remplacer) un rendu."""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Retirer un rendu de l'index."""
+
+
+class MongoRenderResultRepository(RenderResultRepository):
+    """Index des rendus stocké dans une collection MongoDB (partagé entre processus)."""
+
+    def __init__(self, db: AsyncIOMotorDatabase, collection_name: str = "render_results") -> None:
+        """Initialise le repository.
+
+        Args:
+            db: Base MongoDB
+            collection_name: Nom de la collection des rendus
+        """
+        self.collection = db.get_collection(
+            collection_name,
+            codec_options=CodecOptions(tz_aware=True, tzinfo=timezone.utc),
+        )
+
+    @staticmethod
+    def _to_document(result: RenderResult) -> Dict[str, Any]:
+        document = result.model_dump(mode="python", exclude={"key"})
+        document["_id"] = result.key
+        return document
+
+    async def get(self, key: str) -> RenderResult | None:
+        document = await self.collection.find_one({"_id": key})
+        if document is None:
+            return None
+        document["key"] = document.pop("_id")
+        return RenderResult.model_validate(document)
+
+    async def put(self, result: RenderResult) -> RenderResult:
+        await self.collection.replace_one({"_id": result.key}, self._to_document(result), upsert=True)
+        return result
+
+    async def delete(self, key: str) -> None:
+        await self.collection.delete_one({"_id": key})
+
+
+class InMemoryRenderResultRepository(RenderResultRepository):
+    """Index des rendus en mémoire (tests et développement local, un seul processus)."""
+
+    def __init__(self) -> None:
+        self._results: Dict[str, RenderResult] = {}
+
+    async def get(self, key: str) -> RenderResult | None:
+        result = self._results.get(key)
+        return result.model_copy(deep=True) if result else None
+
+    async def put(self, result: RenderResult) -> RenderResult:
+        self._results[result.key] = result.model_copy(deep=True)
+        return result
+
+    async def delete(self, key: str) -> None:
+        self._results.pop(key, None)
+
+
+def create_render_result_repository() -> RenderResultRepository:
+    """Create the render result index selected by ``settings.job_store``.
+
+    Returns:
+        RenderResultRepository: MongoDB repository, or in-memory repository for ``memory``
+    """
+    if settings.job_store == "memory":
+        return InMemoryRenderResultRepository()
+    return MongoRenderResultRepository(database.get_database(), settings.results_collection)
@@ -0,0 +1,153 @@
+"""Endpoints pour les jobs de rendu asynchrones."""
+
+import json
+from typing import Annotated, AsyncIterator
+
+from fastapi import APIRouter, Depends, HTTPException, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
+
+from app.api.dependencies import get_job_service
+from app.core.config import settings
+from app.core.exceptions import NotFoundException
+from app.models.job_model import RenderJobCreated, RenderJobStatus, RenderProgress
+from app.models.video_model import VideoGenerationRequest
+from app.services.job_service import JobService
+
+router = APIRouter(prefix="/videos/jobs", tags=["Jobs"])
+
+
+@router.post(
+    "",
+    response_model=RenderJobCreated,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Créer un job de rendu",
+    description="Met en file une génération vidéo et retourne immédiatement l'identifiant du job.",
+)
+async def create_job(
+    request: VideoGenerationRequest,
+    service: Annotated[JobService, Depends(get_job_service)],
+) -> RenderJobCreated:
+    """Crée un job de rendu.
+    
+    Args:
+        request: Requête de génération vidéo
+        service: Service des jobs injecté
+        
+    Returns:
+        RenderJobCreated: Identifiant et statut du job
+        
+    Raises:
+        HTTPException: Si les fichiers d'entrée n'existent pas
+    """
+    try:
+        job = await service.submit(request)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    return RenderJobCreated(job_id=job.id, status=job.status)
+
+
+@router.get(
+    "/{job_id}",
+    response_model=RenderJobStatus,
+    summary="Statut d'un job de rendu",
+    description="Retourne le statut, la progression, le résultat et les durées d'un job de rendu.",
+)
+async def get_job(
+    job_id: str,
+    service: Annotated[JobService, Depends(get_job_service)],
+) -> RenderJobStatus:
+    """Retourne le statut d'un job de rendu.
+    
+    Args:
+        job_id: Identifiant du job
+        service: Service des jobs injecté
+        
+    Returns:
+        RenderJobStatus: Statut du job
+        
+    Raises:
+        NotFoundException: Si le job n'existe pas
+    """
+    job = await service.get(job_id)
+    return RenderJobStatus.from_job(job)
+
+
+@router.get(
+    "/{job_id}/events",
+    response_class=StreamingResponse,
+    summary="Suivre un job de rendu (SSE)",
+    description=(
+        "Diffuse la progression d'un job en Server-Sent Events: événements `progress` "
+        "(étape, images encodées, cadence, ETA) puis un événement final `done` ou `failed` "
+        "contenant le statut du job. Le même flux est disponible en WebSocket sur ce chemin."
+    ),
+    responses={200: {
+        "content": {"text/event-stream": {"schema": RenderProgress.model_json_schema()}},
+        "description": "Événements progress (RenderProgress), puis done ou failed (RenderJobStatus)",
+    }},
+)
+async def job_events(
+    job_id: str,
+    service: Annotated[JobService, Depends(get_job_service)],
+) -> StreamingResponse:
+    """Diffuse les événements d'un job de rendu en Server-Sent Events.
+    
+    Args:
+        job_id: Identifiant du job
+        service: Service des jobs injecté
+        
+    Returns:
+        StreamingResponse: Flux text/event-stream, fermé après l'événement final
+        
+    Raises:
+        NotFoundException: Si le job n'existe pas
+    """
+    job = await service.get(job_id)
+
+    async def stream() -> AsyncIterator[str]:
+        async for name, data in service.events(job, settings.job_poll_interval):
+            if data is None:
+                yield f": {name}\n\n"
+            else:
+                yield f"event: {name}\ndata: {data.model_dump_json()}\n\n"
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/{job_id}/events")
+async def job_events_websocket(
+    websocket: WebSocket,
+    job_id: str,
+    service: Annotated[JobService, Depends(get_job_service)],
+) -> None:
+    """Diffuse les événements d'un job de rendu sur une WebSocket.
+    
+    Chaque message est un objet JSON ``{"event": ..., "data": ...}`` reprenant
+    les événements du flux SSE; la connexion est fermée après l'événement final.
+    
+    Args:
+        websocket: Connexion WebSocket
+        job_id: Identifiant du job
+        service: Service des jobs injecté
+    """
+    await websocket.accept()
+    try:
+        job = await service.get(job_id)
+    except NotFoundException as e:
+        await websocket.close(code=4404, reason=e.message)
+        return
+
+    try:
+        async for name, data in service.events(job, settings.job_poll_interval):
+            if data is not None:
+                await websocket.send_text(json.dumps({"event": name, "data": data.model_dump(mode="json")}))
+    except WebSocketDisconnect:
+        return
+    await websocket.close()
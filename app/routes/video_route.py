@@ -1,11 +1,23 @@
 """Endpoints pour la génération de vidéos."""
 
-from typing import Annotated, Dict, Any
+from typing import Annotated, AsyncIterator, Dict, Any
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 
-from app.api.dependencies import get_video_service
-from app.models.video_model import VideoGenerationRequest, VideoGenerationResponse
+from app.api.dependencies import get_media_probe_cache, get_video_service
+from app.core.exceptions import AppException, NotFoundException
+from app.models.probe_model import MediaProbe, MediaProbeCacheState, MediaProbeInvalidation
+from app.models.video_model import (
+    TemplateWarmRequest,
+    TemplateWarmResponse,
+    VideoBatchItemResult,
+    VideoBatchRequest,
+    VideoGenerationRequest,
+    VideoGenerationResponse,
+)
+from app.services.ffmpeg_tools import FFmpegError
+from app.services.probe_cache import MediaProbeCache
 from app.services.video_service import VideoService
 
 router = APIRouter(prefix="/videos", tags=["Videos"])
@@ -33,9 +45,12 @@ async def render_video(
         
     Raises:
         HTTPException: Si une erreur survient lors de la génération
+        TooManyRequestsException: Si le moteur de rendu est saturé (429)
     """
     try:
         return await service.render_video(request)
+    except AppException:
+        raise
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -46,3 +61,172 @@ async def render_video(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Erreur lors de la génération de la vidéo: {str(e)}"
         )
+
+
+@router.post(
+    "/generate/batch",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Générer un lot de vidéos",
+    description=(
+        "Génère plusieurs vidéos en préparant une seule fois les templates et musiques partagés. "
+        "Chaque résultat est envoyé dès la fin de son rendu, une ligne JSON par vidéo (NDJSON)."
+    ),
+    responses={200: {
+        "content": {"application/x-ndjson": {"schema": VideoBatchItemResult.model_json_schema()}},
+        "description": "Un VideoBatchItemResult par ligne, dans l'ordre de fin des rendus",
+    }},
+)
+async def render_batch(
+    request: VideoBatchRequest,
+    service: Annotated[VideoService, Depends(get_video_service)],
+) -> StreamingResponse:
+    """Génère un lot de vidéos et diffuse les résultats au fil de l'eau.
+    
+    Args:
+        request: Lot de requêtes de génération
+        service: Service vidéo injecté
+        
+    Returns:
+        StreamingResponse: Résultats NDJSON, avec le statut et le code d'erreur propres à chaque vidéo
+    """
+    async def stream() -> AsyncIterator[str]:
+        async for item in service.render_batch(request):
+            yield item.model_dump_json() + "\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+@router.post(
+    "/templates/warm",
+    response_model=TemplateWarmResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Pré-chauffer le cache des templates",
+    description="Prépare les encodages normalisés des templates pour les cadences et résolutions données.",
+)
+async def warm_templates(
+    request: TemplateWarmRequest,
+    service: Annotated[VideoService, Depends(get_video_service)],
+) -> TemplateWarmResponse:
+    """Prépare les encodages normalisés de templates.
+    
+    Args:
+        request: Templates, cadences et résolutions à préparer
+        service: Service vidéo injecté
+        
+    Returns:
+        TemplateWarmResponse: Encodages prêts dans le cache
+        
+    Raises:
+        HTTPException: Si un template est introuvable ou si l'encodage échoue
+    """
+    try:
+        return await service.warm_templates(request)
+    except AppException:
+        raise
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erreur lors de la préparation des templates: {str(e)}"
+        )
+
+
+@router.get(
+    "/probes",
+    response_model=MediaProbeCacheState,
+    status_code=status.HTTP_200_OK,
+    summary="Consulter le cache des métadonnées",
+    description="Liste les métadonnées des médias (templates, musiques) en mémoire et les statistiques du cache.",
+)
+async def list_probes(
+    cache: Annotated[MediaProbeCache, Depends(get_media_probe_cache)],
+) -> MediaProbeCacheState:
+    """Liste les entrées du cache des métadonnées.
+    
+    Args:
+        cache: Cache des métadonnées injecté
+        
+    Returns:
+        MediaProbeCacheState: Entrées et statistiques du cache
+    """
+    return cache.state()
+
+
+@router.get(
+    "/probes/inspect",
+    response_model=MediaProbe,
+    status_code=status.HTTP_200_OK,
+    summary="Inspecter un média",
+    description="Retourne les métadonnées d'un fichier depuis le cache, en le sondant avec ffmpeg si besoin.",
+)
+async def inspect_probe(
+    cache: Annotated[MediaProbeCache, Depends(get_media_probe_cache)],
+    path: str = Query(..., description="Chemin absolu du fichier"),
+) -> MediaProbe:
+    """Retourne les métadonnées d'un fichier.
+    
+    Args:
+        cache: Cache des métadonnées injecté
+        path: Chemin absolu du fichier
+        
+    Returns:
+        MediaProbe: Entrée du cache pour la version courante du fichier
+        
+    Raises:
+        NotFoundException: Si le fichier n'existe pas
+        HTTPException: Si le fichier ne peut pas être lu par ffmpeg
+    """
+    try:
+        return await cache.inspect(path)
+    except FileNotFoundError:
+        raise NotFoundException(f"Media not found: {path}")
+    except FFmpegError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erreur lors de la lecture du média: {str(e)}"
+        )
+
+
+@router.delete(
+    "/probes",
+    response_model=MediaProbeInvalidation,
+    status_code=status.HTTP_200_OK,
+    summary="Invalider le cache des métadonnées",
+    description="Retire les métadonnées d'un fichier (toutes versions), ou tout le cache si aucun chemin n'est donné.",
+)
+async def invalidate_probes(
+    cache: Annotated[MediaProbeCache, Depends(get_media_probe_cache)],
+    path: str | None = Query(None, description="Chemin absolu du fichier (optionnel, défaut: tout le cache)"),
+) -> MediaProbeInvalidation:
+    """Invalide des entrées du cache des métadonnées.
+    
+    Les caches des processus de rendu ne sont pas concernés: leurs entrées
+    restent liées à la version (taille, mtime) des fichiers.
+    
+    Args:
+        cache: Cache des métadonnées injecté
+        path: Fichier à invalider (None = tout le cache)
+        
+    Returns:
+        MediaProbeInvalidation: Entrées retirées
+        
+    Raises:
+        HTTPException: Si le cache persistant ne peut pas être modifié
+    """
+    try:
+        return await cache.invalidate(path)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erreur lors de l'invalidation des métadonnées: {str(e)}"
+        )
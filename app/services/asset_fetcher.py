@@ -0,0 +1,255 @@
+"""Entrées distantes: téléchargement des URLs http(s) dans un cache local adressé par contenu."""
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+from functools import lru_cache
+from urllib.parse import unquote, urlparse
+
+import httpx
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.services.disk_cache import DiskCache
+
+logger = get_logger(__name__)
+
+# Taille des blocs lus sur la réponse et écrits dans le cache
+CHUNK_SIZE = 256 * 1024
+
+
+class AssetFetchError(ValueError):
+    """Entrée distante impossible à télécharger (erreur HTTP, réseau ou taille)."""
+
+
+def is_url(source: str | None) -> bool:
+    """Indique si une entrée est une URL (http, https ou file) plutôt qu'un chemin local."""
+    return bool(source) and urlparse(source).scheme in ("http", "https", "file")
+
+
+class AssetStore(DiskCache):
+    """Contenus téléchargés, un fichier par empreinte SHA-256, avec éviction LRU.
+
+    Chaque URL a une entrée d'index (``urls/<clé>.json``) qui pointe vers son
+    contenu et garde l'ETag et la date de modification annoncés par le
+    serveur. Deux URLs de même contenu partagent le même fichier.
+    """
+
+    suffix = ".asset"
+
+    @classmethod
+    def from_settings(cls) -> "AssetStore":
+        """Construire le cache à partir de la configuration."""
+        return cls(
+            cache_dir=os.path.join(settings.resources_dir, "asset-cache"),
+            max_bytes=settings.asset_cache_max_bytes,
+        )
+
+    def _index_path(self, url: str) -> str:
+        return os.path.join(self.cache_dir, "urls", hashlib.sha1(url.encode()).hexdigest() + ".json")
+
+    def lookup(self, url: str) -> tuple[dict, str] | None:
+        """Entrée d'index d'une URL et chemin de son contenu, si ce contenu est en cache."""
+        try:
+            with open(self._index_path(url)) as index_file:
+                entry = json.load(index_file)
+        except (OSError, ValueError):
+            return None
+        path = self._paths(entry["sha256"])[0]
+        return (entry, path) if os.path.exists(path) else None
+
+    def record(self, url: str, entry: dict) -> None:
+        """Enregistrer (ou remplacer) l'entrée d'index d'une URL."""
+        index_path = self._index_path(url)
+        os.makedirs(os.path.dirname(index_path), exist_ok=True)
+        tmp_path = index_path + self._tmp_suffix()
+        with open(tmp_path, "w") as index_file:
+            json.dump(entry, index_file)
+        os.replace(tmp_path, index_path)
+
+    def download_path(self, url: str) -> str:
+        """Fichier temporaire du téléchargement d'une URL par ce processus."""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        return os.path.join(self.cache_dir, hashlib.sha1(url.encode()).hexdigest() + self._tmp_suffix())
+
+    def commit(self, tmp_path: str, sha256: str) -> str:
+        """Ranger un contenu téléchargé sous son empreinte (ou réutiliser le contenu identique).
+
+        Returns:
+            Chemin du contenu en cache
+        """
+        path = self._paths(sha256)[0]
+        if os.path.exists(path):
+            os.remove(tmp_path)
+            self.touch(path)
+        else:
+            os.replace(tmp_path, path)
+        self.evict(keep=path)
+        return path
+
+
+class AssetFetcher:
+    """Résout les entrées d'une requête (URL ou chemin) en fichiers locaux.
+
+    Les URLs http(s) sont téléchargées par un client HTTP asynchrone partagé
+    (connexions réutilisées), au plus ``max_concurrency`` à la fois; des
+    demandes simultanées de la même URL partagent un seul téléchargement.
+    Une URL en cache est servie sans requête pendant ``revalidate_after``
+    secondes, puis revalidée (ETag / Last-Modified): une réponse 304 garde le
+    contenu en cache. Les URLs ``file://`` et les chemins sont rendus tels quels.
+    """
+
+    def __init__(
+        self,
+        store: AssetStore,
+        max_download_bytes: int = 200 * 1024 * 1024,
+        timeout: float = 60.0,
+        max_concurrency: int = 8,
+        revalidate_after: float = 300.0,
+    ) -> None:
+        """Initialise le résolveur d'entrées.
+
+        Args:
+            store: Cache des contenus téléchargés
+            max_download_bytes: Taille maximale d'un téléchargement
+            timeout: Délai maximal d'une opération réseau (connexion, lecture) en secondes
+            max_concurrency: Téléchargements simultanés
+            revalidate_after: Âge en secondes au-delà duquel une URL en cache est revalidée
+        """
+        self.store = store
+        self.max_download_bytes = max_download_bytes
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self.revalidate_after = revalidate_after
+        self._client: httpx.AsyncClient | None = None
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._downloads: dict[str, asyncio.Task[str]] = {}
+
+    @classmethod
+    def from_settings(cls) -> "AssetFetcher":
+        """Construire le résolveur à partir de la configuration."""
+        return cls(
+            AssetStore.from_settings(),
+            max_download_bytes=settings.asset_max_download_bytes,
+            timeout=settings.asset_download_timeout,
+            max_concurrency=settings.asset_max_concurrent_downloads,
+            revalidate_after=settings.asset_revalidate_after,
+        )
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Créer le client HTTP (et son pool de connexions) à la première utilisation."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                follow_redirects=True,
+                limits=httpx.Limits(max_connections=self.max_concurrency),
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Fermer le client HTTP."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def fetch(self, source: str) -> str:
+        """Chemin local d'une entrée, téléchargée si c'est une URL http(s).
+
+        Args:
+            source: Chemin local ou URL (http, https, file)
+
+        Returns:
+            Chemin du fichier local (cache pour une URL http(s))
+
+        Raises:
+            AssetFetchError: Si le téléchargement échoue ou dépasse la taille maximale
+        """
+        scheme = urlparse(source).scheme
+        if scheme == "file":
+            return unquote(urlparse(source).path)
+        if scheme not in ("http", "https"):
+            return source
+        # Un seul téléchargement par URL, partagé par les demandes simultanées
+        task = self._downloads.get(source)
+        if task is None:
+            task = asyncio.create_task(self._resolve(source))
+            self._downloads[source] = task
+            task.add_done_callback(lambda _: self._downloads.pop(source, None))
+        return await asyncio.shield(task)
+
+    async def _resolve(self, url: str) -> str:
+        cached = await asyncio.to_thread(self.store.lookup, url)
+        headers: dict[str, str] = {}
+        if cached is not None:
+            entry, path = cached
+            if time.time() - entry["checked_at"] < self.revalidate_after:
+                await asyncio.to_thread(self.store.touch, path)
+                return path
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        async with self._semaphore:
+            try:
+                async with self._get_client().stream("GET", url, headers=headers) as response:
+                    if response.status_code == 304 and cached is not None:
+                        entry, path = cached
+                        await asyncio.to_thread(self.store.record, url, {**entry, "checked_at": time.time()})
+                        await asyncio.to_thread(self.store.touch, path)
+                        logger.debug("Asset not modified: %s", url)
+                        return path
+                    if response.status_code != 200:
+                        raise AssetFetchError(f"Download of {url} failed: HTTP {response.status_code}")
+                    tmp_path, sha256, size = await self._download(url, response)
+            except httpx.HTTPError as e:
+                raise AssetFetchError(f"Download of {url} failed: {e}") from None
+
+        path = await asyncio.to_thread(self.store.commit, tmp_path, sha256)
+        await asyncio.to_thread(self.store.record, url, {
+            "url": url,
+            "sha256": sha256,
+            "size": size,
+            "etag": response.headers.get("etag"),
+            "last_modified": response.headers.get("last-modified"),
+            "checked_at": time.time(),
+        })
+        logger.info("Downloaded %s (%d bytes)", url, size)
+        return path
+
+    async def _download(self, url: str, response: httpx.Response) -> tuple[str, str, int]:
+        """Écrire le corps d'une réponse dans un fichier temporaire du cache.
+
+        Returns:
+            (fichier temporaire, empreinte SHA-256, taille)
+        """
+        declared = response.headers.get("content-length")
+        if declared and declared.isdigit() and int(declared) > self.max_download_bytes:
+            raise AssetFetchError(f"{url} is larger than {self.max_download_bytes} bytes")
+        tmp_path = self.store.download_path(url)
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            with open(tmp_path, "wb") as tmp_file:
+                async for chunk in response.aiter_bytes(CHUNK_SIZE):
+                    size += len(chunk)
+                    if size > self.max_download_bytes:
+                        raise AssetFetchError(f"{url} is larger than {self.max_download_bytes} bytes")
+                    digest.update(chunk)
+                    tmp_file.write(chunk)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+        return tmp_path, digest.hexdigest(), size
+
+
+@lru_cache
+def get_asset_fetcher() -> AssetFetcher:
+    """Get the asset fetcher of this process (shared HTTP client and download cache).
+
+    Returns:
+        AssetFetcher: Fetcher configured from settings
+    """
+    return AssetFetcher.from_settings()
@@ -0,0 +1,281 @@
+"""Mixage audio vectorisé (NumPy) de la voix et de la musique de fond."""
+
+import hashlib
+import json
+import os
+from dataclasses import asdict, dataclass
+
+import numpy as np
+from moviepy.audio.AudioClip import AudioClip
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.models.video_model import DuckingOptions
+from app.services.disk_cache import DiskCache
+from app.services.ffmpeg_tools import run_ffmpeg
+
+logger = get_logger(__name__)
+
+SAMPLE_RATE = 44100
+CHANNELS = 2
+
+
+@dataclass(frozen=True)
+class PcmTrack:
+    """Audio décodé en PCM float32 entrelacé (f32le) dans un fichier brut."""
+
+    path: str
+    sample_rate: int
+    channels: int
+    n_frames: int
+
+    @property
+    def duration(self) -> float:
+        return self.n_frames / self.sample_rate
+
+    def open(self) -> np.ndarray:
+        """Projeter le fichier en mémoire (lecture seule), forme (frames, canaux)."""
+        if self.n_frames == 0:
+            return np.zeros((0, self.channels), dtype=np.float32)
+        return np.memmap(self.path, dtype=np.float32, mode="r", shape=(self.n_frames, self.channels))
+
+    def ffmpeg_input_args(self) -> list[str]:
+        """Arguments d'entrée ffmpeg pour lire ce fichier brut."""
+        return ["-f", "f32le", "-ar", str(self.sample_rate), "-ac", str(self.channels), "-i", self.path]
+
+
+class PcmAudioClip(AudioClip):
+    """Clip audio MoviePy lisant une piste PCM décodée, projetée en mémoire.
+
+    Remplace ``AudioFileClip`` (lecture par petits blocs depuis un processus
+    ffmpeg) et ``AudioArrayClip``: les instants consécutifs à la fréquence de
+    la piste, demandés par l'écriture de la vidéo, sont servis par une tranche
+    du memmap, sans décodage ni copie.
+    """
+
+    def __init__(self, track: PcmTrack) -> None:
+        """Initialise le clip.
+
+        Args:
+            track: Piste décodée (voix ou mix final)
+        """
+        super().__init__(duration=track.duration, fps=track.sample_rate)
+        self.track = track
+        self.nchannels = track.channels
+        self._frames: np.ndarray | None = track.open()
+        self.make_frame = self._make_frame
+
+    def _make_frame(self, t: float | np.ndarray) -> np.ndarray:
+        frames = self._frames
+        if frames is None:
+            raise ValueError(f"Audio clip closed: {self.track.path}")
+        indexes = np.round(np.asarray(t) * self.fps).astype(np.int64)
+        if indexes.ndim == 0:
+            index = int(indexes)
+            if 0 <= index < len(frames):
+                return frames[index]
+            return np.zeros(self.nchannels, dtype=np.float32)
+        if (
+            len(indexes)
+            and 0 <= indexes[0] <= indexes[-1] < len(frames)
+            and indexes[-1] - indexes[0] == len(indexes) - 1
+        ):
+            return frames[indexes[0]:indexes[-1] + 1]
+        valid = (indexes >= 0) & (indexes < len(frames))
+        result = np.zeros((len(indexes), self.nchannels), dtype=np.float32)
+        result[valid] = frames[indexes[valid]]
+        return result
+
+    def close(self) -> None:
+        """Libérer la projection en mémoire de la piste."""
+        self._frames = None
+
+
+def decode_pcm(source: str, dest: str, sample_rate: int = SAMPLE_RATE, channels: int = CHANNELS) -> PcmTrack:
+    """Décoder un fichier audio en PCM float32 brut.
+
+    Args:
+        source: Fichier audio (tout format lisible par ffmpeg)
+        dest: Fichier brut de destination
+        sample_rate: Fréquence d'échantillonnage de sortie
+        channels: Nombre de canaux de sortie
+
+    Returns:
+        PcmTrack: Piste décodée
+
+    Raises:
+        FFmpegError: Si le décodage échoue
+    """
+    run_ffmpeg([
+        "-i", source, "-vn",
+        "-f", "f32le", "-acodec", "pcm_f32le",
+        "-ac", str(channels), "-ar", str(sample_rate),
+        dest,
+    ])
+    frame_size = channels * np.dtype(np.float32).itemsize
+    return PcmTrack(dest, sample_rate, channels, os.path.getsize(dest) // frame_size)
+
+
+class PcmCache(DiskCache):
+    """Musiques de fond décodées une fois en PCM float32 et réutilisées par memmap.
+
+    Les entrées sont indexées par (chemin, taille, mtime, fréquence, canaux).
+    """
+
+    suffix = ".f32"
+
+    @classmethod
+    def from_settings(cls) -> "PcmCache":
+        """Construire le cache à partir de la configuration."""
+        return cls(
+            cache_dir=os.path.join(settings.resources_dir, "audio-cache"),
+            max_bytes=settings.audio_cache_max_bytes,
+        )
+
+    def _key(self, source: str, sample_rate: int, channels: int) -> str:
+        stat = os.stat(source)
+        identity = f"{os.path.abspath(source)}|{stat.st_size}|{stat.st_mtime_ns}|{sample_rate}|{channels}"
+        return hashlib.sha1(identity.encode()).hexdigest()
+
+    def get_or_decode(self, source: str, sample_rate: int = SAMPLE_RATE, channels: int = CHANNELS) -> PcmTrack:
+        """Retourner la piste décodée, en la décodant si elle n'est pas en cache.
+
+        Args:
+            source: Fichier audio
+            sample_rate: Fréquence d'échantillonnage
+            channels: Nombre de canaux
+
+        Returns:
+            PcmTrack: Piste décodée en cache
+
+        Raises:
+            FFmpegError: Si le décodage échoue
+        """
+        pcm_path, meta_path = self._paths(self._key(source, sample_rate, channels))
+        try:
+            with open(meta_path) as meta_file:
+                track = PcmTrack(**json.load(meta_file))
+            self.touch(pcm_path)
+            return track
+        except (OSError, ValueError, TypeError):
+            pass
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_suffix = self._tmp_suffix()
+        logger.info("Decoding %s to PCM cache", source)
+        decoded = decode_pcm(source, pcm_path + tmp_suffix, sample_rate, channels)
+        track = PcmTrack(**{**asdict(decoded), "path": pcm_path})
+        with open(meta_path + tmp_suffix, "w") as meta_file:
+            json.dump(asdict(track), meta_file)
+        os.replace(pcm_path + tmp_suffix, pcm_path)
+        os.replace(meta_path + tmp_suffix, meta_path)
+
+        self.evict(keep=pcm_path)
+        return track
+
+
+def _trailing_mean(values: np.ndarray, width: int) -> np.ndarray:
+    """Moyenne glissante causale, le début étant complété par la première valeur."""
+    if width <= 1:
+        return values
+    padded = np.concatenate([np.full(width - 1, values[0]), values])
+    cumsum = np.cumsum(padded, dtype=np.float64)
+    cumsum[width:] = cumsum[width:] - cumsum[:-width]
+    return cumsum[width - 1:] / width
+
+
+def ducking_gain_curve(voice: np.ndarray, sample_rate: int, options: DuckingOptions) -> tuple[np.ndarray, int]:
+    """Calculer la courbe de gain de ducking à partir de l'enveloppe RMS de la voix.
+
+    La voix est découpée en fenêtres de ``window_ms``; chaque fenêtre dont le
+    niveau RMS dépasse le seuil vise le gain ``-depth_db``. La cible est lissée
+    par deux moyennes glissantes causales (attaque et relâchement): le minimum
+    des deux descend à la vitesse de l'attaque et remonte à celle du relâchement.
+
+    Args:
+        voice: Voix, forme (frames, canaux)
+        sample_rate: Fréquence d'échantillonnage
+        options: Paramètres du ducking
+
+    Returns:
+        (gain linéaire par fenêtre, taille d'une fenêtre en frames)
+    """
+    window = max(1, int(sample_rate * options.window_ms / 1000))
+    n_windows = max(1, -(-len(voice) // window))
+
+    energy = np.zeros(n_windows * window, dtype=np.float32)
+    if len(voice):
+        np.square(voice.mean(axis=1, dtype=np.float32), out=energy[:len(voice)])
+    rms = np.sqrt(energy.reshape(n_windows, window).mean(axis=1))
+    level_db = 20.0 * np.log10(rms + 1e-10)
+
+    target = np.where(level_db > options.threshold_db, 10.0 ** (-options.depth_db / 20.0), 1.0)
+    attack = _trailing_mean(target, max(1, round(options.attack_ms / options.window_ms)))
+    release = _trailing_mean(target, max(1, round(options.release_ms / options.window_ms)))
+    return np.minimum(attack, release).astype(np.float32), window
+
+
+class AudioMixer:
+    """Mixe la voix et une musique de fond bouclée en une passe vectorisée."""
+
+    def __init__(self, pcm_cache: PcmCache) -> None:
+        """Initialise le mixeur.
+
+        Args:
+            pcm_cache: Cache des musiques décodées
+        """
+        self.pcm_cache = pcm_cache
+
+    def mix(
+        self,
+        voice: PcmTrack,
+        music_path: str,
+        gain: float,
+        dest: str,
+        ducking: DuckingOptions | None = None,
+    ) -> PcmTrack:
+        """Mixer la voix avec la musique de fond bouclée à la durée de la voix.
+
+        La musique (décodée une fois, lue par memmap) est mise au gain demandé
+        une seule fois, puis ajoutée par tranches à la voix directement dans le
+        fichier de sortie projeté en mémoire. Avec le ducking, la
+        courbe de gain calculée sur la voix est interpolée sur chaque tranche.
+
+        Args:
+            voice: Voix décodée
+            music_path: Fichier de la musique de fond
+            gain: Gain linéaire appliqué à la musique
+            dest: Fichier brut de sortie
+            ducking: Paramètres du ducking (None = gain constant)
+
+        Returns:
+            PcmTrack: Mix final (même format que la voix)
+
+        Raises:
+            FFmpegError: Si le décodage de la musique échoue
+        """
+        music_track = self.pcm_cache.get_or_decode(music_path, voice.sample_rate, voice.channels)
+        mixed = np.memmap(dest, dtype=np.float32, mode="w+", shape=(max(voice.n_frames, 1), voice.channels))
+        voice_frames = voice.open()
+        mixed[:voice.n_frames] = voice_frames
+
+        curve: np.ndarray | None = None
+        if ducking is not None:
+            curve, window = ducking_gain_curve(voice_frames, voice.sample_rate, ducking)
+            centers = np.arange(len(curve)) * window + window / 2
+
+        music = music_track.open()
+        if len(music) and gain > 0:
+            music = np.multiply(music, np.float32(gain))
+            for start in range(0, voice.n_frames, len(music)):
+                stop = min(start + len(music), voice.n_frames)
+                if curve is None:
+                    mixed[start:stop] += music[:stop - start]
+                else:
+                    segment_gain = np.interp(np.arange(start, stop), centers, curve).astype(np.float32)
+                    mixed[start:stop] += music[:stop - start] * segment_gain[:, np.newaxis]
+
+        np.clip(mixed, -1.0, 1.0, out=mixed)
+        mixed.flush()
+        del mixed
+        return PcmTrack(dest, voice.sample_rate, voice.channels, voice.n_frames)
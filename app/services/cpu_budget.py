@@ -0,0 +1,119 @@
+"""Budget CPU des rendus: quota du conteneur et répartition des threads ffmpeg."""
+
+import os
+
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+_CGROUP_V2_CPU_MAX = "/sys/fs/cgroup/cpu.max"
+_CGROUP_V1_DIRS = ("/sys/fs/cgroup/cpu", "/sys/fs/cgroup/cpu,cpuacct")
+
+
+def _read(path: str) -> str | None:
+    try:
+        with open(path) as file:
+            return file.read().strip()
+    except OSError:
+        return None
+
+
+def cgroup_cpu_quota() -> float | None:
+    """Lire le quota CPU du cgroup du processus (v2 ``cpu.max`` ou v1 CFS).
+
+    Returns:
+        Nombre de CPUs autorisés (fractionnaire), ou None sans quota
+    """
+    cpu_max = _read(_CGROUP_V2_CPU_MAX)
+    if cpu_max is not None:
+        quota, _, period = cpu_max.partition(" ")
+        if quota != "max" and period:
+            return int(quota) / int(period)
+        return None
+
+    for cgroup_dir in _CGROUP_V1_DIRS:
+        cfs_quota = _read(os.path.join(cgroup_dir, "cpu.cfs_quota_us"))
+        cfs_period = _read(os.path.join(cgroup_dir, "cpu.cfs_period_us"))
+        if cfs_quota is not None and cfs_period is not None:
+            if int(cfs_quota) > 0 and int(cfs_period) > 0:
+                return int(cfs_quota) / int(cfs_period)
+            return None
+    return None
+
+
+def available_cpus() -> float:
+    """Nombre de CPUs réellement utilisables: affinité du processus, bornée par le quota cgroup."""
+    try:
+        cpus: float = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    quota = cgroup_cpu_quota()
+    if quota is not None:
+        cpus = min(cpus, quota)
+    return max(cpus, 1.0)
+
+
+class CpuBudget:
+    """Répartit un budget de threads entre les rendus en cours.
+
+    Chaque rendu prend à son démarrage une part équitable des threads libres
+    (budget divisé par le nombre de rendus actifs ou attendus, lui compris) et
+    la rend à la fin: la somme des threads attribués ne dépasse pas le budget
+    tant qu'il y a au plus ``total_threads / min_threads`` rendus simultanés.
+    """
+
+    def __init__(self, total_threads: int, min_threads: int = 1, max_threads: int | None = None) -> None:
+        """Initialise le budget.
+
+        Args:
+            total_threads: Nombre total de threads d'encodage disponibles
+            min_threads: Threads minimum d'un rendu
+            max_threads: Threads maximum d'un rendu (None = pas de limite)
+        """
+        self.total_threads = max(1, total_threads)
+        self.min_threads = max(1, min_threads)
+        self.max_threads = max_threads
+        self._leases: dict[int, int] = {}
+        self._next_lease = 0
+
+    @classmethod
+    def from_settings(cls) -> "CpuBudget":
+        """Construire le budget à partir de la configuration (ou du quota CPU détecté)."""
+        total = settings.render_cpu_budget or available_cpus()
+        budget = cls(max(1, int(total)), settings.render_min_threads, settings.render_max_threads)
+        logger.info("Render CPU budget: %d threads", budget.total_threads)
+        return budget
+
+    @property
+    def active(self) -> int:
+        """Nombre de rendus détenant des threads."""
+        return len(self._leases)
+
+    @property
+    def allocated(self) -> int:
+        """Nombre de threads actuellement attribués."""
+        return sum(self._leases.values())
+
+    def acquire(self, demand: int = 1) -> tuple[int, int]:
+        """Attribuer des threads à un rendu qui démarre.
+
+        Args:
+            demand: Nombre de rendus qui vont s'exécuter simultanément, lui compris
+
+        Returns:
+            (identifiant du bail, nombre de threads attribués)
+        """
+        free = self.total_threads - self.allocated
+        threads = min(self.total_threads // max(demand, self.active + 1), free)
+        if self.max_threads:
+            threads = min(threads, self.max_threads)
+        threads = max(threads, self.min_threads)
+        lease = self._next_lease
+        self._next_lease += 1
+        self._leases[lease] = threads
+        return lease, threads
+
+    def release(self, lease: int) -> None:
+        """Rendre les threads d'un rendu terminé."""
+        self._leases.pop(lease, None)
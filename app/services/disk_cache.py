@@ -0,0 +1,88 @@
+"""Base des caches disque à éviction LRU sur la taille totale."""
+
+import os
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class DiskCache:
+    """Répertoire de fichiers de cache avec éviction LRU.
+
+    Chaque entrée est un fichier ``<clé><suffix>`` accompagné d'un fichier de
+    métadonnées ``<clé>.json``. La date de modification de l'entrée sert de
+    date de dernier usage (mise à jour par ``touch`` à chaque lecture).
+    """
+
+    suffix = ".bin"
+
+    def __init__(self, cache_dir: str, max_bytes: int) -> None:
+        """Initialise le cache.
+
+        Args:
+            cache_dir: Répertoire du cache
+            max_bytes: Taille totale maximale des entrées
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+
+    def _paths(self, key: str) -> tuple[str, str]:
+        """Chemins (données, métadonnées) d'une entrée."""
+        base = os.path.join(self.cache_dir, key)
+        return f"{base}{self.suffix}", f"{base}.json"
+
+    @staticmethod
+    def _tmp_suffix() -> str:
+        """Suffixe des fichiers en cours d'écriture (renommés atomiquement ensuite)."""
+        return f".{os.getpid()}.tmp"
+
+    @staticmethod
+    def touch(path: str) -> None:
+        """Marquer une entrée comme utilisée."""
+        os.utime(path)
+
+    def entries(self) -> list[tuple[str, int, float]]:
+        """Lister les entrées du cache.
+
+        Returns:
+            (chemin, taille en octets, dernier usage) du plus ancien au plus récent
+        """
+        if not os.path.isdir(self.cache_dir):
+            return []
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(self.suffix):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((path, stat.st_size, stat.st_mtime))
+        return sorted(entries, key=lambda entry: entry[2])
+
+    def remove(self, path: str) -> None:
+        """Supprimer une entrée et ses métadonnées."""
+        for stale in (path, path.removesuffix(self.suffix) + ".json"):
+            try:
+                os.remove(stale)
+            except FileNotFoundError:
+                pass
+
+    def evict(self, keep: str | None = None) -> None:
+        """Supprimer les entrées les moins récemment utilisées au-delà de la taille maximale.
+
+        Args:
+            keep: Entrée à ne jamais supprimer (celle qui vient d'être créée)
+        """
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for path, size, _ in entries:
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            self.remove(path)
+            total -= size
+            logger.info("Evicted cache entry %s", path)
@@ -0,0 +1,80 @@
+"""Profils d'encodage nommés (résolution, débit, preset, GOP, débit audio)."""
+
+from dataclasses import dataclass
+
+from app.services.ffmpeg_encoder import EncodeSettings
+
+
+@dataclass(frozen=True)
+class EncodeProfile:
+    """Paramètres d'encodage d'une variante de sortie."""
+
+    name: str
+    height: int | None
+    preset: str
+    crf: int | None
+    video_bitrate: str | None
+    gop_seconds: float | None
+    audio_bitrate: str
+
+    def settings(self, fps: int, scale_height: int | None = None, threads: int | None = None) -> EncodeSettings:
+        """Paramètres d'encodage du profil pour une cadence donnée.
+
+        Args:
+            fps: Cadence de sortie
+            scale_height: Hauteur maximale à appliquer dans le graphe (None = pas de mise à l'échelle)
+            threads: Threads de l'encodeur (None = choix de ffmpeg)
+
+        Returns:
+            EncodeSettings: Paramètres pour l'encodeur
+        """
+        return EncodeSettings(
+            fps=fps,
+            height=scale_height,
+            preset=self.preset,
+            crf=self.crf,
+            video_bitrate=self.video_bitrate,
+            gop=round(self.gop_seconds * fps) if self.gop_seconds else None,
+            audio_bitrate=self.audio_bitrate,
+            threads=threads,
+        )
+
+
+# Avec un CRF, le débit vidéo est un plafond (-maxrate): les scènes simples
+# des templates ne consomment que ce dont elles ont besoin
+ENCODE_PROFILES: dict[str, EncodeProfile] = {
+    profile.name: profile
+    for profile in (
+        EncodeProfile("1080p", 1080, "veryfast", 21, "4500k", 2.0, "192k"),
+        EncodeProfile("720p", 720, "veryfast", 23, "2500k", 2.0, "128k"),
+        EncodeProfile("480p", 480, "veryfast", 25, "1200k", 2.0, "96k"),
+        # Taille du template, paramètres historiques du service
+        EncodeProfile("source", None, "ultrafast", None, "2000k", None, "192k"),
+    )
+}
+
+
+def resolve_profile(resolution: str | None, profile: str | None = None) -> EncodeProfile:
+    """Choisir le profil d'encodage d'une requête.
+
+    Le profil explicite l'emporte; sinon la résolution désigne le profil du
+    même nom, et l'absence de résolution conserve la taille du template.
+
+    Args:
+        resolution: Résolution demandée ("1080p", "720p", "480p") ou None
+        profile: Nom du profil demandé ou None
+
+    Returns:
+        EncodeProfile: Profil à utiliser
+
+    Raises:
+        ValueError: Si le profil ou la résolution n'est pas reconnu
+    """
+    name = profile or (resolution.strip().lower() if resolution else "source")
+    try:
+        return ENCODE_PROFILES[name]
+    except KeyError:
+        kind = "profile" if profile else "resolution"
+        raise ValueError(
+            f"Unsupported {kind}: {name} (available: {', '.join(ENCODE_PROFILES)})"
+        ) from None
@@ -0,0 +1,258 @@
+"""Encodeur ffmpeg: un seul graphe de filtres, sans passage des frames par Python."""
+
+from dataclasses import dataclass, field
+from typing import Callable, Iterable
+
+from app.core.logging import get_logger
+from app.services.ffmpeg_tools import run_ffmpeg, run_ffmpeg_with_input, run_ffmpeg_with_progress
+from app.services.progress import total_frames
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class AudioSource:
+    """Entrée audio du graphe de filtres."""
+
+    input_args: list[str]
+    volume: float = 1.0
+    loop: bool = False
+
+
+@dataclass(frozen=True)
+class EncodeSettings:
+    """Paramètres d'encodage de la sortie."""
+
+    fps: int
+    height: int | None = None
+    video_codec: str = "libx264"
+    preset: str = "ultrafast"
+    crf: int | None = None
+    video_bitrate: str | None = "2000k"
+    gop: int | None = None
+    audio_codec: str = "aac"
+    audio_bitrate: str = "192k"
+    threads: int | None = None
+    extra_args: list[str] = field(default_factory=list)
+
+    def scale_filter(self) -> str | None:
+        """Filtre de mise à l'échelle vers ``height`` (jamais d'agrandissement)."""
+        if self.height is None:
+            return None
+        return f"scale=-2:min(ih\\,{self.height})"
+
+    def rate_control_args(self) -> list[str]:
+        """Arguments de débit et de GOP de l'encodeur vidéo.
+
+        Avec un CRF, ``video_bitrate`` devient un plafond (VBV) plutôt qu'une cible.
+        """
+        args: list[str] = []
+        if self.crf is not None:
+            args += ["-crf", str(self.crf)]
+            if self.video_bitrate:
+                args += ["-maxrate", self.video_bitrate, "-bufsize", self.video_bitrate]
+        elif self.video_bitrate:
+            args += ["-b:v", self.video_bitrate]
+        if self.gop:
+            args += ["-g", str(self.gop)]
+        return args
+
+
+def build_audio_graph(audio_sources: list[AudioSource]) -> str:
+    """Construire le graphe de filtres audio.
+
+    Les sources audio sont les entrées 1 et suivantes (l'entrée 0 est la
+    vidéo), mixées par ``amix`` sans normalisation (la voix garde son niveau,
+    la musique reçoit son gain par ``volume``).
+
+    Args:
+        audio_sources: Sources audio, la première fixant la durée
+
+    Returns:
+        Le graphe audio, produisant la sortie [a]
+    """
+    chains = []
+    labels = []
+    for index, source in enumerate(audio_sources, start=1):
+        if source.volume != 1.0:
+            chains.append(f"[{index}:a]volume={source.volume:g}[a{index}]")
+            labels.append(f"[a{index}]")
+        else:
+            labels.append(f"[{index}:a]")
+    # Sortie stéréo quel que soit le format de la voix, comme le mixeur NumPy
+    if len(labels) == 1:
+        chains.append(f"{labels[0]}aformat=channel_layouts=stereo[a]")
+    else:
+        chains.append(
+            f"{''.join(labels)}amix=inputs={len(labels)}:duration=first:dropout_transition=0:normalize=0,"
+            "aformat=channel_layouts=stereo[a]"
+        )
+    return ";".join(chains)
+
+
+def build_filter_graph(encode: EncodeSettings, audio_sources: list[AudioSource]) -> str:
+    """Construire le graphe de filtres vidéo et audio.
+
+    L'entrée 0 est la vidéo (template bouclé ou images brutes), les entrées
+    suivantes sont les sources audio (voir ``build_audio_graph``).
+
+    Args:
+        encode: Paramètres d'encodage (cadence et hauteur de sortie)
+        audio_sources: Sources audio, la première fixant la durée
+
+    Returns:
+        Le graphe pour ``-filter_complex``, produisant les sorties [v] et [a]
+    """
+    video_filters = [f"fps={encode.fps}"]
+    scale = encode.scale_filter()
+    if scale:
+        video_filters.append(scale)
+    return f"[0:v]{','.join(video_filters)},format=yuv420p[v];{build_audio_graph(audio_sources)}"
+
+
+def audio_input_args(audio_sources: list[AudioSource]) -> list[str]:
+    """Arguments d'entrée ffmpeg des sources audio (bouclées si demandé)."""
+    args: list[str] = []
+    for source in audio_sources:
+        if source.loop:
+            args += ["-stream_loop", "-1"]
+        args += source.input_args
+    return args
+
+
+def build_encode_command(
+    video_input_args: list[str],
+    audio_sources: list[AudioSource],
+    output_path: str,
+    duration: float,
+    encode: EncodeSettings,
+) -> list[str]:
+    """Construire la commande ffmpeg complète (sans le binaire).
+
+    Args:
+        video_input_args: Arguments d'entrée de la vidéo, coupée à ``duration``
+        audio_sources: Sources audio à mixer
+        output_path: Fichier de sortie
+        duration: Durée de l'audio en secondes (la vidéo garde sa dernière image commencée)
+        encode: Paramètres d'encodage
+
+    Returns:
+        Arguments de la commande ffmpeg
+    """
+    args = [*video_input_args, *audio_input_args(audio_sources)]
+    args += [
+        "-filter_complex", build_filter_graph(encode, audio_sources),
+        "-map", "[v]", "-map", "[a]",
+        # Coupe après total_frames images, comme l'encodage segmenté
+        "-t", f"{total_frames(duration, encode.fps) / encode.fps:.3f}",
+        "-c:v", encode.video_codec, "-preset", encode.preset, *encode.rate_control_args(),
+        *(["-threads", str(encode.threads)] if encode.threads else []),
+        "-c:a", encode.audio_codec, "-b:a", encode.audio_bitrate,
+        *encode.extra_args,
+        "-movflags", "+faststart",
+        output_path,
+    ]
+    return args
+
+
+class FFmpegEncoder:
+    """Encode une vidéo (template bouclé ou images brutes) avec son audio dans un sous-processus ffmpeg."""
+
+    def encode(
+        self,
+        template_path: str,
+        audio_sources: list[AudioSource],
+        output_path: str,
+        duration: float,
+        encode: EncodeSettings,
+        on_progress: Callable[[dict[str, str]], None] | None = None,
+    ) -> None:
+        """Encoder la vidéo.
+
+        Args:
+            template_path: Template vidéo
+            audio_sources: Sources audio à mixer
+            output_path: Fichier de sortie
+            duration: Durée de la sortie en secondes
+            encode: Paramètres d'encodage
+            on_progress: Fonction appelée avec chaque bloc de progression ffmpeg
+
+        Raises:
+            FFmpegError: Si ffmpeg échoue
+        """
+        command = build_encode_command(
+            ["-stream_loop", "-1", "-i", template_path], audio_sources, output_path, duration, encode
+        )
+        logger.debug("ffmpeg encode: %s", command)
+        run_ffmpeg_with_progress(command, on_progress)
+
+    def encode_frames(
+        self,
+        frames: Iterable[bytes | memoryview],
+        width: int,
+        height: int,
+        audio_sources: list[AudioSource],
+        output_path: str,
+        duration: float,
+        encode: EncodeSettings,
+    ) -> None:
+        """Encoder des images RGB brutes produites en Python, écrites sur l'entrée de ffmpeg.
+
+        Args:
+            frames: Images RGB24 consécutives (une ou plusieurs par bloc) de taille ``width`` x ``height``
+            width: Largeur des images
+            height: Hauteur des images
+            audio_sources: Sources audio à mixer
+            output_path: Fichier de sortie
+            duration: Durée de la sortie en secondes
+            encode: Paramètres d'encodage
+
+        Raises:
+            FFmpegError: Si ffmpeg échoue
+        """
+        video_input = [
+            "-f", "rawvideo", "-pix_fmt", "rgb24", "-s", f"{width}x{height}",
+            "-framerate", str(encode.fps), "-i", "pipe:0",
+        ]
+        command = build_encode_command(video_input, audio_sources, output_path, duration, encode)
+        logger.debug("ffmpeg encode: %s", command)
+        run_ffmpeg_with_input(command, frames)
+
+    def remux(
+        self,
+        video_input_args: list[str],
+        audio_sources: list[AudioSource],
+        output_path: str,
+        n_frames: int,
+        encode: EncodeSettings,
+    ) -> None:
+        """Multiplexer l'audio sur une piste vidéo déjà encodée, sans la ré-encoder.
+
+        Seul l'audio (mixé par le même graphe que pour un encodage complet)
+        est encodé; la piste vidéo est copiée telle quelle. La sortie est
+        coupée à la durée des ``n_frames`` images, et non à celle de l'audio:
+        la dernière image, commencée avant la fin de l'audio, est conservée.
+
+        Args:
+            video_input_args: Arguments d'entrée de la piste vidéo, déjà à la durée de la sortie
+            audio_sources: Sources audio à mixer
+            output_path: Fichier de sortie
+            n_frames: Nombre d'images de la piste vidéo
+            encode: Paramètres d'encodage (cadence, audio)
+
+        Raises:
+            FFmpegError: Si ffmpeg échoue
+        """
+        command = [
+            *video_input_args,
+            *audio_input_args(audio_sources),
+            "-filter_complex", build_audio_graph(audio_sources),
+            "-map", "0:v:0", "-map", "[a]",
+            "-t", f"{n_frames / encode.fps:.3f}",
+            "-c:v", "copy",
+            "-c:a", encode.audio_codec, "-b:a", encode.audio_bitrate,
+            "-movflags", "+faststart",
+            output_path,
+        ]
+        logger.debug("ffmpeg remux: %s", command)
+        run_ffmpeg(command)
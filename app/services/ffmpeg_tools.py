@@ -0,0 +1,214 @@
+"""Utilitaires ffmpeg: exécution de commandes et lecture des métadonnées d'un média."""
+
+import re
+import subprocess
+import tempfile
+from dataclasses import dataclass
+from typing import Callable, Iterable
+
+from moviepy.config import get_setting
+
+_DURATION_RE = re.compile(r"Duration: (\d+):(\d+):(\d+(?:\.\d+)?)")
+_VIDEO_RE = re.compile(r"Stream #\S+.*?: Video: (\w+)(.*)")
+_AUDIO_RE = re.compile(r"Stream #\S+.*?: Audio: (\w+)(.*)")
+_SIZE_RE = re.compile(r"\b(\d{2,5})x(\d{2,5})\b")
+_FPS_RE = re.compile(r"([\d.]+)(k?) (?:fps|tbr)")
+_SAMPLE_RATE_RE = re.compile(r"(\d+) Hz")
+_CHANNELS_RE = re.compile(r"Hz, (mono|stereo|(\d+) channels|[\w.()]+)")
+
+
+class FFmpegError(RuntimeError):
+    """Échec d'une commande ffmpeg."""
+
+
+@dataclass(frozen=True)
+class MediaInfo:
+    """Métadonnées d'un fichier média lues par ffmpeg."""
+
+    path: str
+    duration: float
+    video_codec: str | None = None
+    width: int | None = None
+    height: int | None = None
+    fps: float | None = None
+    audio_codec: str | None = None
+    sample_rate: int | None = None
+    channels: int | None = None
+
+    @property
+    def has_video(self) -> bool:
+        return self.video_codec is not None
+
+    @property
+    def has_audio(self) -> bool:
+        return self.audio_codec is not None
+
+
+def get_ffmpeg_binary() -> str:
+    """Chemin du binaire ffmpeg utilisé par MoviePy (imageio-ffmpeg ou FFMPEG_BINARY)."""
+    return get_setting("FFMPEG_BINARY")
+
+
+def run_ffmpeg(args: list[str], timeout: float | None = None) -> subprocess.CompletedProcess[bytes]:
+    """Exécuter ffmpeg avec les arguments donnés (sortie écrasée, logs d'erreur seulement).
+
+    Args:
+        args: Arguments de la commande (sans le binaire)
+        timeout: Durée maximale en secondes
+
+    Returns:
+        Le processus terminé
+
+    Raises:
+        FFmpegError: Si ffmpeg retourne un code d'erreur
+    """
+    command = [get_ffmpeg_binary(), "-hide_banner", "-nostdin", "-loglevel", "error", "-y", *args]
+    result = subprocess.run(command, capture_output=True, timeout=timeout)
+    if result.returncode != 0:
+        stderr = result.stderr.decode(errors="replace").strip()
+        raise FFmpegError(f"ffmpeg failed ({result.returncode}): {stderr[-2000:]}")
+    return result
+
+
+def run_ffmpeg_with_progress(
+    args: list[str],
+    on_progress: Callable[[dict[str, str]], None] | None = None,
+) -> None:
+    """Exécuter ffmpeg en lisant sa progression (``-progress pipe:1``).
+
+    ffmpeg écrit un bloc ``clé=valeur`` (frame, fps, out_time_us, speed...)
+    terminé par ``progress=continue`` ou ``progress=end`` environ deux fois par
+    seconde; chaque bloc complet est transmis à ``on_progress``.
+
+    Args:
+        args: Arguments de la commande (sans le binaire)
+        on_progress: Fonction appelée avec chaque bloc de progression
+
+    Raises:
+        FFmpegError: Si ffmpeg retourne un code d'erreur
+    """
+    command = [
+        get_ffmpeg_binary(), "-hide_banner", "-nostdin", "-loglevel", "error", "-y",
+        "-progress", "pipe:1", "-nostats", *args,
+    ]
+    # stderr dans un fichier: un pipe non lu pourrait bloquer ffmpeg
+    with tempfile.TemporaryFile() as stderr_file:
+        process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=stderr_file, text=True)
+        assert process.stdout is not None
+        block: dict[str, str] = {}
+        for line in process.stdout:
+            key, _, value = line.strip().partition("=")
+            block[key] = value
+            if key == "progress":
+                if on_progress is not None:
+                    on_progress(block)
+                block = {}
+        returncode = process.wait()
+        if returncode != 0:
+            stderr_file.seek(0)
+            stderr = stderr_file.read().decode(errors="replace").strip()
+            raise FFmpegError(f"ffmpeg failed ({returncode}): {stderr[-2000:]}")
+
+
+def run_ffmpeg_with_input(args: list[str], chunks: Iterable[bytes | memoryview]) -> None:
+    """Exécuter ffmpeg en lui écrivant des données brutes sur son entrée standard (``pipe:0``).
+
+    Args:
+        args: Arguments de la commande (sans le binaire), lisant ``pipe:0``
+        chunks: Données à écrire, dans l'ordre
+
+    Raises:
+        FFmpegError: Si ffmpeg retourne un code d'erreur
+    """
+    command = [get_ffmpeg_binary(), "-hide_banner", "-loglevel", "error", "-y", *args]
+    with tempfile.TemporaryFile() as stderr_file:
+        process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=stderr_file)
+        assert process.stdin is not None
+        try:
+            for chunk in chunks:
+                process.stdin.write(chunk)
+        except BrokenPipeError:
+            # ffmpeg s'est arrêté: son code de retour et stderr expliquent pourquoi
+            pass
+        finally:
+            try:
+                process.stdin.close()
+            except BrokenPipeError:
+                pass
+            returncode = process.wait()
+        if returncode != 0:
+            stderr_file.seek(0)
+            stderr = stderr_file.read().decode(errors="replace").strip()
+            raise FFmpegError(f"ffmpeg failed ({returncode}): {stderr[-2000:]}")
+
+
+def count_video_frames(path: str) -> int:
+    """Compter les images de la première piste vidéo d'un fichier (sans décodage).
+
+    Args:
+        path: Chemin du fichier
+
+    Returns:
+        Nombre d'images (paquets vidéo)
+
+    Raises:
+        FFmpegError: Si le fichier ne peut pas être lu
+    """
+    # Une ligne par paquet copié (framecrc), les commentaires commençant par "#"
+    result = run_ffmpeg(["-i", path, "-map", "0:v:0", "-c", "copy", "-f", "framecrc", "-"])
+    return sum(1 for line in result.stdout.splitlines() if line and not line.startswith(b"#"))
+
+
+def probe_media(path: str) -> MediaInfo:
+    """Lire la durée et les flux d'un fichier média (``ffmpeg -i``).
+
+    Args:
+        path: Chemin du fichier
+
+    Returns:
+        MediaInfo: Métadonnées du fichier
+
+    Raises:
+        FFmpegError: Si le fichier ne peut pas être lu
+    """
+    result = subprocess.run(
+        [get_ffmpeg_binary(), "-hide_banner", "-nostdin", "-i", path],
+        capture_output=True,
+    )
+    # Sans sortie, ffmpeg termine toujours en erreur: seule la présence de la durée compte
+    output = result.stderr.decode(errors="replace")
+    duration_match = _DURATION_RE.search(output)
+    if duration_match is None:
+        raise FFmpegError(f"Unable to probe media {path}: {output.strip()[-500:]}")
+    hours, minutes, seconds = duration_match.groups()
+    info: dict = {"duration": int(hours) * 3600 + int(minutes) * 60 + float(seconds)}
+
+    video_match = _VIDEO_RE.search(output)
+    if video_match:
+        info["video_codec"] = video_match.group(1)
+        details = video_match.group(2)
+        size_match = _SIZE_RE.search(details)
+        if size_match:
+            info["width"], info["height"] = int(size_match.group(1)), int(size_match.group(2))
+        fps_match = _FPS_RE.search(details)
+        if fps_match:
+            info["fps"] = float(fps_match.group(1)) * (1000 if fps_match.group(2) else 1)
+
+    audio_match = _AUDIO_RE.search(output)
+    if audio_match:
+        info["audio_codec"] = audio_match.group(1)
+        details = audio_match.group(2)
+        rate_match = _SAMPLE_RATE_RE.search(details)
+        if rate_match:
+            info["sample_rate"] = int(rate_match.group(1))
+        channels_match = _CHANNELS_RE.search(details)
+        if channels_match:
+            layout = channels_match.group(1)
+            if layout == "mono":
+                info["channels"] = 1
+            elif layout == "stereo":
+                info["channels"] = 2
+            elif channels_match.group(2):
+                info["channels"] = int(channels_match.group(2))
+
+    return MediaInfo(path=path, **info)
@@ -0,0 +1,146 @@
+"""Santé et disponibilité du processus (sondes de l'autoscaler et du load balancer)."""
+
+import asyncio
+import os
+import shutil
+
+from app.core import database
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.models.health_model import HealthStatus, ReadinessStatus, RenderLoad
+from app.models.job_model import JobStatus
+from app.repositories.job_repository import JobRepository
+from app.services import metrics
+from app.services.video_service import VideoService
+
+logger = get_logger(__name__)
+
+
+class HealthService:
+    """Charge et disponibilité du processus, calculées à partir de compteurs en mémoire.
+
+    ``readiness`` ne lit que l'état du processus (moteur de rendu, retard de la
+    boucle d'événements, disque de l'espace de travail): elle peut être
+    interrogée souvent. ``health`` y ajoute la file des jobs et un ping MongoDB.
+    """
+
+    def __init__(self, video_service: VideoService, job_repository: JobRepository | None = None) -> None:
+        """Initialise le service de santé.
+
+        Args:
+            video_service: Service vidéo du processus (moteur de rendu, espace de travail)
+            job_repository: Stockage des jobs (None = file non rapportée)
+        """
+        self.video_service = video_service
+        self.job_repository = job_repository
+        self.loop_lag = 0.0
+        self._monitor: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        """Démarrer la mesure du retard de la boucle d'événements."""
+        if self._monitor is None:
+            self._monitor = asyncio.create_task(self._measure_loop_lag())
+
+    async def stop(self) -> None:
+        """Arrêter la mesure du retard de la boucle d'événements."""
+        if self._monitor is not None:
+            self._monitor.cancel()
+            try:
+                await self._monitor
+            except asyncio.CancelledError:
+                pass
+            self._monitor = None
+
+    async def _measure_loop_lag(self) -> None:
+        """Mesurer en continu le retard d'un réveil programmé de la boucle."""
+        loop = asyncio.get_running_loop()
+        interval = settings.health_loop_lag_interval
+        while True:
+            start = loop.time()
+            await asyncio.sleep(interval)
+            self.loop_lag = max(0.0, loop.time() - start - interval)
+
+    def _scratch_free_bytes(self) -> int | None:
+        """Espace libre du disque de l'espace de travail (créé au premier rendu)."""
+        path = self.video_service.renderer.scratch.base_dir
+        while not os.path.isdir(path) and os.path.dirname(path) != path:
+            path = os.path.dirname(path)
+        try:
+            return shutil.disk_usage(path).free
+        except OSError:
+            return None
+
+    def render_load(self) -> RenderLoad:
+        """Charge du moteur de rendu du processus."""
+        engine = self.video_service.engine
+        return RenderLoad(
+            in_flight=engine.in_flight,
+            running=engine.running,
+            queue_depth=engine.queued,
+            max_in_flight=engine.max_in_flight,
+            workers=engine.max_workers,
+            utilization=round(engine.running / engine.max_workers, 3),
+            threads_allocated=engine.cpu_budget.allocated,
+            threads_total=engine.cpu_budget.total_threads,
+            realtime_factor=metrics.recent_realtime_factor(),
+        )
+
+    def readiness(self) -> ReadinessStatus:
+        """Le processus peut-il accepter un nouveau rendu ?
+
+        Returns:
+            ReadinessStatus: ready, ou not_ready avec les raisons
+        """
+        reasons = []
+        if not self.video_service.ready:
+            reasons.append("warming_up")
+        if self.video_service.engine.saturated:
+            reasons.append("saturated")
+        if self.loop_lag > settings.ready_max_loop_lag:
+            reasons.append("event_loop_lag")
+        free = self._scratch_free_bytes()
+        if free is not None and free < settings.ready_min_scratch_free_bytes:
+            reasons.append("scratch_disk_low")
+        return ReadinessStatus(status="not_ready" if reasons else "ready", reasons=reasons)
+
+    async def _mongo_ping(self) -> tuple[float | None, str | None]:
+        """Latence d'un ping MongoDB en millisecondes, ou l'erreur rencontrée."""
+        try:
+            latency = await asyncio.wait_for(database.ping(), settings.health_mongo_timeout)
+        except asyncio.TimeoutError:
+            return None, f"timeout after {settings.health_mongo_timeout}s"
+        except Exception as e:
+            return None, str(e)
+        return round(latency * 1000, 3), None
+
+    async def _jobs_queued(self) -> int | None:
+        if self.job_repository is None:
+            return None
+        try:
+            return await asyncio.wait_for(
+                self.job_repository.count(JobStatus.QUEUED), settings.health_mongo_timeout
+            )
+        except Exception as e:
+            logger.warning("Unable to count queued jobs: %s", e)
+            return None
+
+    async def health(self) -> HealthStatus:
+        """État de santé et charge du processus.
+
+        Returns:
+            HealthStatus: healthy, ou degraded si MongoDB ne répond pas
+        """
+        mongo_ping_ms, mongo_error = await self._mongo_ping()
+        degraded = mongo_error is not None and settings.job_store != "memory"
+        return HealthStatus(
+            status="degraded" if degraded else "healthy",
+            version=settings.app_version,
+            environment=settings.environment,
+            ready=self.readiness().status == "ready",
+            render=self.render_load(),
+            jobs_queued=await self._jobs_queued(),
+            event_loop_lag_ms=round(self.loop_lag * 1000, 3),
+            scratch_free_bytes=self._scratch_free_bytes(),
+            mongo_ping_ms=mongo_ping_ms,
+            mongo_error=mongo_error,
+        )
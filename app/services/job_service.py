@@ -0,0 +1,138 @@
+"""Service pour les jobs de rendu asynchrones."""
+
+import asyncio
+import time
+from typing import AsyncIterator
+
+from pydantic import BaseModel
+
+from app.core.exceptions import NotFoundException
+from app.models.job_model import JobStatus, RenderJob, RenderJobStatus, RenderProgress
+from app.models.video_model import VideoGenerationRequest
+from app.repositories.job_repository import JobRepository
+from app.services.progress import FINAL_STAGES
+from app.services.video_service import VideoService
+
+# Intervalle (secondes) sans événement au-delà duquel un événement keepalive est émis
+KEEPALIVE_INTERVAL = 15.0
+
+
+class JobService:
+    """Service pour créer et suivre les jobs de rendu."""
+
+    def __init__(self, repository: JobRepository, video_service: VideoService) -> None:
+        """Initialise le service des jobs.
+
+        Args:
+            repository: Stockage des jobs
+            video_service: Service vidéo (validation des requêtes)
+        """
+        self.repository = repository
+        self.video_service = video_service
+
+    async def submit(self, request: VideoGenerationRequest) -> RenderJob:
+        """Mettre une requête de génération en file.
+
+        Args:
+            request: Requête de génération vidéo
+
+        Returns:
+            RenderJob: Job créé (statut queued)
+
+        Le job garde la requête d'origine: ses URLs sont de nouveau résolues
+        par le worker qui la rend (sur un autre hôte, ou après éviction du
+        cache des entrées, les fichiers locaux de ce processus ne sont pas
+        disponibles); la résolution est alors servie par le cache des entrées
+        ou revalidée sans nouveau téléchargement.
+
+        Raises:
+            ValueError: Si les fichiers d'entrée n'existent pas
+        """
+        await self.video_service.validate_request(request)
+        return await self.repository.create(RenderJob(request=request))
+
+    async def get(self, job_id: str) -> RenderJob:
+        """Récupérer un job.
+
+        Args:
+            job_id: Identifiant du job
+
+        Returns:
+            RenderJob: Job trouvé
+
+        Raises:
+            NotFoundException: Si le job n'existe pas
+        """
+        job = await self.repository.get(job_id)
+        if job is None:
+            raise NotFoundException(f"Render job not found: {job_id}")
+        return job
+
+    async def events(
+        self,
+        job: RenderJob,
+        poll_interval: float = 1.0,
+    ) -> AsyncIterator[tuple[str, BaseModel | None]]:
+        """Suivre un job jusqu'à sa fin.
+
+        La progression détaillée (images encodées, cadence, ETA) est reçue en
+        direct quand le job est rendu par ce processus; sinon, la progression
+        enregistrée dans le job par son worker est relue toutes les
+        ``poll_interval`` secondes, comme son statut.
+
+        Args:
+            job: Job à suivre
+            poll_interval: Intervalle (secondes) entre deux lectures du job
+
+        Yields:
+            (nom, données): ``progress`` (RenderProgress) pendant le rendu,
+            ``keepalive`` (None) en l'absence d'événement, puis ``done`` ou
+            ``failed`` (RenderJobStatus) en dernier
+        """
+        broker = self.video_service.engine.progress
+        queue = broker.subscribe(job.id)
+        try:
+            sent: tuple[JobStatus, float] | None = None
+            last_sent = time.monotonic()
+            next_poll = last_sent
+            while True:
+                if job.status in (JobStatus.DONE, JobStatus.FAILED):
+                    yield job.status.value, RenderJobStatus.from_job(job)
+                    return
+
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=max(next_poll - time.monotonic(), 0.0))
+                except asyncio.TimeoutError:
+                    event = None
+
+                if event is not None and event["stage"] in FINAL_STAGES:
+                    # Rendu terminé: le statut final est relu sans attendre
+                    next_poll = time.monotonic()
+                elif event is not None:
+                    progress = RenderProgress(job_id=job.id, status=JobStatus.RUNNING, **event)
+                    sent = (progress.status, progress.progress)
+                    last_sent = time.monotonic()
+                    yield "progress", progress
+                    continue
+
+                if time.monotonic() >= next_poll:
+                    next_poll = time.monotonic() + poll_interval
+                    current = await self.repository.get(job.id)
+                    if current is None:
+                        return
+                    job = current
+                    # La progression enregistrée est en retard sur les événements directs
+                    if job.status in (JobStatus.QUEUED, JobStatus.RUNNING) and (
+                        sent is None or job.status != sent[0] or job.progress > sent[1]
+                    ):
+                        progress = RenderProgress.from_job(job)
+                        sent = (progress.status, progress.progress)
+                        last_sent = time.monotonic()
+                        yield "progress", progress
+                        continue
+
+                if time.monotonic() - last_sent >= KEEPALIVE_INTERVAL:
+                    last_sent = time.monotonic()
+                    yield "keepalive", None
+        finally:
+            broker.unsubscribe(job.id, queue)
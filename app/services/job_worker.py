@@ -0,0 +1,185 @@
+"""Worker qui exécute les jobs de rendu en attente."""
+
+import asyncio
+import contextlib
+import os
+import socket
+from uuid import uuid4
+
+from app.core.logging import get_logger, log_context
+from app.models.job_model import JobStatus, RenderJob, utcnow
+from app.repositories.job_repository import JobRepository
+from app.services.render_engine import watch_render_start
+from app.services.video_service import VideoService
+
+logger = get_logger(__name__)
+
+
+class JobWorker:
+    """Boucle(s) de consommation de la file des jobs de rendu.
+
+    Chaque boucle prend atomiquement le plus ancien job en attente, le rend via
+    le moteur de rendu du ``VideoService`` (en attendant une place libre plutôt
+    qu'en refusant) puis enregistre le résultat ou l'erreur. Pendant le rendu,
+    la progression publiée par le moteur est enregistrée dans le job à
+    intervalle régulier (lisible par les API qui ne reçoivent pas ses événements),
+    ainsi qu'un signe de vie: les jobs d'un worker arrêté brutalement cessent d'en
+    recevoir et sont remis en file après ``stale_after`` secondes.
+    """
+
+    def __init__(
+        self,
+        repository: JobRepository,
+        video_service: VideoService,
+        concurrency: int = 1,
+        poll_interval: float = 1.0,
+        worker_id: str | None = None,
+        progress_interval: float = 2.0,
+        heartbeat_interval: float = 10.0,
+        stale_after: float | None = 60.0,
+    ) -> None:
+        """Initialise le worker.
+
+        Args:
+            repository: Stockage des jobs
+            video_service: Service de rendu vidéo
+            concurrency: Nombre de jobs traités en parallèle
+            poll_interval: Attente (secondes) entre deux lectures d'une file vide
+            worker_id: Identifiant du worker (défaut: hôte, pid et suffixe aléatoire)
+            progress_interval: Intervalle (secondes) entre deux enregistrements de la progression
+            heartbeat_interval: Intervalle (secondes) entre deux signes de vie d'un job en cours
+            stale_after: Délai (secondes) sans signe de vie au-delà duquel un job running est repris
+                (None = jamais)
+        """
+        self.repository = repository
+        self.video_service = video_service
+        self.concurrency = max(1, concurrency)
+        self.poll_interval = poll_interval
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid4().hex[:6]}"
+        self.progress_interval = progress_interval
+        self.heartbeat_interval = heartbeat_interval
+        self.stale_after = stale_after
+        self._tasks: list[asyncio.Task[None]] = []
+
+    async def start(self) -> None:
+        """Démarrer les boucles de consommation."""
+        self._tasks = [
+            asyncio.create_task(self._run(), name=f"job-worker-{index}")
+            for index in range(self.concurrency)
+        ]
+        logger.info("Job worker %s started (%d slots)", self.worker_id, self.concurrency)
+
+    async def stop(self) -> None:
+        """Arrêter les boucles.
+
+        Les jobs dont le rendu attend encore un processus sont remis en file;
+        ceux dont le rendu a commencé sont attendus et leur issue enregistrée
+        (remis en file, ils seraient rendus une seconde fois par un autre worker).
+        """
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        logger.info("Job worker %s stopped", self.worker_id)
+
+    async def _run(self) -> None:
+        """Boucle de consommation d'un slot."""
+        while True:
+            try:
+                job = await self.repository.claim_next(self.worker_id, self.stale_after)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Failed to claim a render job")
+                job = None
+
+            if job is None:
+                await asyncio.sleep(self.poll_interval)
+                continue
+
+            # Les logs du job (ici et dans le processus de rendu) portent son identifiant
+            with log_context(job_id=job.id):
+                try:
+                    await self.process(job)
+                except asyncio.CancelledError:
+                    raise
+                except Exception:
+                    # Statut non enregistré: le job sera repris quand son signe de vie expirera
+                    logger.exception("Failed to record the outcome of render job %s", job.id)
+
+    async def _heartbeat(self, job_id: str) -> None:
+        """Enregistrer périodiquement un signe de vie du job en cours."""
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                await self.repository.update(job_id, heartbeat_at=utcnow())
+            except Exception as e:
+                logger.warning("Unable to save heartbeat of render job %s: %s", job_id, e)
+
+    async def _save_progress(self, job_id: str) -> None:
+        """Enregistrer périodiquement la dernière progression publiée par le rendu d'un job."""
+        broker = self.video_service.engine.progress
+        saved = 0.0
+        while True:
+            await asyncio.sleep(self.progress_interval)
+            event = broker.latest(job_id)
+            if event is None or event["progress"] <= saved:
+                continue
+            try:
+                await self.repository.update(job_id, progress=round(event["progress"], 4))
+                saved = event["progress"]
+            except Exception as e:
+                logger.warning("Unable to save progress of render job %s: %s", job_id, e)
+
+    async def process(self, job: RenderJob) -> None:
+        """Rendre un job déjà passé à l'état running.
+
+        Args:
+            job: Job pris par ce worker
+        """
+        logger.info("Rendering job %s", job.id)
+        background = [
+            asyncio.create_task(self._save_progress(job.id)),
+            asyncio.create_task(self._heartbeat(job.id)),
+        ]
+        with watch_render_start() as started:
+            render = asyncio.create_task(
+                self.video_service.render_video(job.request, wait=True, progress_id=job.id)
+            )
+        stopping = False
+        try:
+            try:
+                try:
+                    result = await asyncio.shield(render)
+                except asyncio.CancelledError:
+                    if not started.is_set():
+                        render.cancel()
+                        raise
+                    # Arrêt du worker pendant le rendu: il va jusqu'au bout dans son processus
+                    stopping = True
+                    logger.info("Waiting for render job %s to finish before stopping", job.id)
+                    result = await render
+            finally:
+                # Plus aucune écriture de progression ni de signe de vie après le statut final
+                for task in background:
+                    task.cancel()
+                    with contextlib.suppress(asyncio.CancelledError):
+                        await task
+        except asyncio.CancelledError:
+            # Arrêt du worker: le job sera repris par un autre worker
+            await self.repository.update(
+                job.id, status=JobStatus.QUEUED, worker_id=None, started_at=None, heartbeat_at=None,
+            )
+            raise
+        except Exception as e:
+            logger.warning("Render job %s failed: %s", job.id, e)
+            await self.repository.update(
+                job.id, status=JobStatus.FAILED, error=str(e), finished_at=utcnow(),
+            )
+        else:
+            await self.repository.update(
+                job.id, status=JobStatus.DONE, progress=1.0, result=result, finished_at=utcnow(),
+            )
+            logger.info("Render job %s done", job.id)
+        if stopping:
+            raise asyncio.CancelledError()
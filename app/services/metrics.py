@@ -0,0 +1,129 @@
+"""Métriques Prometheus du rendu vidéo.
+
+Les rendus s'exécutent dans les processus du moteur de rendu: leurs durées par
+étape reviennent dans la réponse du rendu et sont observées ici, dans le
+processus qui sert la requête ou le job (un registre par processus API ou worker).
+"""
+
+import os
+from collections import deque
+from typing import TYPE_CHECKING
+
+from prometheus_client import Counter, Gauge, Histogram
+
+from app.models.job_model import JobStatus
+from app.models.video_model import VideoGenerationResponse
+
+if TYPE_CHECKING:
+    from app.repositories.job_repository import JobRepository
+    from app.services.render_engine import RenderEngine
+
+RENDERS = Counter(
+    "video_renders_total",
+    "Render requests by render path and outcome (success, error, rejected)",
+    ["render_path", "outcome"],
+)
+RENDER_DURATION = Histogram(
+    "video_render_duration_seconds",
+    "Render request duration, queue wait included",
+    ["render_path"],
+    buckets=(0.5, 1, 2, 5, 10, 20, 30, 60, 120, 300, 600, 1200),
+)
+STAGE_DURATION = Histogram(
+    "video_render_stage_seconds",
+    "Render stage duration (audio_load, template_prepare, music_mix, encode, thumbnail, cleanup...)",
+    ["stage"],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300),
+)
+REALTIME_FACTOR = Histogram(
+    "video_encode_realtime_factor",
+    "Seconds of video produced per second of encoding",
+    ["render_path"],
+    buckets=(0.25, 0.5, 1, 2, 4, 8, 16, 32, 64, 128),
+)
+BYTES_WRITTEN = Counter(
+    "video_render_output_bytes_total",
+    "Bytes of rendered video written",
+    ["render_path"],
+)
+RENDERS_IN_FLIGHT = Gauge(
+    "video_renders_in_flight",
+    "Renders accepted by the render engine (running or waiting for a render process)",
+)
+RENDERS_RUNNING = Gauge("video_renders_running", "Renders running in a render process")
+RENDER_QUEUE_DEPTH = Gauge(
+    "video_render_queue_depth",
+    "Accepted renders waiting for a free render process",
+)
+JOBS_QUEUED = Gauge("video_render_jobs_queued", "Render jobs waiting in the job queue")
+
+# Chemins de rendu qui réutilisent une vidéo existante au lieu d'en écrire une
+_REUSED_PATHS = ("cache", "coalesced")
+
+# Facteurs temps réel des derniers rendus encodés (santé du processus, sans passer par Prometheus)
+_RECENT_REALTIME_FACTORS: deque[float] = deque(maxlen=20)
+
+
+def bind_engine(engine: "RenderEngine") -> None:
+    """Lire les jauges du moteur de rendu sur ``engine`` à chaque collecte.
+
+    Args:
+        engine: Moteur de rendu du processus
+    """
+    RENDERS_IN_FLIGHT.set_function(lambda: engine.in_flight)
+    RENDERS_RUNNING.set_function(lambda: engine.running)
+    RENDER_QUEUE_DEPTH.set_function(lambda: engine.queued)
+
+
+async def refresh_job_queue(repository: "JobRepository") -> None:
+    """Mettre à jour la jauge des jobs en attente depuis le stockage des jobs.
+
+    Args:
+        repository: Stockage des jobs
+    """
+    JOBS_QUEUED.set(await repository.count(JobStatus.QUEUED))
+
+
+def observe_render(response: VideoGenerationResponse, duration: float, output_path: str) -> None:
+    """Enregistrer un rendu réussi.
+
+    Args:
+        response: Réponse du rendu (chemin de rendu, durée de la vidéo, durées par étape)
+        duration: Durée de la requête en secondes
+        output_path: Vidéo produite (comptée dans les octets écrits sauf si réutilisée)
+    """
+    render_path = response.render_path or "unknown"
+    RENDERS.labels(render_path, "success").inc()
+    RENDER_DURATION.labels(render_path).observe(duration)
+    for stage, seconds in response.timings.items():
+        STAGE_DURATION.labels(stage).observe(seconds)
+
+    encode = response.timings.get("encode")
+    if encode and response.duration:
+        REALTIME_FACTOR.labels(render_path).observe(response.duration / encode)
+        if render_path not in _REUSED_PATHS:
+            _RECENT_REALTIME_FACTORS.append(response.duration / encode)
+    if render_path not in _REUSED_PATHS:
+        try:
+            BYTES_WRITTEN.labels(render_path).inc(os.path.getsize(output_path))
+        except OSError:
+            pass
+
+
+def recent_realtime_factor() -> float | None:
+    """Facteur temps réel moyen des derniers rendus encodés (None avant le premier)."""
+    if not _RECENT_REALTIME_FACTORS:
+        return None
+    return sum(_RECENT_REALTIME_FACTORS) / len(_RECENT_REALTIME_FACTORS)
+
+
+def observe_render_failure(duration: float, rejected: bool = False) -> None:
+    """Enregistrer une requête de rendu en échec ou refusée.
+
+    Args:
+        duration: Durée de la requête en secondes
+        rejected: Requête refusée par le moteur de rendu saturé
+    """
+    RENDERS.labels("unknown", "rejected" if rejected else "error").inc()
+    RENDER_DURATION.labels("unknown").observe(duration)
+
@@ -0,0 +1,198 @@
+"""Cache des métadonnées des médias d'entrée (durée, flux, taille, cadence)."""
+
+import asyncio
+import dataclasses
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.models.probe_model import MediaProbe, MediaProbeCacheState, MediaProbeInvalidation
+from app.repositories.media_probe_repository import MediaProbeRepository
+from app.services.ffmpeg_tools import MediaInfo, probe_media
+
+logger = get_logger(__name__)
+
+
+def _to_info(probe: MediaProbe, path: str) -> MediaInfo:
+    """Métadonnées d'une entrée, rapportées au chemin demandé."""
+    fields = probe.model_dump(include={field.name for field in dataclasses.fields(MediaInfo)})
+    return MediaInfo(**{**fields, "path": path})
+
+
+class MediaProbeCache:
+    """Métadonnées des templates et musiques, lues par ffmpeg une fois par version de fichier.
+
+    Les entrées sont indexées par (chemin absolu, taille, mtime): un fichier
+    modifié est relu sans invalidation explicite. La mémoire garde les
+    ``max_entries`` entrées les plus récemment utilisées; le repository
+    optionnel (MongoDB) partage les entrées entre processus et redémarrages,
+    et n'est consulté que par ``aprobe``. Chaque processus (API, rendus) a son
+    propre cache en mémoire.
+    """
+
+    def __init__(self, max_entries: int = 4096, repository: MediaProbeRepository | None = None) -> None:
+        """Initialise le cache.
+
+        Args:
+            max_entries: Nombre maximum d'entrées en mémoire
+            repository: Stockage persistant des entrées (None = mémoire seulement)
+        """
+        self.max_entries = max_entries
+        self.repository = repository
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, MediaProbe]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, repository: MediaProbeRepository | None = None) -> "MediaProbeCache":
+        """Construire le cache à partir de la configuration."""
+        return cls(settings.probe_cache_max_entries, repository)
+
+    @staticmethod
+    def _identity(path: str) -> tuple[str, str, int, int]:
+        """Clé, chemin absolu, taille et mtime de la version courante du fichier.
+
+        Raises:
+            OSError: Si le fichier n'existe pas
+        """
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        key = hashlib.sha1(f"{path}|{stat.st_size}|{stat.st_mtime_ns}".encode()).hexdigest()
+        return key, path, stat.st_size, stat.st_mtime_ns
+
+    def _lookup(self, key: str) -> MediaProbe | None:
+        with self._lock:
+            probe = self._entries.get(key)
+            if probe is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            return probe
+
+    def _remember(self, probe: MediaProbe) -> None:
+        with self._lock:
+            self._entries[probe.key] = probe
+            self._entries.move_to_end(probe.key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _probe(self, key: str, path: str, size: int, mtime_ns: int) -> MediaProbe:
+        with self._lock:
+            self.misses += 1
+        logger.debug("Probing %s", path)
+        probe = MediaProbe(key=key, size=size, mtime_ns=mtime_ns, **dataclasses.asdict(probe_media(path)))
+        self._remember(probe)
+        return probe
+
+    def probe(self, path: str) -> MediaInfo:
+        """Métadonnées d'un fichier, depuis la mémoire ou lues par ffmpeg.
+
+        Args:
+            path: Chemin du fichier
+
+        Returns:
+            MediaInfo: Métadonnées du fichier
+
+        Raises:
+            OSError: Si le fichier n'existe pas
+            FFmpegError: Si le fichier ne peut pas être lu
+        """
+        key, abspath, size, mtime_ns = self._identity(path)
+        probe = self._lookup(key) or self._probe(key, abspath, size, mtime_ns)
+        return _to_info(probe, path)
+
+    async def inspect(self, path: str) -> MediaProbe:
+        """Entrée du cache pour la version courante d'un fichier.
+
+        L'entrée est cherchée en mémoire, puis dans le repository; à défaut le
+        fichier est lu par ffmpeg (hors de la boucle d'événements) et l'entrée
+        enregistrée dans les deux.
+
+        Args:
+            path: Chemin du fichier
+
+        Returns:
+            MediaProbe: Entrée du cache
+
+        Raises:
+            OSError: Si le fichier n'existe pas
+            FFmpegError: Si le fichier ne peut pas être lu
+        """
+        key, abspath, size, mtime_ns = await asyncio.to_thread(self._identity, path)
+        probe = self._lookup(key)
+        if probe is None and self.repository is not None:
+            try:
+                probe = await self.repository.get(key)
+            except Exception as e:
+                logger.warning("Unable to read media probe %s: %s", abspath, e)
+            if probe is not None:
+                with self._lock:
+                    self.hits += 1
+                self._remember(probe)
+        if probe is None:
+            probe = await asyncio.to_thread(self._probe, key, abspath, size, mtime_ns)
+            if self.repository is not None:
+                try:
+                    await self.repository.put(probe)
+                except Exception as e:
+                    # Le cache persistant n'est qu'une optimisation
+                    logger.warning("Unable to persist media probe %s: %s", abspath, e)
+        return probe
+
+    async def aprobe(self, path: str) -> MediaInfo:
+        """Métadonnées d'un fichier, depuis la mémoire, le repository ou lues par ffmpeg (voir ``inspect``).
+
+        Args:
+            path: Chemin du fichier
+
+        Returns:
+            MediaInfo: Métadonnées du fichier
+
+        Raises:
+            OSError: Si le fichier n'existe pas
+            FFmpegError: Si le fichier ne peut pas être lu
+        """
+        return _to_info(await self.inspect(path), path)
+
+    def state(self) -> MediaProbeCacheState:
+        """Entrées en mémoire et statistiques du cache."""
+        with self._lock:
+            return MediaProbeCacheState(
+                entries=list(self._entries.values()),
+                max_entries=self.max_entries,
+                hits=self.hits,
+                misses=self.misses,
+                persistent=self.repository is not None,
+            )
+
+    async def invalidate(self, path: str | None = None) -> MediaProbeInvalidation:
+        """Retirer les entrées d'un fichier (toutes versions), ou tout le cache.
+
+        Args:
+            path: Fichier à invalider (None = toutes les entrées)
+
+        Returns:
+            MediaProbeInvalidation: Entrées retirées de la mémoire et du repository
+        """
+        abspath = os.path.abspath(path) if path is not None else None
+        with self._lock:
+            keys = [key for key, probe in self._entries.items() if abspath is None or probe.path == abspath]
+            for key in keys:
+                del self._entries[key]
+        persisted = await self.repository.delete(abspath) if self.repository is not None else None
+        logger.info("Invalidated media probes of %s (%d in memory)", abspath or "all files", len(keys))
+        return MediaProbeInvalidation(path=abspath, removed=len(keys), removed_persisted=persisted)
+
+
+@lru_cache
+def get_probe_cache() -> MediaProbeCache:
+    """Get the in-memory media probe cache of this process (render processes, scripts).
+
+    Returns:
+        MediaProbeCache: Memory-only cache configured from settings
+    """
+    return MediaProbeCache.from_settings()
@@ -0,0 +1,259 @@
+"""Progression des rendus: publiée par les processus de rendu, diffusée aux abonnés de l'API."""
+
+import asyncio
+import math
+import multiprocessing.queues
+import threading
+import time
+from typing import Any
+
+from proglog import ProgressBarLogger
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Événements en attente par abonné au-delà desquels les plus anciens sont abandonnés
+SUBSCRIBER_BUFFER = 64
+
+# Étapes publiées à la fin d'un rendu
+FINAL_STAGES = ("done", "failed")
+
+# Canal vers le processus de l'API, installé à la création de chaque processus de rendu
+_channel: multiprocessing.queues.Queue | None = None
+
+
+def install_channel(channel: multiprocessing.queues.Queue) -> None:
+    """Installer le canal de progression dans un processus de rendu (initialiseur du pool)."""
+    global _channel
+    _channel = channel
+
+
+class ProgressReporter:
+    """Publie la progression d'un rendu (étape, images encodées, cadence, ETA).
+
+    La progression vaut 0 avant l'encodage, la fraction des images encodées
+    pendant l'encodage, puis 1. Les mises à jour d'images sont limitées à une
+    par ``min_interval`` secondes; les changements d'étape sont toujours publiés.
+    Sans ``render_id`` ou hors d'un processus de rendu, rien n'est publié.
+
+    Les mises à jour d'images sont aussi journalisées, échantillonnées à une
+    par ``log_interval`` secondes.
+    """
+
+    def __init__(self, render_id: str | None, min_interval: float = 0.5, log_interval: float = 0.0) -> None:
+        """Initialise le rapporteur.
+
+        Args:
+            render_id: Identifiant sous lequel la progression est publiée (identifiant du job)
+            min_interval: Intervalle minimal en secondes entre deux mises à jour d'images
+            log_interval: Intervalle en secondes entre deux progressions journalisées (0 = jamais)
+        """
+        self.render_id = render_id
+        self.min_interval = min_interval
+        self.log_interval = log_interval
+        self.stage_name: str | None = None
+        self.progress = 0.0
+        self.total_frames: int | None = None
+        self.fps: int | None = None
+        self._start = time.monotonic()
+        self._stage_start = self._start
+        self._last_publish = 0.0
+        self._last_log = self._start
+
+    @property
+    def enabled(self) -> bool:
+        return self.render_id is not None and _channel is not None
+
+    def _publish(self, event: dict[str, Any]) -> None:
+        if not self.enabled:
+            return
+        self._last_publish = time.monotonic()
+        event.update(
+            stage=self.stage_name,
+            progress=round(self.progress, 4),
+            elapsed=round(self._last_publish - self._start, 3),
+        )
+        try:
+            _channel.put_nowait((self.render_id, event))  # type: ignore[union-attr]
+        except Exception as e:
+            # La progression ne doit jamais faire échouer un rendu
+            logger.debug("Progress event dropped: %s", e)
+
+    def stage(self, name: str, total_frames: int | None = None, fps: int | None = None) -> None:
+        """Passer à une nouvelle étape du rendu.
+
+        Args:
+            name: Nom de l'étape (template, music_mix, encode, thumbnail, done, failed...)
+            total_frames: Nombre d'images à encoder (étape d'encodage)
+            fps: Cadence de la sortie (calcul du facteur temps réel)
+        """
+        if name == "done" or (self.stage_name == "encode" and name != "encode"):
+            self.progress = 1.0
+        self.stage_name = name
+        self.total_frames = total_frames
+        self.fps = fps
+        self._stage_start = time.monotonic()
+        self._publish({"frame": 0 if total_frames else None, "total_frames": total_frames})
+
+    def frames(self, frame: int, force: bool = False) -> None:
+        """Signaler le nombre d'images encodées depuis le début de l'étape.
+
+        Args:
+            frame: Images encodées
+            force: Publier même si la précédente mise à jour est trop récente
+        """
+        now = time.monotonic()
+        publish = self.enabled and (force or now - self._last_publish >= self.min_interval)
+        log = self.log_interval > 0 and frame > 0 and now - self._last_log >= self.log_interval
+        if not (publish or log):
+            return
+        elapsed = now - self._stage_start
+        rate = frame / elapsed if elapsed > 0 and frame > 0 else None
+        if self.total_frames:
+            frame = min(frame, self.total_frames)
+            self.progress = frame / self.total_frames
+        eta = (self.total_frames - frame) / rate if rate and self.total_frames else None
+        event = {
+            "frame": frame,
+            "total_frames": self.total_frames,
+            "fps": round(rate, 2) if rate else None,
+            "speed": round(rate / self.fps, 3) if rate and self.fps else None,
+            "eta": round(eta, 2) if eta is not None else None,
+        }
+        if log:
+            self._last_log = now
+            logger.info(
+                "Render progress: %d/%s frames, %s fps, eta %ss",
+                frame, self.total_frames, event["fps"], event["eta"],
+                extra={"stage": self.stage_name, **event},
+            )
+        if publish:
+            self._publish(event)
+
+    def ffmpeg_progress(self, block: dict[str, str]) -> None:
+        """Fonction de progression pour ``run_ffmpeg_with_progress``."""
+        try:
+            frame = int(block.get("frame", "0"))
+        except ValueError:
+            return
+        self.frames(frame, force=block.get("progress") == "end")
+
+    def finish(self, failed: bool = False) -> None:
+        """Publier la fin du rendu (réussi ou en échec)."""
+        self.stage("failed" if failed else "done")
+
+    def moviepy_logger(self) -> "RenderProgressLogger":
+        """Logger proglog à passer à ``write_videofile``."""
+        return RenderProgressLogger(self)
+
+
+class RenderProgressLogger(ProgressBarLogger):
+    """Logger proglog de MoviePy relayant l'avancement de l'écriture des images.
+
+    MoviePy itère les images sur la barre ``t`` (une entrée par image) et
+    l'audio sur la barre ``chunk``, ignorée ici.
+    """
+
+    def __init__(self, reporter: ProgressReporter) -> None:
+        super().__init__(ignored_bars={"chunk"})
+        self.reporter = reporter
+
+    def bars_callback(self, bar: str, attr: str, value: Any, old_value: Any = None) -> None:
+        if bar == "t" and attr == "index":
+            total = self.bars[bar].get("total")
+            self.reporter.frames(int(value), force=value == total)
+
+
+def total_frames(duration: float, fps: int) -> int:
+    """Nombre d'images d'une sortie de ``duration`` secondes à ``fps`` images/s."""
+    return max(1, math.ceil(duration * fps))
+
+
+class ProgressBroker:
+    """Diffuse dans la boucle d'événements les progressions reçues des processus de rendu.
+
+    Un thread lit le canal du moteur de rendu; chaque événement est conservé
+    comme dernier état du rendu et copié dans la file de chacun de ses abonnés.
+    """
+
+    def __init__(self, channel: multiprocessing.queues.Queue) -> None:
+        """Initialise le diffuseur.
+
+        Args:
+            channel: Canal alimenté par les processus de rendu
+        """
+        self.channel = channel
+        self._subscribers: dict[str, set[asyncio.Queue[dict[str, Any]]]] = {}
+        self._latest: dict[str, dict[str, Any]] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """Démarrer la lecture du canal (depuis la boucle d'événements)."""
+        if self._thread is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._thread = threading.Thread(target=self._drain, name="progress-broker", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Arrêter la lecture du canal."""
+        if self._thread is None:
+            return
+        self.channel.put(None)
+        self._thread.join(timeout=5)
+        self._thread = None
+
+    def _drain(self) -> None:
+        assert self._loop is not None
+        while True:
+            message = self.channel.get()
+            if message is None:
+                return
+            render_id, event = message
+            try:
+                self._loop.call_soon_threadsafe(self._dispatch, render_id, event)
+            except RuntimeError:
+                # Boucle d'événements fermée
+                return
+
+    def _dispatch(self, render_id: str, event: dict[str, Any]) -> None:
+        if event["stage"] in FINAL_STAGES:
+            self._latest.pop(render_id, None)
+        else:
+            self._latest[render_id] = event
+        for queue in self._subscribers.get(render_id, ()):
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(event)
+
+    def latest(self, render_id: str) -> dict[str, Any] | None:
+        """Dernière progression reçue d'un rendu en cours."""
+        return self._latest.get(render_id)
+
+    def subscribe(self, render_id: str) -> asyncio.Queue[dict[str, Any]]:
+        """S'abonner à la progression d'un rendu.
+
+        Args:
+            render_id: Identifiant du rendu
+
+        Returns:
+            File recevant les événements (précédée du dernier état connu)
+        """
+        queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue(maxsize=SUBSCRIBER_BUFFER)
+        latest = self._latest.get(render_id)
+        if latest is not None:
+            queue.put_nowait(latest)
+        self._subscribers.setdefault(render_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, render_id: str, queue: asyncio.Queue[dict[str, Any]]) -> None:
+        """Se désabonner de la progression d'un rendu."""
+        subscribers = self._subscribers.get(render_id)
+        if subscribers is not None:
+            subscribers.discard(queue)
+            if not subscribers:
+                del self._subscribers[render_id]
+
+
@@ -0,0 +1,273 @@
+"""Moteur de rendu: exécute les rendus MoviePy dans un pool de processus borné."""
+
+import asyncio
+import contextvars
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache, partial
+from typing import Any, Callable, Iterator, TypeVar
+
+from app.core.config import settings
+from app.core.exceptions import TooManyRequestsException
+from app.core.logging import current_log_context, get_logger, log_context, setup_logging
+from app.services.cpu_budget import CpuBudget, available_cpus
+from app.services.progress import ProgressBroker, install_channel
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+# Événement signalé quand un rendu soumis dans ce contexte est confié à un processus
+_render_started: contextvars.ContextVar[asyncio.Event | None] = contextvars.ContextVar("render_started", default=None)
+
+
+@contextmanager
+def watch_render_start() -> Iterator[asyncio.Event]:
+    """Savoir si un rendu lancé dans le bloc a été confié à un processus du pool.
+
+    Les tâches créées dans le bloc héritent de l'événement: il est signalé
+    dès que l'une d'elles soumet un rendu au pool (un rendu commencé ne peut
+    plus être annulé, seulement attendu).
+
+    Yields:
+        Événement signalé au démarrage du rendu
+    """
+    started = asyncio.Event()
+    token = _render_started.set(started)
+    try:
+        yield started
+    finally:
+        _render_started.reset(token)
+
+
+def _init_render_process(progress_channel: Any) -> None:
+    """Initialiser un processus de rendu: logging et canal de progression."""
+    # Avec spawn ou forkserver, la configuration du logging n'est pas héritée
+    if not logging.getLogger().handlers:
+        setup_logging()
+    install_channel(progress_channel)
+
+
+def _run_in_log_context(context: dict[str, str], fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Exécuter une fonction de rendu avec le contexte de log de la requête ou du job."""
+    with log_context(**context):
+        return fn(*args, **kwargs)
+
+
+def _preload_render_process() -> int:
+    """Importer les modules de rendu (MoviePy, NumPy...) dans un processus du pool."""
+    import app.services.video_service  # noqa: F401
+
+    return os.getpid()
+
+
+class RenderEngine:
+    """Pool de processus de rendu avec limite de rendus en cours.
+
+    Les rendus (décodage, composition, encodage) sont CPU-bound et bloquants:
+    ils sont exécutés dans des processus séparés pour que la boucle d'événements
+    reste disponible. Au-delà de ``max_in_flight`` rendus acceptés (en cours ou
+    en attente d'un processus libre), les nouvelles demandes sont refusées.
+
+    Un rendu n'est confié au pool que lorsqu'un processus est libre: il reçoit
+    alors sa part du budget CPU (threads ffmpeg), rendue à la fin du rendu. Un
+    appelant qui abandonne (annulation) n'interrompt pas un rendu commencé: sa
+    place et sa part du budget restent prises jusqu'à la fin du processus.
+
+    Les processus publient la progression des rendus sur un canal commun, lu
+    par le diffuseur ``progress`` dans le processus du moteur.
+    """
+
+    def __init__(
+        self,
+        max_workers: int | None = None,
+        max_in_flight: int | None = None,
+        start_method: str = "spawn",
+        max_tasks_per_child: int | None = None,
+        cpu_budget: CpuBudget | None = None,
+    ) -> None:
+        """Initialise le moteur de rendu.
+
+        Args:
+            max_workers: Nombre de processus de rendu (défaut: CPUs disponibles, quota cgroup compris)
+            max_in_flight: Nombre maximum de rendus acceptés (défaut: 2 x max_workers)
+            start_method: Méthode de démarrage des processus (spawn, forkserver, fork)
+            max_tasks_per_child: Recycler un processus après N rendus (None = jamais)
+            cpu_budget: Budget de threads réparti entre les rendus (défaut: un thread par CPU disponible)
+        """
+        self.max_workers = max_workers or max(1, int(available_cpus()))
+        self.max_in_flight = max_in_flight or 2 * self.max_workers
+        self.start_method = start_method
+        self.max_tasks_per_child = max_tasks_per_child
+        self.cpu_budget = cpu_budget or CpuBudget(int(available_cpus()))
+        self.progress_channel = multiprocessing.get_context(start_method).Queue()
+        self.progress = ProgressBroker(self.progress_channel)
+        self._executor: ProcessPoolExecutor | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+        self._workers_semaphore: asyncio.Semaphore | None = None
+        self._in_flight = 0
+
+    @property
+    def in_flight(self) -> int:
+        """Nombre de rendus acceptés (en cours ou en attente d'un processus)."""
+        return self._in_flight
+
+    @property
+    def running(self) -> int:
+        """Nombre de rendus en cours d'exécution dans un processus."""
+        return self.cpu_budget.active
+
+    @property
+    def queued(self) -> int:
+        """Nombre de rendus acceptés en attente d'un processus libre."""
+        return max(self._in_flight - self.running, 0)
+
+    @property
+    def saturated(self) -> bool:
+        """Indique si le moteur refuse actuellement les nouveaux rendus."""
+        return self._in_flight >= self.max_in_flight
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Créer le pool de processus à la première utilisation."""
+        if self._executor is None:
+            kwargs: dict[str, Any] = {
+                "max_workers": self.max_workers,
+                "mp_context": multiprocessing.get_context(self.start_method),
+                "initializer": _init_render_process,
+                "initargs": (self.progress_channel,),
+            }
+            if self.max_tasks_per_child and self.start_method != "fork":
+                kwargs["max_tasks_per_child"] = self.max_tasks_per_child
+            self._executor = ProcessPoolExecutor(**kwargs)
+            logger.info(
+                "Render pool started: %d workers, %d max in flight (%s)",
+                self.max_workers, self.max_in_flight, self.start_method,
+            )
+        return self._executor
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Créer le sémaphore dans la boucle d'événements courante."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        return self._semaphore
+
+    def _get_workers_semaphore(self) -> asyncio.Semaphore:
+        """Créer le sémaphore des processus libres dans la boucle d'événements courante."""
+        if self._workers_semaphore is None:
+            self._workers_semaphore = asyncio.Semaphore(self.max_workers)
+        return self._workers_semaphore
+
+    async def start(self) -> None:
+        """Démarrer les processus de rendu avant le premier rendu.
+
+        Chaque processus est lancé et importe les modules de rendu: le premier
+        rendu n'attend ni le démarrage d'un processus ni ces imports.
+        """
+        self.progress.start()
+        executor = self._get_executor()
+        loop = asyncio.get_running_loop()
+        pids = await asyncio.gather(
+            *(loop.run_in_executor(executor, _preload_render_process) for _ in range(self.max_workers))
+        )
+        logger.info("Render pool warmed: %d processes ready", len(set(pids)))
+
+    async def submit(self, fn: Callable[..., T], *args: Any, wait: bool = False) -> T:
+        """Exécuter une fonction de rendu dans le pool de processus.
+
+        La fonction reçoit en argument nommé ``threads`` le nombre de threads
+        qui lui est attribué dans le budget CPU.
+
+        Args:
+            fn: Fonction (picklable) à exécuter dans un processus de rendu
+            *args: Arguments (picklables) de la fonction
+            wait: Attendre qu'une place se libère au lieu de refuser la demande
+
+        Returns:
+            Le résultat de la fonction
+
+        Raises:
+            TooManyRequestsException: Si le moteur est saturé et ``wait`` est False
+        """
+        semaphore = self._get_semaphore()
+        if not wait and semaphore.locked():
+            raise TooManyRequestsException(
+                "Render engine is saturated, retry later",
+                details={"in_flight": self._in_flight, "max_in_flight": self.max_in_flight},
+            )
+
+        self.progress.start()
+        workers_semaphore = self._get_workers_semaphore()
+        await semaphore.acquire()
+        self._in_flight += 1
+        try:
+            # Laisser les demandes arrivées dans le même tour de boucle être comptées
+            await asyncio.sleep(0)
+            await workers_semaphore.acquire()
+        except BaseException:
+            self._in_flight -= 1
+            semaphore.release()
+            raise
+        # Les rendus acceptés en attente d'un processus vont partager le budget
+        lease, threads = self.cpu_budget.acquire(min(self._in_flight, self.max_workers))
+
+        def finish(done: "asyncio.Future[T] | None") -> None:
+            # Places et budget rendus quand le processus a fini, pas quand l'appelant abandonne
+            if done is not None and not done.cancelled():
+                done.exception()
+            self.cpu_budget.release(lease)
+            workers_semaphore.release()
+            self._in_flight -= 1
+            semaphore.release()
+
+        try:
+            job = self._get_executor().submit(
+                partial(_run_in_log_context, current_log_context(), fn, *args, threads=threads)
+            )
+        except BaseException:
+            finish(None)
+            raise
+        started = _render_started.get()
+        if started is not None:
+            started.set()
+        future = asyncio.wrap_future(job)
+        future.add_done_callback(finish)
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            # Un rendu déjà commencé continue dans son processus jusqu'à sa fin
+            job.cancel()
+            raise
+
+    async def shutdown(self, wait: bool = True) -> None:
+        """Arrêter le pool de processus.
+
+        L'attente des rendus en cours se fait dans un thread: la boucle
+        d'événements reste disponible pendant l'arrêt.
+
+        Args:
+            wait: Attendre la fin des rendus en cours
+        """
+        if self._executor is not None:
+            executor, self._executor = self._executor, None
+            await asyncio.to_thread(executor.shutdown, wait=wait, cancel_futures=not wait)
+            logger.info("Render pool stopped")
+        self.progress.stop()
+
+
+@lru_cache
+def get_render_engine() -> RenderEngine:
+    """Get the shared render engine (one pool per API process).
+
+    Returns:
+        RenderEngine: Render engine configured from settings
+    """
+    return RenderEngine(
+        max_workers=settings.render_workers,
+        max_in_flight=settings.render_max_in_flight,
+        start_method=settings.render_start_method,
+        max_tasks_per_child=settings.render_max_tasks_per_child,
+        cpu_budget=CpuBudget.from_settings(),
+    )
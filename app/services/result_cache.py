@@ -0,0 +1,276 @@
+"""Cache des rendus terminés: déduplication par clé de contenu et regroupement des doublons en cours."""
+
+import asyncio
+import contextlib
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable
+from uuid import uuid4
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.models.render_result_model import RenderResult
+from app.models.video_model import VideoGenerationRequest, VideoGenerationResponse
+from app.repositories.render_result_repository import RenderResultRepository
+from app.services.disk_cache import DiskCache
+from app.services.encode_profiles import resolve_profile
+
+logger = get_logger(__name__)
+
+# À incrémenter quand le rendu change pour des entrées identiques (invalide tout le cache)
+RESULT_CACHE_VERSION = 2
+
+_DIGEST_CACHE_SIZE = 1024
+_digests: "OrderedDict[tuple[str, int, int], str]" = OrderedDict()
+# Les clés sont calculées dans des threads (asyncio.to_thread)
+_digests_lock = threading.Lock()
+
+
+def file_digest(path: str) -> str:
+    """Empreinte BLAKE2b du contenu d'un fichier.
+
+    Les empreintes sont mémorisées par (chemin, taille, mtime): un template ou
+    une musique réutilisés ne sont relus que s'ils ont changé.
+
+    Args:
+        path: Chemin du fichier
+
+    Returns:
+        Empreinte hexadécimale
+    """
+    stat = os.stat(path)
+    identity = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+    with _digests_lock:
+        digest = _digests.get(identity)
+        if digest is not None:
+            _digests.move_to_end(identity)
+            return digest
+    # Lecture hors du verrou: deux threads peuvent hacher le même fichier, sans conséquence
+    with open(path, "rb") as file:
+        digest = hashlib.file_digest(file, "blake2b").hexdigest()
+    with _digests_lock:
+        _digests[identity] = digest
+        _digests.move_to_end(identity)
+        if len(_digests) > _DIGEST_CACHE_SIZE:
+            _digests.popitem(last=False)
+    return digest
+
+
+def copy_file(source: str, dest: str) -> None:
+    """Copier ``source`` en ``dest``.
+
+    Jamais de lien physique: les rendus réécrivent leur fichier de sortie sur
+    place, une vidéo du stockage partageant son inode serait modifiée avec lui.
+    La copie est écrite sous un nom temporaire puis renommée: ``dest`` n'est
+    jamais visible partiellement écrit.
+    """
+    if os.path.exists(dest) and os.path.samefile(source, dest):
+        return
+    tmp_path = f"{dest}.{uuid4().hex[:8]}.tmp"
+    try:
+        shutil.copyfile(source, tmp_path)
+        os.replace(tmp_path, dest)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
+        raise
+
+
+def render_key(request: VideoGenerationRequest) -> str:
+    """Calculer la clé de contenu d'une requête de génération.
+
+    La clé couvre le contenu des fichiers d'entrée et les paramètres qui
+    changent la vidéo produite, dont l'encodeur et la copie de flux (une copie
+    de flux garde le débit du template, pas celui du profil), mais pas les
+    chemins de sortie.
+
+    Args:
+        request: Requête de génération vidéo
+
+    Returns:
+        Clé hexadécimale
+
+    Raises:
+        OSError: Si un fichier d'entrée ne peut pas être lu
+    """
+    # Une musique introuvable est ignorée par le rendu: elle l'est aussi ici
+    music = request.background_music if request.background_music and os.path.exists(request.background_music) else None
+    identity = {
+        "version": RESULT_CACHE_VERSION,
+        "audio": file_digest(request.audio_path),
+        "template": file_digest(request.video_template_path) if request.video_template_path else None,
+        "music": file_digest(music) if music else None,
+        "music_volume": request.background_music_volume if music else None,
+        "ducking": request.ducking.model_dump() if music and request.ducking else None,
+        "images": [file_digest(path) for path in request.slideshow_images],
+        "profile": resolve_profile(request.resolution, request.profile).name,
+        "fps": request.fps,
+        "encoder": request.encoder or settings.render_encoder,
+        "stream_copy": settings.stream_copy_enabled and bool(request.stream_copy),
+    }
+    return hashlib.sha256(json.dumps(identity, sort_keys=True).encode()).hexdigest()
+
+
+class RenderResultStore(DiskCache):
+    """Vidéos des rendus terminés, copiées depuis leur sortie d'origine."""
+
+    suffix = ".mp4"
+
+    @classmethod
+    def from_settings(cls) -> "RenderResultStore":
+        """Construire le stockage à partir de la configuration."""
+        return cls(
+            cache_dir=os.path.join(settings.resources_dir, "render-cache"),
+            max_bytes=settings.result_cache_max_bytes,
+        )
+
+    def add(self, key: str, source: str) -> str:
+        """Ajouter une vidéo au stockage.
+
+        Args:
+            key: Clé de contenu du rendu
+            source: Vidéo produite par le rendu
+
+        Returns:
+            Chemin de la vidéo dans le stockage
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path, _ = self._paths(key)
+        copy_file(source, path)
+        self.evict(keep=path)
+        return path
+
+
+class ResultCache:
+    """Sert les requêtes déjà rendues et regroupe les requêtes identiques en cours.
+
+    L'index (MongoDB ou mémoire) associe la clé de contenu d'une requête à la
+    vidéo stockée et à la réponse du rendu; un doublon est servi par une copie
+    de cette vidéo à son chemin de sortie au lieu d'un nouveau rendu. Les doublons
+    reçus pendant le rendu d'une même clé attendent ce rendu dans ce processus.
+    """
+
+    def __init__(self, repository: RenderResultRepository, store: RenderResultStore) -> None:
+        """Initialise le cache.
+
+        Args:
+            repository: Index des rendus terminés
+            store: Stockage des vidéos rendues
+        """
+        self.repository = repository
+        self.store = store
+        self._in_flight: dict[str, asyncio.Task[RenderResult]] = {}
+
+    @classmethod
+    def from_settings(cls, repository: RenderResultRepository) -> "ResultCache":
+        """Construire le cache à partir de la configuration."""
+        return cls(repository, RenderResultStore.from_settings())
+
+    async def lookup(self, key: str) -> RenderResult | None:
+        """Retourner le rendu indexé sous cette clé si sa vidéo existe encore.
+
+        Args:
+            key: Clé de contenu
+
+        Returns:
+            Rendu en cache, ou None
+        """
+        result = await self.repository.get(key)
+        if result is None:
+            return None
+        try:
+            self.store.touch(result.path)
+        except OSError:
+            # Vidéo évincée du stockage: l'entrée d'index est périmée
+            await self.repository.delete(key)
+            return None
+        return result
+
+    async def _serve(
+        self,
+        result: RenderResult,
+        request: VideoGenerationRequest,
+        source: str = "cache",
+    ) -> VideoGenerationResponse:
+        """Placer la vidéo d'un rendu existant au chemin de sortie de la requête."""
+        start = time.time()
+        if os.path.abspath(result.path) != os.path.abspath(request.video_absolute_path):
+            os.makedirs(os.path.dirname(request.video_absolute_path), exist_ok=True)
+            await asyncio.to_thread(copy_file, result.path, request.video_absolute_path)
+        logger.info("Render %s served from %s to %s", result.key[:12], source, request.video_absolute_path)
+        return result.response.model_copy(update={
+            "video_url": request.video_relative_path,
+            "message": f"Video served from {source} at {request.video_absolute_path}",
+            "render_path": source,
+            "threads": None,
+            "timings": {source: time.time() - start},
+        })
+
+    async def _save(self, key: str, request: VideoGenerationRequest, response: VideoGenerationResponse) -> RenderResult:
+        """Indexer un rendu terminé, sa vidéo étant copiée dans le stockage.
+
+        Un échec d'indexation ne fait pas échouer le rendu: la vidéo produite
+        sert alors seulement aux doublons en attente.
+        """
+        output_path = request.video_absolute_path
+        try:
+            path = await asyncio.to_thread(self.store.add, key, output_path)
+            return await self.repository.put(
+                RenderResult(key=key, path=path, size=os.path.getsize(path), response=response)
+            )
+        except Exception as e:
+            logger.warning("Unable to cache render %s: %s", key[:12], e)
+            return RenderResult(key=key, path=output_path, size=os.path.getsize(output_path), response=response)
+
+    async def _render_and_save(
+        self,
+        key: str,
+        request: VideoGenerationRequest,
+        render: Callable[[], Awaitable[VideoGenerationResponse]],
+    ) -> RenderResult:
+        return await self._save(key, request, await render())
+
+    def _forget(self, key: str, task: "asyncio.Task[RenderResult]") -> None:
+        self._in_flight.pop(key, None)
+        # Évite l'avertissement "exception never retrieved" si plus personne n'attend le rendu
+        if not task.cancelled():
+            task.exception()
+
+    async def get_or_render(
+        self,
+        request: VideoGenerationRequest,
+        render: Callable[[], Awaitable[VideoGenerationResponse]],
+    ) -> VideoGenerationResponse:
+        """Servir la requête depuis le cache, depuis un rendu identique en cours, ou la rendre.
+
+        Le rendu est une tâche partagée par toutes les requêtes de même clé:
+        l'annulation de la première requête ne prive pas les suivantes du résultat.
+
+        Args:
+            request: Requête de génération vidéo
+            render: Fonction lançant le rendu de la requête
+
+        Returns:
+            VideoGenerationResponse: Réponse du rendu (ou du rendu réutilisé)
+        """
+        key = await asyncio.to_thread(render_key, request)
+
+        cached = await self.lookup(key)
+        if cached is not None:
+            return await self._serve(cached, request)
+
+        task = self._in_flight.get(key)
+        if task is not None:
+            result = await asyncio.shield(task)
+            return await self._serve(result, request, source="coalesced")
+
+        task = asyncio.create_task(self._render_and_save(key, request, render))
+        self._in_flight[key] = task
+        task.add_done_callback(lambda done: self._forget(key, done))
+        result = await asyncio.shield(task)
+        return result.response
@@ -0,0 +1,148 @@
+"""Espace de travail temporaire des rendus (fichiers intermédiaires)."""
+
+import fcntl
+import os
+import shutil
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+from app.core.config import settings
+from app.core.exceptions import InsufficientStorageException
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Fichier d'un répertoire de travail indiquant l'espace réservé par son rendu
+RESERVATION_FILE = ".reserved"
+
+
+class ScratchSpace:
+    """Répertoires de travail par rendu, sous un répertoire de base avec quota.
+
+    Chaque rendu reçoit son propre répertoire (aucun nom de fichier partagé
+    entre rendus concurrents), supprimé à la fin du rendu, qu'il réussisse
+    ou échoue. L'espace estimé d'un rendu est réservé dès l'allocation (fichier
+    ``.reserved`` du répertoire, lu par tous les processus): un répertoire
+    compte pour le maximum de sa réservation et de sa taille réelle.
+    """
+
+    def __init__(self, base_dir: str, quota_bytes: int) -> None:
+        """Initialise l'espace de travail.
+
+        Args:
+            base_dir: Répertoire de base des répertoires de travail
+            quota_bytes: Taille totale maximale des fichiers de travail
+        """
+        self.base_dir = base_dir
+        self.quota_bytes = quota_bytes
+
+    @classmethod
+    def from_settings(cls) -> "ScratchSpace":
+        """Construire l'espace de travail à partir de la configuration.
+
+        ``scratch_dir`` prime; sinon ``/dev/shm`` (tmpfs) si ``scratch_use_tmpfs``
+        est activé et disponible, sinon le répertoire temporaire du système.
+        """
+        base_dir = settings.scratch_dir
+        if not base_dir:
+            root = "/dev/shm" if settings.scratch_use_tmpfs and os.path.isdir("/dev/shm") else tempfile.gettempdir()
+            base_dir = os.path.join(root, "video-service")
+        return cls(base_dir=base_dir, quota_bytes=settings.scratch_quota_bytes)
+
+    @staticmethod
+    def _size(path: str) -> int:
+        """Taille totale (octets) des fichiers d'un répertoire."""
+        total = 0
+        for root, _, files in os.walk(path):
+            for name in files:
+                try:
+                    total += os.lstat(os.path.join(root, name)).st_size
+                except OSError:
+                    continue
+        return total
+
+    @staticmethod
+    def _reserved(path: str) -> int:
+        """Espace réservé par le rendu d'un répertoire de travail (0 si aucun)."""
+        try:
+            with open(os.path.join(path, RESERVATION_FILE)) as reservation_file:
+                return int(reservation_file.read() or 0)
+        except (OSError, ValueError):
+            return 0
+
+    def usage(self) -> int:
+        """Espace occupé ou réservé (octets) dans l'espace de travail."""
+        total = 0
+        try:
+            entries = list(os.scandir(self.base_dir))
+        except OSError:
+            return 0
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    total += max(self._size(entry.path), self._reserved(entry.path))
+                else:
+                    total += entry.stat(follow_symlinks=False).st_size
+            except OSError:
+                continue
+        return total
+
+    @contextmanager
+    def allocate(self, prefix: str = "render", reserve_bytes: int = 0) -> Iterator[str]:
+        """Allouer un répertoire de travail, supprimé à la sortie du bloc.
+
+        Args:
+            prefix: Préfixe du nom du répertoire
+            reserve_bytes: Espace estimé nécessaire au rendu, réservé jusqu'à la sortie du bloc
+
+        Yields:
+            Chemin du répertoire de travail
+
+        Raises:
+            InsufficientStorageException: Si le quota serait dépassé
+        """
+        os.makedirs(self.base_dir, exist_ok=True)
+        # Vérification et réservation atomiques entre les processus de rendu
+        with open(os.path.join(self.base_dir, ".lock"), "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            usage = self.usage()
+            if usage + reserve_bytes > self.quota_bytes:
+                raise InsufficientStorageException(
+                    "Scratch space quota exceeded",
+                    details={"usage_bytes": usage, "reserve_bytes": reserve_bytes, "quota_bytes": self.quota_bytes},
+                )
+            path = tempfile.mkdtemp(prefix=f"{prefix}-", dir=self.base_dir)
+            if reserve_bytes:
+                with open(os.path.join(path, RESERVATION_FILE), "w") as reservation_file:
+                    reservation_file.write(str(reserve_bytes))
+        try:
+            yield path
+        finally:
+            shutil.rmtree(path, ignore_errors=True)
+
+    def cleanup_stale(self, max_age: float) -> int:
+        """Supprimer les répertoires laissés par des processus de rendu interrompus.
+
+        Args:
+            max_age: Âge minimal (secondes) d'un répertoire pour être supprimé
+
+        Returns:
+            Nombre de répertoires supprimés
+        """
+        if not os.path.isdir(self.base_dir):
+            return 0
+        removed = 0
+        now = time.time()
+        for name in os.listdir(self.base_dir):
+            path = os.path.join(self.base_dir, name)
+            try:
+                if os.path.isdir(path) and now - os.stat(path).st_mtime > max_age:
+                    shutil.rmtree(path, ignore_errors=True)
+                    removed += 1
+            except OSError:
+                continue
+        if removed:
+            logger.info("Removed %d stale scratch directories from %s", removed, self.base_dir)
+        return removed
@@ -0,0 +1,179 @@
+"""Encodage segmenté: segments vidéo alignés sur le GOP encodés en parallèle, puis assemblés sans ré-encodage."""
+
+import contextvars
+import dataclasses
+import math
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable
+
+from app.core.logging import get_logger
+from app.services.ffmpeg_encoder import AudioSource, EncodeSettings, FFmpegEncoder
+from app.services.ffmpeg_tools import FFmpegError, MediaInfo, count_video_frames, run_ffmpeg_with_progress
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class Segment:
+    """Plage d'images de la sortie encodée par un processus ffmpeg."""
+
+    index: int
+    start_frame: int
+    n_frames: int
+
+
+def plan_segments(n_frames: int, segment_frames: int, gop: int) -> list[Segment]:
+    """Découper la sortie en segments dont les bornes tombent sur le GOP.
+
+    Chaque segment commence par une image clé; avec une longueur multiple du
+    GOP, les images clés de la vidéo assemblée gardent la cadence d'un encodage
+    d'une traite. Seul le dernier segment peut être plus court.
+
+    Args:
+        n_frames: Nombre d'images de la sortie
+        segment_frames: Longueur visée d'un segment, en images
+        gop: Taille du GOP en images
+
+    Returns:
+        Segments consécutifs couvrant toutes les images
+    """
+    gop = max(1, gop)
+    length = max(gop, math.ceil(segment_frames / gop) * gop)
+    return [
+        Segment(index, start, min(length, n_frames - start))
+        for index, start in enumerate(range(0, n_frames, length))
+    ]
+
+
+class SegmentedEncoder:
+    """Encode la vidéo d'un template bouclé par segments parallèles, puis multiplexe l'audio une fois.
+
+    Chaque segment est un processus ffmpeg qui boucle le template, saute au
+    début du segment (au plus une longueur de template décodée pour rien) et
+    encode exactement ses images sans audio. Les segments sont ensuite
+    concaténés par copie de flux avec le mixage audio, puis le nombre
+    d'images de la sortie est vérifié.
+    """
+
+    def __init__(self, encoder: FFmpegEncoder) -> None:
+        """Initialise l'encodeur segmenté.
+
+        Args:
+            encoder: Encodeur ffmpeg (multiplexage final de l'audio)
+        """
+        self.encoder = encoder
+
+    @staticmethod
+    def _segment_command(
+        template: MediaInfo,
+        segment: Segment,
+        loop_frames: int,
+        encode: EncodeSettings,
+        output_path: str,
+    ) -> list[str]:
+        video_filters = [f"fps={encode.fps}"]
+        # Position du segment dans le template bouclé (même image qu'un encodage d'une traite)
+        offset = segment.start_frame % loop_frames
+        if offset:
+            # trim perd la cadence du flux: elle est redonnée pour des segments de durée exacte
+            video_filters.append(f"trim=start_frame={offset},setpts=PTS-STARTPTS,fps={encode.fps}")
+        scale = encode.scale_filter()
+        if scale:
+            video_filters.append(scale)
+        video_filters.append("format=yuv420p")
+        return [
+            "-stream_loop", "-1", "-i", template.path,
+            "-an", "-vf", ",".join(video_filters),
+            "-frames:v", str(segment.n_frames),
+            "-c:v", encode.video_codec, "-preset", encode.preset, *encode.rate_control_args(),
+            *(["-threads", str(encode.threads)] if encode.threads else []),
+            *encode.extra_args,
+            "-f", "mp4", output_path,
+        ]
+
+    def encode(
+        self,
+        template: MediaInfo,
+        audio_sources: list[AudioSource],
+        output_path: str,
+        n_frames: int,
+        encode: EncodeSettings,
+        work_dir: str,
+        segment_frames: int,
+        workers: int,
+        on_frames: Callable[[int], None] | None = None,
+    ) -> int:
+        """Encoder la vidéo par segments et y multiplexer l'audio.
+
+        Args:
+            template: Template bouclé (normalisé ou original)
+            audio_sources: Sources audio à mixer
+            output_path: Fichier de sortie
+            n_frames: Nombre d'images de la sortie
+            encode: Paramètres d'encodage (GOP, threads de chaque segment)
+            work_dir: Répertoire de travail des segments
+            segment_frames: Longueur visée d'un segment, en images
+            workers: Segments encodés simultanément
+            on_frames: Fonction appelée avec le nombre total d'images encodées
+
+        Returns:
+            Nombre de segments encodés
+
+        Raises:
+            FFmpegError: Si un encodage échoue ou si la sortie n'a pas le nombre d'images attendu
+        """
+        segments = plan_segments(n_frames, segment_frames, encode.gop or encode.fps)
+        loop_frames = max(1, round(template.duration * encode.fps))
+        segment_paths = [os.path.join(work_dir, f"segment-{segment.index:05d}.mp4") for segment in segments]
+        # Le GOP est fixé même sans -g dans le profil: les bornes de segments restent sur sa cadence
+        segment_encode = encode if encode.gop else dataclasses.replace(encode, gop=encode.fps)
+
+        done = [0] * len(segments)
+        lock = threading.Lock()
+
+        def report(index: int, block: dict[str, str]) -> None:
+            try:
+                frame = int(block.get("frame", "0"))
+            except ValueError:
+                return
+            with lock:
+                done[index] = frame
+                total = sum(done)
+            if on_frames is not None:
+                on_frames(total)
+
+        def encode_segment(segment: Segment) -> None:
+            run_ffmpeg_with_progress(
+                self._segment_command(template, segment, loop_frames, segment_encode, segment_paths[segment.index]),
+                lambda block: report(segment.index, block),
+            )
+
+        logger.debug(
+            "Segmented encode: %d frames in %d segments, %d workers x %s threads",
+            n_frames, len(segments), workers, encode.threads or "auto",
+        )
+        with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="segment") as pool:
+            # Tous les segments sont attendus avant de propager la première erreur; chacun garde
+            # le contexte de log du rendu
+            futures = [pool.submit(contextvars.copy_context().run, encode_segment, segment) for segment in segments]
+            errors = [future.exception() for future in futures]
+        for error in errors:
+            if error is not None:
+                raise error
+
+        concat_list = os.path.join(work_dir, "segments.txt")
+        with open(concat_list, "w") as concat_file:
+            for path in segment_paths:
+                entry = path.replace("'", "'\\''")
+                concat_file.write(f"file '{entry}'\n")
+        self.encoder.remux(
+            ["-f", "concat", "-safe", "0", "-i", concat_list], audio_sources, output_path, n_frames, encode
+        )
+
+        produced = count_video_frames(output_path)
+        if produced != n_frames:
+            raise FFmpegError(f"Segmented encode produced {produced} frames, expected {n_frames}")
+        return len(segments)
@@ -0,0 +1,261 @@
+"""Diaporama d'images avec effet Ken Burns (panoramique et zoom)."""
+
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Callable, Iterator
+
+import numpy as np
+from PIL import Image, ImageOps
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.services.disk_cache import DiskCache
+from app.services.ffmpeg_encoder import AudioSource, EncodeSettings, FFmpegEncoder
+
+logger = get_logger(__name__)
+
+# Zoom maximal du Ken Burns: les images sont pré-réduites à cette marge au-dessus
+# de la taille de sortie, le cadrage le plus serré étant alors au pixel près
+MAX_ZOOM = 1.12
+
+# Images calculées par lot avant d'être écrites vers ffmpeg
+BATCH_FRAMES = 8
+
+# Points de départ et d'arrivée du cadrage (coordonnées relatives), alternés par scène
+_PAN_PATHS = (
+    ((0.5, 0.5), (0.5, 0.5)),
+    ((0.35, 0.5), (0.65, 0.5)),
+    ((0.65, 0.4), (0.35, 0.6)),
+    ((0.5, 0.35), (0.5, 0.65)),
+)
+
+
+@dataclass(frozen=True)
+class CachedImage:
+    """Image décodée et pré-réduite, stockée en RGB24 brut."""
+
+    path: str
+    width: int
+    height: int
+
+    def open(self) -> Image.Image:
+        """Ouvrir l'image sans copie (projection en mémoire du fichier brut)."""
+        pixels = np.memmap(self.path, dtype=np.uint8, mode="r", shape=(self.height, self.width, 3))
+        return Image.frombuffer("RGB", (self.width, self.height), pixels, "raw", "RGB", 0, 1)
+
+
+class ImageCache(DiskCache):
+    """Images des scènes décodées et pré-réduites une fois, réutilisées par memmap.
+
+    Les entrées sont indexées par (chemin, taille, mtime, largeur, hauteur).
+    """
+
+    suffix = ".rgb"
+
+    @classmethod
+    def from_settings(cls) -> "ImageCache":
+        """Construire le cache à partir de la configuration."""
+        return cls(
+            cache_dir=os.path.join(settings.resources_dir, "image-cache"),
+            max_bytes=settings.image_cache_max_bytes,
+        )
+
+    def _key(self, source: str, width: int, height: int) -> str:
+        stat = os.stat(source)
+        identity = f"{os.path.abspath(source)}|{stat.st_size}|{stat.st_mtime_ns}|{width}|{height}"
+        return hashlib.sha1(identity.encode()).hexdigest()
+
+    def get_or_create(self, source: str, width: int, height: int) -> CachedImage:
+        """Retourner l'image recadrée à ``width`` x ``height``, en la décodant si besoin.
+
+        L'image est mise à l'échelle pour couvrir le cadre puis recadrée au centre.
+
+        Args:
+            source: Fichier image
+            width: Largeur de l'image en cache
+            height: Hauteur de l'image en cache
+
+        Returns:
+            CachedImage: Image en cache
+
+        Raises:
+            OSError: Si l'image ne peut pas être lue
+        """
+        data_path, meta_path = self._paths(self._key(source, width, height))
+        try:
+            with open(meta_path) as meta_file:
+                cached = CachedImage(**json.load(meta_file))
+            self.touch(data_path)
+            return cached
+        except (OSError, ValueError, TypeError):
+            pass
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_suffix = self._tmp_suffix()
+        with Image.open(source) as image:
+            rgb = ImageOps.exif_transpose(image).convert("RGB")
+            frame = ImageOps.fit(rgb, (width, height), Image.Resampling.LANCZOS)
+            with open(data_path + tmp_suffix, "wb") as data_file:
+                data_file.write(frame.tobytes())
+        cached = CachedImage(data_path, width, height)
+        with open(meta_path + tmp_suffix, "w") as meta_file:
+            json.dump(asdict(cached), meta_file)
+        os.replace(data_path + tmp_suffix, data_path)
+        os.replace(meta_path + tmp_suffix, meta_path)
+
+        self.evict(keep=data_path)
+        return cached
+
+
+def ken_burns_boxes(n_frames: int, src_width: int, src_height: int, scene_index: int) -> np.ndarray:
+    """Calculer le cadrage de chaque image d'une scène.
+
+    Le zoom (alternativement avant et arrière) et le déplacement du centre
+    suivent une courbe adoucie (smoothstep); le cadre reste dans l'image.
+
+    Args:
+        n_frames: Nombre d'images de la scène
+        src_width: Largeur de l'image pré-réduite
+        src_height: Hauteur de l'image pré-réduite
+        scene_index: Index de la scène (choix du zoom et du trajet)
+
+    Returns:
+        Cadres (gauche, haut, droite, bas) en pixels de l'image source, forme (n_frames, 4)
+    """
+    t = np.linspace(0.0, 1.0, n_frames) if n_frames != 1 else np.zeros(1)
+    eased = t * t * (3.0 - 2.0 * t)
+    zoom_start, zoom_end = (1.0, MAX_ZOOM) if scene_index % 2 == 0 else (MAX_ZOOM, 1.0)
+    zoom = zoom_start + (zoom_end - zoom_start) * eased
+
+    box_width = src_width / zoom
+    box_height = src_height / zoom
+    (x_start, y_start), (x_end, y_end) = _PAN_PATHS[scene_index % len(_PAN_PATHS)]
+    center_x = np.clip((x_start + (x_end - x_start) * eased) * src_width, box_width / 2, src_width - box_width / 2)
+    center_y = np.clip((y_start + (y_end - y_start) * eased) * src_height, box_height / 2, src_height - box_height / 2)
+    return np.stack([
+        center_x - box_width / 2,
+        center_y - box_height / 2,
+        center_x + box_width / 2,
+        center_y + box_height / 2,
+    ], axis=1)
+
+
+def scene_boundaries(n_frames: int, n_scenes: int) -> np.ndarray:
+    """Répartir les images de la vidéo entre les scènes, à parts égales.
+
+    Returns:
+        Indices de début de chaque scène suivis du nombre total d'images
+    """
+    return np.round(np.linspace(0, n_frames, n_scenes + 1)).astype(int)
+
+
+class SlideshowRenderer:
+    """Rend un diaporama Ken Burns et l'encode avec ffmpeg, image par image en RGB brut."""
+
+    def __init__(self, image_cache: ImageCache, encoder: FFmpegEncoder) -> None:
+        """Initialise le moteur de diaporama.
+
+        Args:
+            image_cache: Cache des images décodées et pré-réduites
+            encoder: Encodeur ffmpeg recevant les images brutes
+        """
+        self.image_cache = image_cache
+        self.encoder = encoder
+
+    def _frames(
+        self,
+        images: list[CachedImage],
+        n_frames: int,
+        width: int,
+        height: int,
+        workers: int,
+        on_frames: Callable[[int], None] | None = None,
+    ) -> Iterator[memoryview]:
+        """Produire les images de la vidéo par lots, dans un tampon préalloué.
+
+        Le redimensionnement Pillow (qui libère le GIL) est réparti sur
+        ``workers`` threads; chaque image est écrite directement à sa place dans
+        le lot, puis le lot est transmis à ffmpeg sans copie. Le tampon est
+        réutilisé une fois le lot entièrement écrit sur l'entrée de ffmpeg, et
+        ``on_frames`` reçoit alors le nombre d'images écrites. Les images
+        intermédiaires de Pillow sont elles aussi recyclées: l'allocateur de
+        Pillow garde pendant le rendu un bloc mémoire par thread au lieu de le
+        rendre au système à chaque image.
+        """
+        batch = np.empty((BATCH_FRAMES, height, width, 3), dtype=np.uint8)
+        boundaries = scene_boundaries(n_frames, len(images))
+        # Cadres de toutes les images, et scène de chaque image, calculés une fois
+        boxes = np.concatenate([
+            ken_burns_boxes(int(boundaries[i + 1] - boundaries[i]), image.width, image.height, i)
+            for i, image in enumerate(images)
+        ])
+        frame_scene = np.repeat(np.arange(len(images)), np.diff(boundaries))
+        sources = [image.open() for image in images]
+
+        def render_frame(slot: int, index: int) -> None:
+            box = tuple(float(value) for value in boxes[index])
+            frame = sources[frame_scene[index]].resize(
+                (width, height), Image.Resampling.BILINEAR, box=box, reducing_gap=None
+            )
+            batch[slot] = frame
+
+        blocks_max = Image.core.get_blocks_max()
+        Image.core.set_blocks_max(max(blocks_max, workers))
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                for start in range(0, n_frames, BATCH_FRAMES):
+                    count = min(BATCH_FRAMES, n_frames - start)
+                    list(pool.map(render_frame, range(count), range(start, start + count)))
+                    yield memoryview(batch[:count]).cast("B")
+                    if on_frames is not None:
+                        on_frames(start + count)
+        finally:
+            # Libère les blocs conservés pour ce rendu
+            Image.core.set_blocks_max(blocks_max)
+
+    def render(
+        self,
+        image_paths: list[str],
+        audio_sources: list[AudioSource],
+        output_path: str,
+        duration: float,
+        width: int,
+        height: int,
+        encode: EncodeSettings,
+        workers: int = 1,
+        on_frames: Callable[[int], None] | None = None,
+    ) -> None:
+        """Rendre le diaporama et l'encoder avec l'audio.
+
+        Args:
+            image_paths: Images des scènes, dans l'ordre
+            audio_sources: Sources audio à mixer
+            output_path: Fichier de sortie
+            duration: Durée de la vidéo en secondes (répartie entre les scènes)
+            width: Largeur de la vidéo
+            height: Hauteur de la vidéo
+            encode: Paramètres d'encodage
+            workers: Threads de calcul des images
+            on_frames: Fonction appelée avec le nombre d'images écrites, après chaque lot
+
+        Raises:
+            OSError: Si une image ne peut pas être lue
+            FFmpegError: Si l'encodage échoue
+        """
+        src_width = round(width * MAX_ZOOM)
+        src_height = round(height * MAX_ZOOM)
+        images = [self.image_cache.get_or_create(path, src_width, src_height) for path in image_paths]
+        n_frames = max(1, int(np.ceil(duration * encode.fps)))
+        logger.debug("Slideshow: %d scenes, %d frames at %dx%d", len(images), n_frames, width, height)
+        self.encoder.encode_frames(
+            self._frames(images, n_frames, width, height, workers, on_frames),
+            width,
+            height,
+            audio_sources,
+            output_path,
+            duration,
+            encode,
+        )
@@ -0,0 +1,130 @@
+"""Cache disque des templates vidéo normalisés (H.264, cadence fixe, GOP aligné)."""
+
+import hashlib
+import json
+import os
+from dataclasses import asdict, replace
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.services.disk_cache import DiskCache
+from app.services.encode_profiles import EncodeProfile
+from app.services.ffmpeg_encoder import EncodeSettings
+from app.services.ffmpeg_tools import MediaInfo, probe_media, run_ffmpeg
+
+logger = get_logger(__name__)
+
+
+class TemplateCache(DiskCache):
+    """Encodages normalisés des templates, réutilisés d'un rendu à l'autre.
+
+    Chaque entrée est un MP4 H.264 sans audio ni B-frames, à cadence constante,
+    avec un GOP fermé: le bouclage par copie de flux s'applique alors toujours
+    et chaque boucle démarre sur une image clé. L'encodage suit le profil de
+    sortie (hauteur, preset, CRF, plafond de débit, GOP; une image clé par
+    seconde si le profil n'en fixe pas): la copie de flux produit ainsi la même
+    vidéo qu'un ré-encodage avec ce profil. Les entrées sont indexées par
+    (template, taille, mtime, fps, paramètres du profil) et accompagnées de
+    leurs métadonnées pour éviter de re-sonder le fichier.
+    """
+
+    suffix = ".mp4"
+
+    @classmethod
+    def from_settings(cls) -> "TemplateCache":
+        """Construire le cache à partir de la configuration."""
+        return cls(
+            cache_dir=os.path.join(settings.resources_dir, "template-cache"),
+            max_bytes=settings.template_cache_max_bytes,
+        )
+
+    @staticmethod
+    def _encode_settings(fps: int, profile: EncodeProfile, threads: int | None) -> EncodeSettings:
+        encode = profile.settings(fps, profile.height, threads)
+        return replace(encode, gop=encode.gop or fps)
+
+    def _key(self, template_path: str, encode: EncodeSettings) -> str:
+        stat = os.stat(template_path)
+        identity = "|".join(str(part) for part in (
+            os.path.abspath(template_path), stat.st_size, stat.st_mtime_ns,
+            encode.fps, encode.height or "native",
+            encode.preset, encode.crf, encode.video_bitrate, encode.gop,
+        ))
+        return hashlib.sha1(identity.encode()).hexdigest()
+
+    def get(self, template_path: str, fps: int, profile: EncodeProfile) -> MediaInfo | None:
+        """Retourner l'encodage normalisé s'il est déjà en cache.
+
+        Args:
+            template_path: Chemin du template source
+            fps: Cadence de l'encodage
+            profile: Profil d'encodage des rendus qui utiliseront le template
+
+        Returns:
+            Métadonnées de l'encodage en cache, ou None
+        """
+        encode = self._encode_settings(fps, profile, None)
+        video_path, meta_path = self._paths(self._key(template_path, encode))
+        try:
+            with open(meta_path) as meta_file:
+                info = MediaInfo(**json.load(meta_file))
+            self.touch(video_path)
+        except (OSError, ValueError, TypeError):
+            return None
+        return info
+
+    def get_or_create(
+        self,
+        template_path: str,
+        fps: int,
+        profile: EncodeProfile,
+        threads: int | None = None,
+    ) -> MediaInfo:
+        """Retourner l'encodage normalisé du template, en le créant si besoin.
+
+        Args:
+            template_path: Chemin du template source
+            fps: Cadence de l'encodage
+            profile: Profil d'encodage des rendus qui utiliseront le template
+            threads: Threads de l'encodeur (None = choix de ffmpeg)
+
+        Returns:
+            Métadonnées de l'encodage en cache
+
+        Raises:
+            FFmpegError: Si l'encodage échoue
+        """
+        cached = self.get(template_path, fps, profile)
+        if cached is not None:
+            return cached
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        encode = self._encode_settings(fps, profile, threads)
+        video_path, meta_path = self._paths(self._key(template_path, encode))
+        # Écriture dans un fichier temporaire puis renommage atomique: plusieurs
+        # processus peuvent normaliser le même template sans se corrompre
+        tmp_suffix = self._tmp_suffix()
+        # Réduction seulement: un template plus petit que la hauteur demandée garde sa taille
+        filters = ",".join(f for f in (f"fps={fps}", encode.scale_filter()) if f)
+        logger.info("Normalizing template %s (fps=%s, profile=%s)", template_path, fps, profile.name)
+        run_ffmpeg([
+            "-i", template_path,
+            "-an", "-vf", filters,
+            "-c:v", encode.video_codec, "-preset", encode.preset,
+            *encode.rate_control_args(),
+            "-pix_fmt", "yuv420p",
+            "-keyint_min", str(encode.gop), "-sc_threshold", "0",
+            "-bf", "0", "-flags", "+cgop",
+            *(["-threads", str(threads)] if threads else []),
+            "-movflags", "+faststart",
+            "-f", "mp4", video_path + tmp_suffix,
+        ])
+        info = probe_media(video_path + tmp_suffix)
+        info = MediaInfo(**{**asdict(info), "path": video_path})
+        with open(meta_path + tmp_suffix, "w") as meta_file:
+            json.dump(asdict(info), meta_file)
+        os.replace(video_path + tmp_suffix, video_path)
+        os.replace(meta_path + tmp_suffix, meta_path)
+
+        self.evict(keep=video_path)
+        return info
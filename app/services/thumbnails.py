@@ -0,0 +1,150 @@
+"""Miniatures: décodage des seules images clés et choix de l'image la plus représentative."""
+
+import io
+import re
+import subprocess
+
+import numpy as np
+from PIL import Image
+
+from app.core.logging import get_logger
+from app.models.video_model import ThumbnailOptions
+from app.services.ffmpeg_tools import FFmpegError, get_ffmpeg_binary
+
+logger = get_logger(__name__)
+
+# Taille des images échantillonnées pour le score (niveaux de gris)
+SCORE_SIZE = 64
+
+_PTS_TIME_RE = re.compile(r"pts_time:\s*(-?[\d.]+)")
+
+_PIL_FORMATS = {"jpg": "JPEG", "webp": "WEBP"}
+
+
+def _run(command: list[str]) -> subprocess.CompletedProcess[bytes]:
+    result = subprocess.run([get_ffmpeg_binary(), "-hide_banner", "-nostdin", *command], capture_output=True)
+    if result.returncode != 0:
+        stderr = result.stderr.decode(errors="replace").strip()
+        raise FFmpegError(f"ffmpeg failed ({result.returncode}): {stderr[-2000:]}")
+    return result
+
+
+def score_frames(frames: np.ndarray) -> np.ndarray:
+    """Noter des images en niveaux de gris: contraste pondéré par l'exposition.
+
+    Le contraste (écart-type de la luminance) écarte les images unies (fondus,
+    écrans noirs); la pondération pénalise les images trop sombres ou trop claires.
+
+    Args:
+        frames: Images, forme (n, hauteur, largeur), valeurs 0-255
+
+    Returns:
+        Score de chaque image (plus haut = plus représentative)
+    """
+    pixels = frames.reshape(len(frames), -1).astype(np.float32)
+    mean = pixels.mean(axis=1)
+    exposure = np.clip(1.0 - np.abs(mean - 128.0) / 128.0, 0.0, 1.0)
+    return pixels.std(axis=1) * exposure
+
+
+def sample_keyframes(video_path: str, duration: float, max_samples: int) -> tuple[list[float], np.ndarray]:
+    """Décoder un échantillon espacé des images clés d'une vidéo, en petit format.
+
+    ``-skip_frame nokey`` fait ignorer au décodeur toutes les images qui ne
+    sont pas des images clés; le filtre ``select`` n'en garde qu'au plus
+    ``max_samples``, espacées régulièrement sur la durée.
+
+    Args:
+        video_path: Vidéo à échantillonner
+        duration: Durée de la vidéo en secondes
+        max_samples: Nombre maximum d'images échantillonnées
+
+    Returns:
+        (horodatages en secondes, images en niveaux de gris de forme (n, SCORE_SIZE, SCORE_SIZE))
+
+    Raises:
+        FFmpegError: Si le décodage échoue
+    """
+    interval = max(duration / max(max_samples, 1), 0.0)
+    filters = (
+        f"select='isnan(prev_selected_t)+gte(t-prev_selected_t\\,{interval:.3f})',"
+        f"scale={SCORE_SIZE}:{SCORE_SIZE},showinfo"
+    )
+    result = _run([
+        "-loglevel", "info",
+        "-skip_frame", "nokey", "-i", video_path,
+        "-an", "-vf", filters, "-fps_mode", "passthrough",
+        "-f", "rawvideo", "-pix_fmt", "gray", "pipe:1",
+    ])
+    timestamps = [float(match) for match in _PTS_TIME_RE.findall(result.stderr.decode(errors="replace"))]
+    frames = np.frombuffer(result.stdout, dtype=np.uint8)
+    n_frames = min(len(timestamps), len(frames) // (SCORE_SIZE * SCORE_SIZE))
+    frames = frames[:n_frames * SCORE_SIZE * SCORE_SIZE].reshape(n_frames, SCORE_SIZE, SCORE_SIZE)
+    return timestamps[:n_frames], frames
+
+
+class ThumbnailExtractor:
+    """Crée la miniature d'une vidéo sans la décoder entièrement."""
+
+    def __init__(self, max_samples: int = 24) -> None:
+        """Initialise l'extracteur.
+
+        Args:
+            max_samples: Nombre maximum d'images clés notées pour le choix automatique
+        """
+        self.max_samples = max_samples
+
+    def pick_timestamp(self, video_path: str, duration: float) -> float:
+        """Choisir l'image clé la plus représentative d'une vidéo.
+
+        Args:
+            video_path: Vidéo
+            duration: Durée de la vidéo en secondes
+
+        Returns:
+            Horodatage de l'image clé choisie (0 si aucune n'a pu être lue)
+        """
+        timestamps, frames = sample_keyframes(video_path, duration, self.max_samples)
+        if not timestamps:
+            return 0.0
+        return timestamps[int(np.argmax(score_frames(frames)))]
+
+    def create(self, video_path: str, dest: str, duration: float, options: ThumbnailOptions) -> float:
+        """Écrire la miniature d'une vidéo.
+
+        Sans horodatage demandé, l'image clé la mieux notée est choisie et
+        décodée seule; sinon ffmpeg se positionne sur l'image clé précédant
+        l'horodatage et ne décode que jusqu'à celui-ci.
+
+        Args:
+            video_path: Vidéo
+            dest: Fichier image de sortie
+            duration: Durée de la vidéo en secondes
+            options: Horodatage, largeur, format et qualité de la miniature
+
+        Returns:
+            Horodatage de l'image utilisée
+
+        Raises:
+            FFmpegError: Si le décodage échoue
+        """
+        if options.timestamp is None:
+            timestamp = self.pick_timestamp(video_path, duration)
+            seek = ["-ss", f"{timestamp:.3f}", "-noaccurate_seek", "-skip_frame", "nokey"]
+        else:
+            timestamp = min(options.timestamp, max(duration - 0.1, 0.0))
+            seek = ["-ss", f"{timestamp:.3f}"]
+
+        result = _run([
+            "-loglevel", "error",
+            *seek, "-i", video_path,
+            "-an", "-frames:v", "1",
+            "-vf", f"scale=min(iw\\,{options.width}):-2",
+            "-f", "image2pipe", "-c:v", "png", "pipe:1",
+        ])
+        if not result.stdout:
+            raise FFmpegError(f"No frame decoded from {video_path} at {timestamp:.3f}s")
+
+        with Image.open(io.BytesIO(result.stdout)) as image:
+            image.convert("RGB").save(dest, _PIL_FORMATS[options.format], quality=options.quality)
+        return timestamp
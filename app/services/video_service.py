@@ -1,213 +1,1164 @@
 """Service pour la génération de vidéos."""
 
+import asyncio
+import contextlib
+import dataclasses
+import math
 import os
 import time
-from moviepy.editor import VideoFileClip, AudioFileClip, CompositeAudioClip, concatenate_audioclips
+from typing import AsyncIterator, Awaitable
+from moviepy.editor import AudioClip, VideoFileClip
 
-from app.models.video_model import VideoGenerationRequest, VideoGenerationResponse
+from app.core.config import settings
+from app.core.exceptions import AppException, TooManyRequestsException
+from app.core.logging import get_logger, log_span, span
+from app.models.video_model import (
+    DuckingOptions,
+    TemplateCacheEntry,
+    TemplateWarmRequest,
+    TemplateWarmResponse,
+    VideoBatchItemResult,
+    VideoBatchRequest,
+    VideoGenerationRequest,
+    VideoGenerationResponse,
+)
+from app.services.asset_fetcher import AssetFetcher, get_asset_fetcher, is_url
+from app.services.audio_mixer import CHANNELS, SAMPLE_RATE, AudioMixer, PcmAudioClip, PcmCache, PcmTrack, decode_pcm
+from app.services import metrics
+from app.services.encode_profiles import EncodeProfile, resolve_profile
+from app.services.ffmpeg_encoder import AudioSource, EncodeSettings, FFmpegEncoder
+from app.services.ffmpeg_tools import FFmpegError, MediaInfo, run_ffmpeg
+from app.services.probe_cache import MediaProbeCache, get_probe_cache
+from app.services.progress import ProgressReporter, total_frames
+from app.services.render_engine import RenderEngine, get_render_engine
+from app.services.result_cache import ResultCache
+from app.services.scratch import ScratchSpace
+from app.services.segmented_encoder import SegmentedEncoder, plan_segments
+from app.services.slideshow import ImageCache, SlideshowRenderer
+from app.services.template_cache import TemplateCache
+from app.services.thumbnails import ThumbnailExtractor
+from app.services.video_track_cache import VideoTrackCache
 
+logger = get_logger(__name__)
 
-class VideoService:
-    """Service pour générer des vidéos."""
 
-    def __init__(self):
-        """Initialise le service vidéo."""
-        self.resources_dir = os.getenv("RESOURCES_DIR", "/app/ressources")
-        self.template_dir = os.path.join(self.resources_dir, "video-template")
+class VideoRenderer:
+    """Rendu synchrone d'une vidéo (exécuté dans un processus du moteur de rendu).
+
+    Cette classe ne doit contenir que des attributs picklables: elle est
+    envoyée aux processus de rendu avec chaque requête.
+    """
+
+    def __init__(self) -> None:
+        """Initialise le moteur de rendu synchrone."""
+        self.template_cache = TemplateCache.from_settings()
+        self.scratch = ScratchSpace.from_settings()
+        self.audio_mixer = AudioMixer(PcmCache.from_settings())
+        self.ffmpeg_encoder = FFmpegEncoder()
+        self.thumbnails = ThumbnailExtractor(settings.thumbnail_samples)
+        self.slideshow = SlideshowRenderer(ImageCache.from_settings(), self.ffmpeg_encoder)
+        self.video_tracks = VideoTrackCache.from_settings()
+        self.segmented = SegmentedEncoder(self.ffmpeg_encoder)
+
+    def warm_template(
+        self,
+        template_path: str,
+        fps: int,
+        profile: EncodeProfile,
+        threads: int | None = None,
+    ) -> MediaInfo:
+        """Préparer l'encodage normalisé d'un template dans le cache.
         
-        # S'assurer que le répertoire de templates existe
-        os.makedirs(self.template_dir, exist_ok=True)
+        Args:
+            template_path: Chemin du template vidéo
+            fps: Cadence de l'encodage
+            profile: Profil d'encodage des rendus qui utiliseront le template
+            threads: Threads attribués par le moteur de rendu
+            
+        Returns:
+            MediaInfo: Métadonnées de l'encodage en cache
+        """
+        return self.template_cache.get_or_create(template_path, fps, profile, threads)
 
-    def _validate_template_path(self, template_path: str) -> str:
-        """Valider le chemin du template vidéo.
+    def prepare_assets(
+        self,
+        template_path: str | None,
+        fps: int,
+        profile: EncodeProfile,
+        music_path: str | None,
+        threads: int | None = None,
+    ) -> None:
+        """Préparer les ressources partagées par plusieurs rendus.
+        
+        Le template est normalisé et la musique décodée une seule fois, avant
+        les rendus qui les utilisent: ceux-ci les trouvent alors dans les caches
+        au lieu de les préparer chacun en parallèle.
         
         Args:
-            template_path: Chemin du template spécifié
+            template_path: Template vidéo (None pour un diaporama)
+            fps: Cadence des rendus
+            profile: Profil d'encodage des rendus
+            music_path: Musique de fond (None si aucune)
+            threads: Threads attribués par le moteur de rendu
+        """
+        if template_path and settings.template_cache_enabled:
+            self.template_cache.get_or_create(template_path, fps, profile, threads)
+        if music_path:
+            self.audio_mixer.pcm_cache.get_or_decode(music_path)
+
+    def _prepare_template(
+        self,
+        template_path: str,
+        fps: int,
+        profile: EncodeProfile,
+        threads: int | None,
+        timings: dict[str, float],
+    ) -> MediaInfo:
+        """Obtenir le template à utiliser: encodage normalisé en cache si possible.
+        
+        L'encodage en cache est déjà à la hauteur et aux paramètres du profil:
+        la mise à l'échelle est alors faite une fois pour toutes au lieu de
+        l'être à chaque rendu, et la copie de flux respecte le profil.
+        
+        Args:
+            template_path: Chemin du template vidéo
+            fps: Cadence demandée
+            profile: Profil d'encodage de la requête
+            threads: Threads de l'encodeur en cas de normalisation
+            timings: Durées par étape, complétées par cette méthode
             
         Returns:
-            Chemin absolu du template validé
+            MediaInfo: Métadonnées du template (normalisé ou original)
+        """
+        with span(logger, "template_prepare", timings):
+            template_info = None
+            if settings.template_cache_enabled:
+                try:
+                    template_info = self.template_cache.get_or_create(template_path, fps, profile, threads)
+                except FFmpegError as e:
+                    logger.warning("Template normalization failed, using the original: %s", e)
+            if template_info is None:
+                template_info = get_probe_cache().probe(template_path)
+        return template_info
+
+    @staticmethod
+    def _scratch_reservation(request: VideoGenerationRequest) -> int:
+        """Espace de travail estimé d'un rendu: pistes PCM float32 de la voix et du mixage.
+        
+        Args:
+            request: Requête de génération vidéo
             
-        Raises:
-            ValueError: Si le template n'existe pas
+        Returns:
+            Octets à réserver (0 si l'audio ne peut pas être sondé: le décodage rapportera l'erreur)
         """
-        if not template_path:
-            raise ValueError("Video template path is required")
+        try:
+            duration = get_probe_cache().probe(request.audio_path).duration
+        except (OSError, FFmpegError):
+            return 0
+        # voice.f32, plus mix.f32 quand la musique est mixée avec NumPy
+        tracks = 2 if request.background_music else 1
+        return math.ceil(duration * SAMPLE_RATE) * CHANNELS * 4 * tracks
+
+    def create_thumbnail(
+        self,
+        request: VideoGenerationRequest,
+        duration: float,
+        threads: int | None = None,
+    ) -> str:
+        """Créer la miniature de la vidéo produite, à côté de celle-ci.
         
-        if not os.path.exists(template_path):
-            raise ValueError(f"Video template not found: {template_path}")
+        Seules les images clés nécessaires sont décodées; un échec n'interrompt
+        pas le rendu, la miniature est alors simplement absente.
         
-        print(f"✅ Utilisation du template vidéo: {os.path.basename(template_path)}")
-        return template_path
+        Args:
+            request: Requête de génération vidéo (vidéo déjà écrite)
+            duration: Durée de la vidéo en secondes
+            threads: Threads attribués par le moteur de rendu (décodage mono-thread, non utilisé)
+            
+        Returns:
+            Chemin relatif de la miniature, ou chaîne vide
+        """
+        if request.thumbnail is None:
+            return ""
+        extension = f".{request.thumbnail.format}"
+        dest = os.path.splitext(request.video_absolute_path)[0] + extension
+        try:
+            timestamp = self.thumbnails.create(request.video_absolute_path, dest, duration, request.thumbnail)
+        except (FFmpegError, OSError) as e:
+            logger.warning("Thumbnail failed: %s", e)
+            return ""
+        logger.debug("Thumbnail at %.2fs: %s", timestamp, dest)
+        return os.path.splitext(request.video_relative_path)[0] + extension
 
-    def _add_background_music(self, audio_clip: AudioFileClip, background_music_path: str) -> CompositeAudioClip:
+    def _add_background_music(
+        self,
+        voice: PcmTrack,
+        background_music_path: str,
+        volume: float,
+        work_dir: str,
+        ducking: DuckingOptions | None = None,
+    ) -> PcmTrack:
         """Ajouter une musique de fond à l'audio principal.
         
+        La musique est lue depuis le cache PCM, bouclée et mixée à la voix
+        décodée en une passe NumPy, avec une atténuation pendant la voix si le
+        ducking est demandé.
+        
         Args:
-            audio_clip: Clip audio principal
+            voice: Audio principal décodé dans le répertoire de travail
             background_music_path: Chemin de la musique de fond
+            volume: Gain linéaire de la musique de fond
+            work_dir: Répertoire de travail du rendu
+            ducking: Paramètres du ducking (None = gain constant)
             
         Returns:
-            Clip audio mixé avec la musique de fond
+            Mix final en PCM float32 dans le répertoire de travail
         """
-        print("🎵 Chargement de la musique de fond...")
-        background_music_clip = AudioFileClip(background_music_path)
+        # Mixer l'audio principal avec la musique de fond
+        logger.debug("Mixing background music %s (volume %.2f)", background_music_path, volume)
+        return self.audio_mixer.mix(
+            voice, background_music_path, volume, os.path.join(work_dir, "mix.f32"), ducking
+        )
+
+    def _can_stream_copy(
+        self,
+        request: VideoGenerationRequest,
+        template_info: MediaInfo,
+        profile: EncodeProfile,
+    ) -> bool:
+        """Indiquer si la piste vidéo peut être construite sans ré-encodage.
         
-        # Ajuster le volume de la musique de fond (30% du volume)
-        background_music_clip = background_music_clip.volumex(0.1 )
+        Le chemin rapide s'applique quand aucun effet par frame n'est demandé
+        (pas d'images) et que le template vient du cache des templates: encodé
+        en H.264 à la cadence demandée avec le preset, le CRF, le plafond de
+        débit et la hauteur du profil, il donne la même vidéo qu'un ré-encodage.
+        Le template original (cache désactivé ou normalisation en échec) a des
+        paramètres inconnus et passe toujours par un ré-encodage.
         
-        audio_duration_sec = audio_clip.duration
+        Args:
+            request: Requête de génération vidéo
+            template_info: Métadonnées du template
+            profile: Profil d'encodage de la requête
+            
+        Returns:
+            True si le template peut être bouclé par copie de flux
+        """
+        if not (settings.stream_copy_enabled and request.stream_copy):
+            return False
+        if request.slideshow_images or template_info.path == request.video_template_path:
+            return False
+        if template_info.video_codec != "h264" or not template_info.fps:
+            return False
+        if profile.height is not None and (template_info.height is None or template_info.height > profile.height):
+            return False
+        return abs(template_info.fps - (request.fps or 30)) < 0.01
+
+    def _render_stream_copy(
+        self,
+        request: VideoGenerationRequest,
+        template_info: MediaInfo,
+        audio_input_args: list[str],
+        duration: float,
+        work_dir: str,
+        profile: EncodeProfile,
+    ) -> None:
+        """Boucler le template par copie de flux et y multiplexer l'audio.
         
-        # Boucler la musique de fond pour correspondre à la durée audio
-        if background_music_clip.duration < audio_duration_sec:
-            n_loops = int(audio_duration_sec / background_music_clip.duration) + 1
-            # Créer une liste de clips répétés
-            clips = [background_music_clip] * n_loops
-            # Concaténer les clips pour créer une boucle
-            background_music_clip = concatenate_audioclips(clips)
+        Le template est répété via le demuxer concat de ffmpeg sans décoder ni
+        ré-encoder ses frames; seule la dernière boucle, partielle, est coupée
+        au premier paquet dépassant la durée de l'audio. Seul l'audio est encodé.
         
-        # Couper à la durée exacte de l'audio principal
-        background_music_clip = background_music_clip.subclip(0, audio_duration_sec)
+        Args:
+            request: Requête de génération vidéo
+            template_info: Métadonnées du template
+            audio_input_args: Arguments d'entrée ffmpeg de l'audio final
+            duration: Durée de la vidéo en secondes
+            work_dir: Répertoire de travail du rendu
+            profile: Profil d'encodage (débit audio)
+            
+        Raises:
+            FFmpegError: Si ffmpeg échoue
+        """
+        n_loops = max(1, math.ceil(duration / template_info.duration))
+        template_entry = template_info.path.replace("'", "'\\''")
+        concat_list = os.path.join(work_dir, "concat.txt")
+        with open(concat_list, "w") as concat_file:
+            concat_file.write(f"file '{template_entry}'\n" * n_loops)
         
-        # Mixer l'audio principal avec la musique de fond
-        print("🔊 Mixage de l'audio principal avec la musique de fond...")
-        final_audio = CompositeAudioClip([audio_clip, background_music_clip])
-        print(f"✅ Musique de fond ajoutée (volume: 30%)")
+        logger.debug("Looping template by stream copy (%d loops)", n_loops)
+        run_ffmpeg([
+            "-f", "concat", "-safe", "0", "-i", concat_list,
+            *audio_input_args,
+            "-map", "0:v:0", "-map", "1:a:0",
+            "-c:v", "copy",
+            "-c:a", "aac", "-b:a", profile.audio_bitrate,
+            "-t", f"{duration:.3f}",
+            "-movflags", "+faststart",
+            request.video_absolute_path,
+        ])
+
+    def _render_ffmpeg(
+        self,
+        request: VideoGenerationRequest,
+        template_path: str,
+        audio_sources: list[AudioSource],
+        duration: float,
+        encode: EncodeSettings,
+        progress: ProgressReporter,
+    ) -> None:
+        """Boucler le template et encoder la vidéo dans un seul processus ffmpeg.
         
-        # Fermer le clip de musique de fond (il est maintenant intégré dans CompositeAudioClip)
-        background_music_clip.close()
+        Le bouclage, la coupe, la cadence, la mise à l'échelle et le mixage audio
+        sont faits par le graphe de filtres: aucune frame ne passe par le
+        processus Python.
         
-        return final_audio
+        Args:
+            request: Requête de génération vidéo
+            template_path: Chemin du template vidéo
+            audio_sources: Sources audio (voix, puis musique éventuelle)
+            duration: Durée de la vidéo en secondes
+            encode: Paramètres d'encodage du profil
+            progress: Progression du rendu (images encodées lues sur ``-progress``)
+            
+        Raises:
+            FFmpegError: Si ffmpeg échoue
+        """
+        logger.debug("ffmpeg encode: %d fps, preset %s, %s", encode.fps, encode.preset, encode.rate_control_args())
+        self.ffmpeg_encoder.encode(
+            template_path, audio_sources, request.video_absolute_path, duration, encode, progress.ffmpeg_progress
+        )
 
-    async def render_video(self, request: VideoGenerationRequest) -> VideoGenerationResponse:
-        """Génère une vidéo à partir d'un audio et d'un template.
+    def _render_remux(
+        self,
+        request: VideoGenerationRequest,
+        video_track: MediaInfo,
+        audio_sources: list[AudioSource],
+        duration: float,
+        encode: EncodeSettings,
+    ) -> None:
+        """Multiplexer l'audio de la requête sur une piste vidéo déjà encodée.
         
-        Cette méthode:
-        1. Valide le chemin du template vidéo
-        2. Charge l'audio depuis le chemin absolu
-        3. Ajoute la musique de fond si spécifiée
-        4. Boucle la vidéo pour correspondre à la durée audio
-        5. Ajoute l'audio à la vidéo
-        6. Exporte la vidéo au chemin spécifié
+        La piste provient d'un rendu précédent du même template, aux mêmes
+        paramètres vidéo et au même nombre d'images: seul l'audio est encodé.
         
         Args:
-            request: Requête de génération vidéo contenant les chemins et paramètres
+            request: Requête de génération vidéo
+            video_track: Piste vidéo en cache
+            audio_sources: Sources audio (voix, puis musique éventuelle)
+            duration: Durée de la vidéo en secondes
+            encode: Paramètres d'encodage du profil (audio)
             
-        Returns:
-            VideoGenerationResponse: Réponse avec les informations de la vidéo générée
+        Raises:
+            FFmpegError: Si ffmpeg échoue
+        """
+        logger.debug("Reusing video track %s, encoding audio only", video_track.path)
+        self.ffmpeg_encoder.remux(
+            ["-i", video_track.path], audio_sources, request.video_absolute_path,
+            total_frames(duration, encode.fps), encode,
+        )
+
+    @staticmethod
+    def _segment_workers(
+        request: VideoGenerationRequest,
+        duration: float,
+        encode: EncodeSettings,
+    ) -> int:
+        """Nombre de segments à encoder simultanément, 0 pour un encodage d'une traite.
+        
+        Sans choix explicite de la requête, seuls les rendus d'au moins
+        ``segment_min_duration`` secondes sont segmentés, et seulement si les
+        threads attribués permettent au moins deux segments simultanés.
+        """
+        if request.segmented is False or (request.segmented is None and not settings.segmented_render_enabled):
+            return 0
+        threads = encode.threads or os.cpu_count() or 1
+        workers = settings.segment_workers or max(1, threads // max(1, settings.segment_threads))
+        segments = plan_segments(
+            total_frames(duration, encode.fps),
+            round(settings.segment_seconds * encode.fps),
+            encode.gop or encode.fps,
+        )
+        if request.segmented:
+            return max(1, min(workers, len(segments)))
+        if duration < settings.segment_min_duration or workers < 2 or len(segments) < 2:
+            return 0
+        return min(workers, len(segments))
+
+    def _render_segmented(
+        self,
+        request: VideoGenerationRequest,
+        template_info: MediaInfo,
+        audio_sources: list[AudioSource],
+        duration: float,
+        work_dir: str,
+        encode: EncodeSettings,
+        workers: int,
+        progress: ProgressReporter,
+    ) -> None:
+        """Encoder la vidéo par segments parallèles, puis les assembler avec l'audio.
+        
+        Les threads attribués au rendu sont répartis entre les segments encodés
+        simultanément.
+        
+        Args:
+            request: Requête de génération vidéo
+            template_info: Template (normalisé ou original)
+            audio_sources: Sources audio (voix, puis musique éventuelle)
+            duration: Durée de la vidéo en secondes
+            work_dir: Répertoire de travail du rendu
+            encode: Paramètres d'encodage du profil
+            workers: Segments encodés simultanément
+            progress: Progression du rendu (images encodées par l'ensemble des segments)
             
         Raises:
-            ValueError: Si les fichiers nécessaires n'existent pas
+            FFmpegError: Si un segment ou l'assemblage échoue
         """
-        print(f"🎬 Début de la génération vidéo")
-        print(f"📂 Audio: {request.audio_path}")
-        print(f"📂 Vidéo sortie: {request.video_absolute_path}")
-        print(f"📂 Template vidéo: {request.video_template_path if request.video_template_path else 'Non spécifié'}")
-        print(f"🎵 Musique de fond: {request.background_music if request.background_music else 'Aucune'}")
+        threads = encode.threads or os.cpu_count() or 1
+        segment_encode = dataclasses.replace(encode, threads=max(1, threads // workers))
+        self.segmented.encode(
+            template_info,
+            audio_sources,
+            request.video_absolute_path,
+            total_frames(duration, encode.fps),
+            segment_encode,
+            work_dir,
+            round(settings.segment_seconds * encode.fps),
+            workers,
+            progress.frames,
+        )
+
+    def _store_video_track(
+        self,
+        template_path: str,
+        prepared_path: str,
+        encode: EncodeSettings,
+        n_frames: int,
+        video_path: str,
+        timings: dict[str, float],
+    ) -> None:
+        """Garder la piste vidéo d'un rendu encodé pour les rendus de même longueur.
         
+        Un échec n'interrompt pas le rendu: la piste n'est simplement pas en cache.
+        """
         try:
-            # Vérifier que l'audio existe
-            if not os.path.exists(request.audio_path):
-                raise ValueError(f"Audio file not found: {request.audio_path}")
-            
-            # Valider le chemin du template vidéo
-            template_path = self._validate_template_path(request.video_template_path)
-            
-            # Charger l'audio principal et obtenir sa durée
-            print("🎵 Chargement de l'audio principal...")
-            audio_clip = AudioFileClip(request.audio_path)
-            audio_duration_sec = audio_clip.duration
-            print(f"✅ Audio principal chargé: {audio_duration_sec:.2f}s")
-            
-            # Gérer la musique de fond si spécifiée
-            final_audio = audio_clip
-            if request.background_music:
-                if os.path.exists(request.background_music):
-                    final_audio = self._add_background_music(audio_clip, request.background_music)
-                else:
-                    print(f"⚠️ Musique de fond spécifiée mais non trouvée: {request.background_music}")
-            
-            # Charger le template vidéo
-            print("📽️ Chargement du template vidéo...")
-            video_clip = VideoFileClip(template_path)
-            print(f"✅ Template chargé: {video_clip.duration:.2f}s")
+            with span(logger, "video_track_store", timings):
+                self.video_tracks.add(template_path, prepared_path, encode, n_frames, video_path)
+        except (FFmpegError, OSError) as e:
+            logger.warning("Video track not cached: %s", e)
+
+    def _render_slideshow(
+        self,
+        request: VideoGenerationRequest,
+        audio_sources: list[AudioSource],
+        duration: float,
+        profile: EncodeProfile,
+        encode: EncodeSettings,
+        progress: ProgressReporter,
+    ) -> None:
+        """Rendre un diaporama Ken Burns des images de la requête.
+        
+        Les images se partagent la durée de l'audio à parts égales; elles sont
+        calculées à la taille de sortie du profil (sans mise à l'échelle dans le
+        graphe) et les threads attribués sont partagés entre leur calcul et ffmpeg.
+        
+        Args:
+            request: Requête de génération vidéo (images avec chemins locaux)
+            audio_sources: Sources audio (voix, puis musique éventuelle)
+            duration: Durée de la vidéo en secondes
+            profile: Profil d'encodage (hauteur de sortie)
+            encode: Paramètres d'encodage du profil
+            progress: Progression du rendu (images écrites vers ffmpeg)
             
+        Raises:
+            FFmpegError: Si ffmpeg échoue
+        """
+        height = profile.height or settings.slideshow_height
+        width = round(settings.slideshow_width * height / settings.slideshow_height / 2) * 2
+        threads = encode.threads or os.cpu_count() or 1
+        workers = max(1, threads // 2)
+        image_paths = request.slideshow_images
+        logger.debug(
+            "Slideshow: %d images, %dx%d @ %d fps (%d image threads)", len(image_paths), width, height, encode.fps, workers
+        )
+        self.slideshow.render(
+            image_paths,
+            audio_sources,
+            request.video_absolute_path,
+            duration,
+            width,
+            height,
+            dataclasses.replace(encode, threads=max(1, threads - workers)),
+            workers,
+            progress.frames,
+        )
+
+    def _render_moviepy(
+        self,
+        request: VideoGenerationRequest,
+        template_info: MediaInfo,
+        final_audio: AudioClip,
+        duration: float,
+        work_dir: str,
+        encode: EncodeSettings,
+        timings: dict[str, float],
+        progress: ProgressReporter,
+    ) -> None:
+        """Boucler le template et encoder la vidéo complète avec MoviePy.
+        
+        Args:
+            request: Requête de génération vidéo
+            template_info: Métadonnées du template vidéo (durée de bouclage)
+            final_audio: Audio final (principal ou mixé avec la musique)
+            duration: Durée de la vidéo en secondes
+            work_dir: Répertoire de travail du rendu (audio temporaire)
+            encode: Paramètres d'encodage du profil
+            timings: Durées par étape, complétées par cette méthode
+            progress: Progression du rendu (logger proglog de MoviePy)
+        """
+        # Charger le template vidéo
+        with span(logger, "template_load", timings):
+            # L'audio du template est remplacé: inutile d'ouvrir son lecteur audio
+            video_clip = VideoFileClip(template_info.path, audio=False)
+        
+        with span(logger, "loop_trim", timings):
             # Boucler la vidéo pour correspondre à la durée audio
-            if video_clip.duration < audio_duration_sec:
-                print(f"🔄 Bouclage de la vidéo (durée template: {video_clip.duration:.2f}s → {audio_duration_sec:.2f}s)")
-                n_loops = int(audio_duration_sec / video_clip.duration) + 1
+            if template_info.duration < duration:
+                n_loops = int(duration / template_info.duration) + 1
                 video_clip = video_clip.loop(n=n_loops)
             
             # Couper à la durée exacte de l'audio
-            video_clip = video_clip.subclip(0, audio_duration_sec)
+            video_clip = video_clip.subclip(0, duration)
             
             # Ajouter l'audio final à la vidéo
-            print("🎧 Ajout de l'audio à la vidéo...")
             final_video = video_clip.set_audio(final_audio)
+        
+        # Exporter la vidéo
+        logger.debug(
+            "MoviePy encode: %s/%s, %d fps, preset %s, %s",
+            encode.video_codec, encode.audio_codec, encode.fps, encode.preset, encode.rate_control_args(),
+        )
+        
+        # La mise à l'échelle est confiée à ffmpeg (-vf) plutôt qu'à un resize par frame en Python
+        ffmpeg_params = encode.rate_control_args()
+        scale = encode.scale_filter()
+        if scale:
+            ffmpeg_params += ["-vf", scale]
+        
+        final_video.write_videofile(
+            request.video_absolute_path,
+            codec=encode.video_codec,
+            audio_codec=encode.audio_codec,
+            audio_bitrate=encode.audio_bitrate,
+            fps=encode.fps,
+            preset=encode.preset,
+            ffmpeg_params=ffmpeg_params,
+            threads=encode.threads,
+            logger=progress.moviepy_logger(),
+            temp_audiofile=os.path.join(work_dir, "temp_audio.m4a"),  # Audio temporaire propre au rendu
+            remove_temp=True  # Remove temp file after
+        )
+        
+        # Fermer les clips pour libérer les ressources
+        final_video.close()
+        video_clip.close()
+
+    def render(
+        self,
+        request: VideoGenerationRequest,
+        progress_id: str | None = None,
+        threads: int | None = None,
+    ) -> VideoGenerationResponse:
+        """Génère une vidéo à partir d'un audio et d'un template.
+        
+        Cette méthode:
+        1. Charge l'audio depuis le chemin absolu
+        2. Ajoute la musique de fond si spécifiée
+        3. Boucle la vidéo pour correspondre à la durée audio, par copie de flux
+           si possible, en réutilisant une piste vidéo déjà encodée de même
+           longueur, sinon par ré-encodage (ffmpeg ou MoviePy, par segments
+           parallèles pour les vidéos longues), ou construit
+           un diaporama des images de la requête
+        4. Ajoute l'audio à la vidéo
+        5. Exporte la vidéo au chemin spécifié
+        
+        Args:
+            request: Requête de génération vidéo contenant les chemins et paramètres
+            progress_id: Identifiant sous lequel publier la progression (None = non publiée)
+            threads: Threads d'encodage attribués par le moteur de rendu (None = choix de ffmpeg)
             
-            # Debug: Check if audio is properly attached
-            print(f"✅ Audio attaché: {final_video.audio is not None}")
-            if final_video.audio:
-                print(f"   Durée audio: {final_video.audio.duration:.2f}s")
-                # Try to get fps, but handle case where it might not exist
-                try:
-                    fps_value = final_video.audio.fps
-                    print(f"   Sample rate: {fps_value} Hz")
-                except AttributeError:
-                    print(f"   Sample rate: N/A (CompositeAudioClip)")
-            
-            # S'assurer que le répertoire de sortie existe
-            output_dir = os.path.dirname(request.video_absolute_path)
-            os.makedirs(output_dir, exist_ok=True)
-            
-            # Exporter la vidéo
-            print("⏳ Exportation de la vidéo (optimisée pour performance)...")
-            print(f"   Codec: libx264 | Audio: aac | FPS: {request.fps} | Preset: ultrafast | Bitrate: 2000k")
-            
-            # Mesurer le temps d'encodage
-            encoding_start = time.time()
-            
-            # Use verbose logging to see any errors
-            # Also try different audio codec if 'aac' fails
-            final_video.write_videofile(
-                request.video_absolute_path,
-                codec='libx264',
-                audio_codec='aac',
-                fps=request.fps,
-                preset='ultrafast',
-                bitrate='2000k',
-                threads=8,
-                verbose=True,
-                logger='bar',
-                temp_audiofile="temp_audio.m4a",  # Specify temp audio file
-                remove_temp=True  # Remove temp file after
-            )
-            
-            encoding_duration = time.time() - encoding_start
-            
-            # Fermer les clips pour libérer les ressources
-            final_video.close()
-            audio_clip.close()
-            video_clip.close()
-            
-            print(f"✅ Vidéo générée avec succès: {request.video_absolute_path}")
-            print(f"📊 Durée finale: {audio_duration_sec:.2f}s")
-            print(f"⏱️ Temps d'encodage: {encoding_duration:.2f}s ({encoding_duration/60:.1f}m)")
+        Returns:
+            VideoGenerationResponse: Réponse avec les informations de la vidéo générée
             
-            # Créer l'URL de la vidéo (sera construite par le ui-service)
-            # On retourne juste le chemin relatif
-            video_url = request.video_relative_path
+        Raises:
+            ValueError: Si la génération échoue
+            InsufficientStorageException: Si le quota de l'espace de travail est atteint
+        """
+        logger.info(
+            "Render started: audio=%s output=%s template=%s music=%s",
+            request.audio_path, request.video_absolute_path, request.video_template_path, request.background_music,
+        )
+        
+        # Durées par étape (secondes), renvoyées dans la réponse
+        timings: dict[str, float] = {}
+        progress = ProgressReporter(progress_id, settings.progress_interval, settings.log_progress_interval)
+        
+        try:
+            with self.scratch.allocate(reserve_bytes=self._scratch_reservation(request)) as work_dir:
+                template_path = request.video_template_path or ""
+                fps = request.fps or 30
+                profile = resolve_profile(request.resolution, request.profile)
+                
+                # Charger l'audio principal et obtenir sa durée
+                progress.stage("audio_load")
+                with span(logger, "audio_load", timings):
+                    # Décodée une seule fois en PCM: lue ensuite par memmap (MoviePy, mixeur) ou en brut (ffmpeg)
+                    voice = decode_pcm(request.audio_path, os.path.join(work_dir, "voice.f32"))
+                    audio_clip: AudioClip = PcmAudioClip(voice)
+                    audio_duration_sec = voice.duration
+                
+                # Choisir le chemin de rendu avant de préparer l'audio
+                template_info: MediaInfo | None = None
+                video_track: MediaInfo | None = None
+                segment_workers = 0
+                if request.slideshow_images:
+                    # Diaporama: les images sont produites à la taille de sortie
+                    stream_copy = False
+                    encode = profile.settings(fps, None, threads)
+                    encoder = "slideshow"
+                else:
+                    progress.stage("template")
+                    template_info = self._prepare_template(template_path, fps, profile, threads, timings)
+                    stream_copy = self._can_stream_copy(request, template_info, profile)
+                    # Mise à l'échelle dans le graphe d'encodage seulement si le template
+                    # (normalisé ou non) dépasse encore la hauteur du profil
+                    needs_scale = profile.height is not None and (
+                        template_info.height is None or template_info.height > profile.height
+                    )
+                    encode = profile.settings(fps, profile.height if needs_scale else None, threads)
+                    encoder = request.encoder or settings.render_encoder
+                    # Piste vidéo déjà encodée pour ce template et ce nombre d'images: seul l'audio change
+                    if not stream_copy and settings.video_track_cache_enabled:
+                        video_track = self.video_tracks.get(
+                            template_path, template_info.path, encode, total_frames(audio_duration_sec, fps)
+                        )
+                        if video_track is not None:
+                            encoder = "remux"
+                    # Rendu long: segments encodés en parallèle puis assemblés
+                    if not stream_copy and encoder in ("ffmpeg", "moviepy"):
+                        segment_workers = self._segment_workers(request, audio_duration_sec, encode)
+                        if segment_workers:
+                            encoder = "segmented"
+                # L'encodeur ffmpeg (comme l'encodage segmenté, le diaporama et le remux) mixe la musique dans son graphe
+                # de filtres, sauf si le ducking nécessite l'enveloppe de la voix calculée avec NumPy
+                mix_in_graph = (
+                    not stream_copy
+                    and encoder in ("ffmpeg", "segmented", "slideshow", "remux")
+                    and request.ducking is None
+                )
+                
+                # Gérer la musique de fond si spécifiée
+                final_audio: AudioClip = audio_clip
+                audio_sources = [AudioSource(voice.ffmpeg_input_args())]
+                if request.background_music:
+                    if not os.path.exists(request.background_music):
+                        logger.warning("Background music not found, ignored: %s", request.background_music)
+                    elif mix_in_graph:
+                        music = self.audio_mixer.pcm_cache.get_or_decode(request.background_music)
+                        audio_sources.append(AudioSource(
+                            music.ffmpeg_input_args(), volume=request.background_music_volume, loop=True
+                        ))
+                    else:
+                        progress.stage("music_mix")
+                        with span(logger, "music_mix", timings):
+                            mix = self._add_background_music(
+                                voice,
+                                request.background_music,
+                                request.background_music_volume,
+                                work_dir,
+                                request.ducking,
+                            )
+                            final_audio = PcmAudioClip(mix)
+                            audio_sources = [AudioSource(mix.ffmpeg_input_args())]
+                
+                # S'assurer que le répertoire de sortie existe
+                output_dir = os.path.dirname(request.video_absolute_path)
+                os.makedirs(output_dir, exist_ok=True)
+                
+                # Mesurer le temps d'encodage
+                encoding_start = time.time()
+                progress.stage("encode", total_frames(audio_duration_sec, fps), fps)
+                
+                render_path = encoder
+                if stream_copy and template_info is not None:
+                    try:
+                        self._render_stream_copy(
+                            request, template_info, audio_sources[0].input_args, audio_duration_sec, work_dir, profile
+                        )
+                        render_path = "stream_copy"
+                    except FFmpegError as e:
+                        logger.warning("Stream copy failed, re-encoding with %s: %s", encoder, e)
+                
+                if render_path == "stream_copy":
+                    pass
+                elif render_path == "remux" and video_track is not None:
+                    self._render_remux(request, video_track, audio_sources, audio_duration_sec, encode)
+                elif render_path == "slideshow":
+                    self._render_slideshow(request, audio_sources, audio_duration_sec, profile, encode, progress)
+                elif render_path == "ffmpeg" and template_info is not None:
+                    self._render_ffmpeg(
+                        request, template_info.path, audio_sources, audio_duration_sec, encode, progress
+                    )
+                elif render_path == "segmented" and template_info is not None:
+                    self._render_segmented(
+                        request, template_info, audio_sources, audio_duration_sec, work_dir, encode,
+                        segment_workers, progress,
+                    )
+                elif render_path == "moviepy" and template_info is not None:
+                    self._render_moviepy(
+                        request, template_info, final_audio, audio_duration_sec, work_dir, encode, timings,
+                        progress,
+                    )
+                else:
+                    raise ValueError(f"Unknown render path: {render_path}")
+                
+                encoding_duration = time.time() - encoding_start
+                # Chargement et bouclage du template MoviePy ont leurs propres étapes
+                timings["encode"] = (
+                    encoding_duration - timings.get("template_load", 0.0) - timings.get("loop_trim", 0.0)
+                )
+                log_span(logger, "encode", timings["encode"], render_path=render_path)
+                
+                # Piste vidéo gardée pour les prochains rendus de même longueur (nouvel audio seulement)
+                if settings.video_track_cache_enabled and render_path in ("ffmpeg", "moviepy", "segmented") and template_info:
+                    self._store_video_track(
+                        template_path, template_info.path, encode, total_frames(audio_duration_sec, fps),
+                        request.video_absolute_path, timings,
+                    )
+                
+                logger.info(
+                    "Render done: %s (%.2fs of video, encoded in %.2fs by %s)",
+                    request.video_absolute_path, audio_duration_sec, encoding_duration, render_path,
+                )
+                
+                # Créer l'URL de la vidéo (sera construite par le ui-service)
+                # On retourne juste le chemin relatif
+                video_url = request.video_relative_path
+                
+                # Miniature à partir des images clés de la vidéo produite
+                thumbnail_url = ""
+                if request.thumbnail is not None:
+                    progress.stage("thumbnail")
+                    with span(logger, "thumbnail", timings):
+                        thumbnail_url = self.create_thumbnail(request, audio_duration_sec)
+                
+                # Fermer les clips pour libérer les ressources
+                cleanup_start = time.perf_counter()
+                if final_audio is not audio_clip:
+                    final_audio.close()
+                audio_clip.close()
             
-            # Pour la thumbnail, on pourrait extraire une frame, pour l'instant on retourne un placeholder
-            thumbnail_url = ""
+            # Le répertoire de travail a été supprimé à la sortie du bloc
+            timings["cleanup"] = time.perf_counter() - cleanup_start
+            log_span(logger, "cleanup", timings["cleanup"])
+            progress.finish()
             
             return VideoGenerationResponse(
                 video_url=video_url,
                 thumbnail=thumbnail_url,
                 duration=audio_duration_sec,
                 status="success",
-                message=f"Video generated successfully at {request.video_absolute_path}"
+                message=f"Video generated successfully at {request.video_absolute_path}",
+                timings=timings,
+                profile=profile.name,
+                threads=threads,
+                render_path=render_path,
             )
-            
+                
+        except AppException:
+            progress.finish(failed=True)
+            raise
         except Exception as e:
-            print(f"❌ Erreur lors de la génération vidéo: {str(e)}")
+            progress.finish(failed=True)
+            logger.error("Render failed: %s", e)
             raise ValueError(f"Error generating video: {str(e)}")
+
+
+class VideoService:
+    """Service pour générer des vidéos.
+
+    Une seule instance est créée au démarrage de l'application (ou du worker)
+    et partagée par les requêtes: elle possède le moteur de rendu et les
+    caches, préparés par ``warm_up`` et arrêtés par ``shutdown``.
+    """
+
+    def __init__(
+        self,
+        engine: RenderEngine | None = None,
+        result_cache: ResultCache | None = None,
+        probe_cache: MediaProbeCache | None = None,
+        assets: AssetFetcher | None = None,
+    ):
+        """Initialise le service vidéo.
+
+        Args:
+            engine: Moteur de rendu (défaut: moteur partagé du processus)
+            result_cache: Cache des rendus terminés (None = chaque requête est rendue)
+            probe_cache: Cache des métadonnées des entrées (défaut: cache en mémoire du processus)
+            assets: Téléchargement des entrées distantes (défaut: résolveur partagé du processus)
+        """
+        self.resources_dir = settings.resources_dir
+        self.template_dir = os.path.join(self.resources_dir, "video-template")
+        self.engine = engine or get_render_engine()
+        self.result_cache = result_cache if settings.result_cache_enabled else None
+        self.probe_cache = probe_cache or get_probe_cache()
+        self.assets = assets or get_asset_fetcher()
+        self.renderer = VideoRenderer()
+        # Passe à True à la fin de warm_up (readiness)
+        self.ready = False
+        
+        # S'assurer que le répertoire de templates existe
+        os.makedirs(self.template_dir, exist_ok=True)
+
+    async def warm_up(self) -> None:
+        """Préparer le service avant les premiers rendus.
+        
+        Démarre les processus du moteur de rendu, normalise les templates
+        ``warm_templates`` (cadences et résolutions configurées) et décode les
+        musiques ``warm_music``. Une ressource qui ne peut pas être préparée est
+        signalée et ignorée: le rendu qui l'utilise la préparera lui-même. Le
+        service est prêt (``ready``) à la fin, même si une préparation a échoué.
+        """
+        start = time.perf_counter()
+        if settings.warm_render_processes:
+            await self.engine.start()
+        if settings.warm_templates:
+            warm_request = TemplateWarmRequest(
+                templates=settings.warm_templates,
+                fps=settings.warm_template_fps,
+                resolutions=settings.warm_template_resolutions,
+            )
+            for template_path in warm_request.templates:
+                try:
+                    await self.warm_templates(warm_request.model_copy(update={"templates": [template_path]}))
+                    logger.info("Template warmed: %s", template_path)
+                except Exception as e:
+                    logger.warning("Template not warmed: %s (%s)", template_path, e)
+        for music_path in settings.warm_music:
+            try:
+                await self._probe(music_path, "background music")
+                await self.engine.submit(self.renderer.prepare_assets, None, 30, resolve_profile(None), music_path, wait=True)
+                logger.info("Music warmed: %s", music_path)
+            except Exception as e:
+                logger.warning("Music not warmed: %s (%s)", music_path, e)
+        self.ready = True
+        logger.info("Video service ready (%.2fs)", time.perf_counter() - start)
+
+    async def shutdown(self) -> None:
+        """Arrêter le moteur de rendu (les rendus en cours sont attendus) et le client HTTP."""
+        self.ready = False
+        await self.engine.shutdown()
+        await self.assets.aclose()
+
+    async def resolve_inputs(self, request: VideoGenerationRequest) -> VideoGenerationRequest:
+        """Remplacer les URLs de la musique de fond et des images par des fichiers locaux.
+        
+        Les URLs http(s) sont téléchargées (ou lues depuis le cache des entrées)
+        en parallèle; les chemins locaux sont gardés tels quels.
+        
+        Args:
+            request: Requête de génération vidéo
+            
+        Returns:
+            Requête dont les entrées sont des chemins locaux (la même si aucune n'est une URL)
+            
+        Raises:
+            ValueError: Si un téléchargement échoue ou dépasse la taille maximale
+        """
+        images = request.images or []
+        remote_images = any(is_url(scene.url) for scene in images)
+        if not (is_url(request.background_music) or remote_images):
+            return request
+        music, *paths = await asyncio.gather(
+            self.assets.fetch(request.background_music or ""),
+            *(self.assets.fetch(scene.url or "") for scene in images),
+        )
+        updates: dict[str, object] = {"background_music": music or None}
+        if remote_images:
+            updates["images"] = [
+                scene.model_copy(update={"url": path or None}) for scene, path in zip(images, paths)
+            ]
+        return request.model_copy(update=updates)
+
+    async def _probe(self, path: str, kind: str) -> MediaInfo:
+        """Lire les métadonnées d'un fichier d'entrée depuis le cache des métadonnées.
+        
+        Raises:
+            ValueError: Si le fichier ne peut pas être lu par ffmpeg
+        """
+        try:
+            return await self.probe_cache.aprobe(path)
+        except (FFmpegError, OSError) as e:
+            raise ValueError(f"Unreadable {kind}: {path} ({e})") from None
+
+    async def _validate_template_path(self, template_path: str | None) -> str:
+        """Valider le chemin du template vidéo.
+        
+        Args:
+            template_path: Chemin du template spécifié
+            
+        Returns:
+            Chemin absolu du template validé
+            
+        Raises:
+            ValueError: Si le template n'existe pas ou n'a pas de piste vidéo
+        """
+        if not template_path:
+            raise ValueError("Video template path is required")
+        
+        if not os.path.exists(template_path):
+            raise ValueError(f"Video template not found: {template_path}")
+        
+        info = await self._probe(template_path, "video template")
+        if not info.has_video:
+            raise ValueError(f"Video template has no video stream: {template_path}")
+        
+        return template_path
+
+    async def validate_request(self, request: VideoGenerationRequest) -> VideoGenerationRequest:
+        """Vérifier que les fichiers d'entrée d'une requête existent et sont lisibles.
+        
+        Les entrées distantes sont d'abord téléchargées (voir ``resolve_inputs``).
+        Le template et la musique de fond sont sondés via le cache des
+        métadonnées: un fichier déjà vu (même taille, même mtime) n'est pas relu.
+        
+        Args:
+            request: Requête de génération vidéo
+            
+        Returns:
+            VideoGenerationRequest: Requête validée, dont les entrées sont des chemins locaux
+            
+        Raises:
+            ValueError: Si l'audio, le template ou une image n'existe pas, si une entrée distante
+                ne peut pas être téléchargée, si le template ou la musique ne sont pas lisibles,
+                ou si le profil est inconnu
+        """
+        request = await self.resolve_inputs(request)
+        if not os.path.exists(request.audio_path):
+            raise ValueError(f"Audio file not found: {request.audio_path}")
+        
+        if request.slideshow_images:
+            # Diaporama: le template n'est pas utilisé
+            for path in request.slideshow_images:
+                if not os.path.exists(path):
+                    raise ValueError(f"Image not found: {path}")
+        else:
+            await self._validate_template_path(request.video_template_path)
+        # Une musique introuvable est ignorée par le rendu; une musique illisible le ferait échouer
+        if request.background_music and os.path.exists(request.background_music):
+            info = await self._probe(request.background_music, "background music")
+            if not info.has_audio:
+                raise ValueError(f"Background music has no audio stream: {request.background_music}")
+        resolve_profile(request.resolution, request.profile)
+        return request
+
+    async def warm_templates(self, request: TemplateWarmRequest) -> TemplateWarmResponse:
+        """Préparer les encodages normalisés de templates dans le cache.
+        
+        Les encodages sont exécutés par le moteur de rendu (en attendant une
+        place libre) pour chaque combinaison template / cadence / résolution.
+        Les résolutions sont résolues par les profils d'encodage, comme pour
+        un rendu: "source" (ou null) correspond à la taille native.
+        
+        Args:
+            request: Templates, cadences et résolutions à préparer
+            
+        Returns:
+            TemplateWarmResponse: Encodages prêts dans le cache
+            
+        Raises:
+            ValueError: Si un template n'existe pas ou si une résolution est invalide
+        """
+        profiles = [resolve_profile(resolution) for resolution in request.resolutions]
+        entries = []
+        for template_path in request.templates:
+            await self._validate_template_path(template_path)
+            for fps in request.fps:
+                for resolution, profile in zip(request.resolutions, profiles):
+                    info = await self.engine.submit(
+                        self.renderer.warm_template, template_path, fps, profile, wait=True
+                    )
+                    entries.append(TemplateCacheEntry(
+                        template_path=template_path,
+                        fps=fps,
+                        resolution=resolution,
+                        cache_path=info.path,
+                        duration=info.duration,
+                    ))
+        return TemplateWarmResponse(entries=entries)
+
+    async def render_video(
+        self,
+        request: VideoGenerationRequest,
+        wait: bool = False,
+        progress_id: str | None = None,
+        validated: bool = False,
+    ) -> VideoGenerationResponse:
+        """Génère une vidéo dans un processus du moteur de rendu.
+        
+        Les entrées sont validées avant d'occuper une place dans le moteur,
+        puis le rendu est exécuté hors de la boucle d'événements. Une requête
+        identique (même contenu d'entrée et mêmes paramètres) à un rendu déjà
+        terminé ou en cours réutilise sa vidéo au lieu d'être rendue à nouveau.
+        
+        Args:
+            request: Requête de génération vidéo contenant les chemins et paramètres
+            wait: Attendre une place libre au lieu de refuser si le moteur est saturé
+            progress_id: Identifiant sous lequel publier la progression du rendu
+                (voir ``engine.progress``; None = non publiée)
+            validated: Requête déjà retournée par ``validate_request`` (ni téléchargée ni sondée à nouveau)
+            
+        Returns:
+            VideoGenerationResponse: Réponse avec les informations de la vidéo générée
+            
+        Raises:
+            ValueError: Si les fichiers nécessaires n'existent pas ou si le rendu échoue
+            TooManyRequestsException: Si le moteur de rendu est saturé
+        """
+        start = time.perf_counter()
+        timings: dict[str, float] = {}
+        try:
+            if not validated:
+                with span(logger, "validate", timings):
+                    request = await self.validate_request(request)
+            response = await self._render(request, wait, progress_id)
+        except TooManyRequestsException:
+            metrics.observe_render_failure(time.perf_counter() - start, rejected=True)
+            raise
+        except Exception:
+            metrics.observe_render_failure(time.perf_counter() - start)
+            raise
+        response.timings = {**timings, **response.timings}
+        metrics.observe_render(response, time.perf_counter() - start, request.video_absolute_path)
+        return response
+
+    async def _render(
+        self,
+        request: VideoGenerationRequest,
+        wait: bool,
+        progress_id: str | None,
+    ) -> VideoGenerationResponse:
+        """Rendre une requête validée, ou la servir depuis le cache des rendus."""
+        if self.result_cache is None or not request.cache:
+            return await self.engine.submit(self.renderer.render, request, progress_id, wait=wait)
+        response = await self.result_cache.get_or_render(
+            request, lambda: self.engine.submit(self.renderer.render, request, progress_id, wait=wait)
+        )
+        if response.render_path in ("cache", "coalesced"):
+            # Vidéo réutilisée: seule sa miniature (quelques images clés) est recréée, dans le
+            # budget CPU du moteur; un résultat en cache n'est jamais refusé faute de place
+            response.thumbnail = await self.engine.submit(
+                self.renderer.create_thumbnail, request, response.duration, wait=True
+            )
+        return response
+
+    async def _render_batch_item(
+        self,
+        index: int,
+        request: VideoGenerationRequest | Exception,
+        assets: Awaitable[None] | None,
+        batch_start: float,
+    ) -> VideoBatchItemResult:
+        """Rendre une requête d'un lot (ou rapporter l'échec du téléchargement de ses entrées)."""
+        try:
+            if isinstance(request, Exception):
+                raise request
+            # Requête invalide: erreur immédiate, sans attendre la préparation du groupe
+            request = await self.validate_request(request)
+            if assets is not None:
+                # Un échec de préparation n'empêche pas le rendu: il préparera lui-même
+                with contextlib.suppress(Exception):
+                    await asyncio.shield(assets)
+            result = await self.render_video(request, wait=True, validated=True)
+            return VideoBatchItemResult(
+                index=index, status="success", status_code=200, result=result, elapsed=time.time() - batch_start
+            )
+        except AppException as e:
+            status_code, error = e.status_code, e.message
+        except ValueError as e:
+            status_code, error = 400, str(e)
+        except Exception as e:
+            status_code, error = 500, f"Erreur lors de la génération de la vidéo: {str(e)}"
+        return VideoBatchItemResult(
+            index=index, status="error", status_code=status_code, error=error, elapsed=time.time() - batch_start
+        )
+
+    async def render_batch(self, batch: VideoBatchRequest) -> AsyncIterator[VideoBatchItemResult]:
+        """Générer un lot de vidéos, en renvoyant chaque résultat dès qu'il est prêt.
+        
+        Les entrées distantes des requêtes sont d'abord téléchargées, puis les
+        requêtes sont regroupées par ressources partagées (template, musique,
+        cadence, hauteur): chaque groupe prépare d'abord ses ressources une seule
+        fois dans le moteur de rendu, puis ses rendus sont soumis au moteur, qui
+        les répartit sur ses processus en attendant les places libres. Les
+        erreurs sont propres à chaque requête et n'interrompent pas le lot.
+        
+        Args:
+            batch: Lot de requêtes de génération
+            
+        Yields:
+            VideoBatchItemResult: Résultat de chaque requête, dans l'ordre de fin des rendus
+        """
+        batch_start = time.time()
+        # Musiques et images téléchargées avant le regroupement: une même URL est un même fichier local
+        resolved = await asyncio.gather(
+            *(self.resolve_inputs(request) for request in batch.requests), return_exceptions=True
+        )
+        requests: list[VideoGenerationRequest | Exception] = []
+        for outcome in resolved:
+            if isinstance(outcome, BaseException) and not isinstance(outcome, Exception):
+                raise outcome
+            requests.append(outcome)
+
+        groups: dict[tuple[str | None, str | None, int, EncodeProfile], list[int]] = {}
+        for index, request in enumerate(requests):
+            if isinstance(request, Exception):
+                continue
+            try:
+                profile = resolve_profile(request.resolution, request.profile)
+            except ValueError:
+                # Requête invalide: son rendu échouera à la validation, sans préparation
+                continue
+            music = request.background_music
+            key = (
+                None if request.slideshow_images else request.video_template_path,
+                music if music and os.path.exists(music) else None,
+                request.fps or 30,
+                profile,
+            )
+            groups.setdefault(key, []).append(index)
+
+        preparations: list[asyncio.Task[None]] = []
+        assets_of: dict[int, asyncio.Task[None]] = {}
+        for (template_path, music_path, fps, profile), indexes in groups.items():
+            if (template_path and os.path.exists(template_path)) or music_path:
+                logger.info(
+                    "Batch: %d renders share template=%s music=%s", len(indexes), template_path, music_path
+                )
+                task = asyncio.create_task(self.engine.submit(
+                    self.renderer.prepare_assets, template_path, fps, profile, music_path, wait=True
+                ))
+                preparations.append(task)
+                assets_of.update((index, task) for index in indexes)
+
+        items = [
+            asyncio.create_task(self._render_batch_item(index, request, assets_of.get(index), batch_start))
+            for index, request in enumerate(requests)
+        ]
+        try:
+            for next_item in asyncio.as_completed(items):
+                yield await next_item
+        finally:
+            # Client déconnecté: les rendus pas encore commencés sont abandonnés (le moteur garde
+            # leur place et leur budget jusqu'à la fin de ceux déjà confiés à un processus)
+            for pending in (*items, *preparations):
+                pending.cancel()
@@ -0,0 +1,116 @@
+"""Cache disque des pistes vidéo encodées, réutilisées quand seul l'audio change."""
+
+import hashlib
+import json
+import os
+from dataclasses import asdict
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.services.disk_cache import DiskCache
+from app.services.ffmpeg_encoder import EncodeSettings
+from app.services.ffmpeg_tools import MediaInfo, probe_media, run_ffmpeg
+
+logger = get_logger(__name__)
+
+
+class VideoTrackCache(DiskCache):
+    """Pistes vidéo (sans audio) des rendus encodés à partir d'un template.
+
+    Une piste ne dépend que du template, des paramètres d'encodage vidéo et du
+    nombre d'images: un nouveau rendu de même template et de même longueur
+    (à l'image près) ne fait que multiplexer son audio sur la piste en cache.
+    Les entrées sont indexées par (template source, taille, mtime, template
+    préparé, paramètres vidéo, nombre d'images) et accompagnées de leurs
+    métadonnées. Le template préparé n'est identifié que par son chemin: celui
+    d'un encodage normalisé en cache dépend déjà du template source, et son
+    mtime change à chaque usage.
+    """
+
+    suffix = ".mp4"
+
+    @classmethod
+    def from_settings(cls) -> "VideoTrackCache":
+        """Construire le cache à partir de la configuration."""
+        return cls(
+            cache_dir=os.path.join(settings.resources_dir, "video-track-cache"),
+            max_bytes=settings.video_track_cache_max_bytes,
+        )
+
+    def _key(self, template_path: str, prepared_path: str, encode: EncodeSettings, n_frames: int) -> str:
+        stat = os.stat(template_path)
+        identity = "|".join(str(part) for part in (
+            os.path.abspath(template_path), stat.st_size, stat.st_mtime_ns, os.path.abspath(prepared_path),
+            encode.fps, encode.height or "native", encode.video_codec, encode.preset,
+            encode.crf, encode.video_bitrate, encode.gop, " ".join(encode.extra_args), n_frames,
+        ))
+        return hashlib.sha1(identity.encode()).hexdigest()
+
+    def get(
+        self,
+        template_path: str,
+        prepared_path: str,
+        encode: EncodeSettings,
+        n_frames: int,
+    ) -> MediaInfo | None:
+        """Retourner la piste vidéo en cache pour ce template et cette longueur.
+
+        Args:
+            template_path: Template de la requête
+            prepared_path: Template (normalisé ou original) bouclé par le rendu
+            encode: Paramètres d'encodage de la sortie
+            n_frames: Nombre d'images de la sortie
+
+        Returns:
+            Métadonnées de la piste en cache, ou None
+        """
+        track_path, meta_path = self._paths(self._key(template_path, prepared_path, encode, n_frames))
+        try:
+            with open(meta_path) as meta_file:
+                info = MediaInfo(**json.load(meta_file))
+            self.touch(track_path)
+        except (OSError, ValueError, TypeError):
+            return None
+        return info
+
+    def add(
+        self,
+        template_path: str,
+        prepared_path: str,
+        encode: EncodeSettings,
+        n_frames: int,
+        video_path: str,
+    ) -> MediaInfo:
+        """Extraire la piste vidéo d'un rendu (copie de flux) et l'ajouter au cache.
+
+        Args:
+            template_path: Template de la requête
+            prepared_path: Template (normalisé ou original) bouclé par le rendu
+            encode: Paramètres d'encodage du rendu
+            n_frames: Nombre d'images du rendu
+            video_path: Vidéo produite par le rendu
+
+        Returns:
+            Métadonnées de la piste en cache
+
+        Raises:
+            FFmpegError: Si l'extraction échoue
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        track_path, meta_path = self._paths(self._key(template_path, prepared_path, encode, n_frames))
+        tmp_suffix = self._tmp_suffix()
+        run_ffmpeg([
+            "-i", video_path,
+            "-map", "0:v:0", "-an", "-c:v", "copy",
+            "-movflags", "+faststart",
+            "-f", "mp4", track_path + tmp_suffix,
+        ])
+        info = probe_media(track_path + tmp_suffix)
+        info = MediaInfo(**{**asdict(info), "path": track_path})
+        with open(meta_path + tmp_suffix, "w") as meta_file:
+            json.dump(asdict(info), meta_file)
+        os.replace(track_path + tmp_suffix, track_path)
+        os.replace(meta_path + tmp_suffix, meta_path)
+
+        self.evict(keep=track_path)
+        return info
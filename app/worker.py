@@ -0,0 +1,76 @@
+"""Standalone render job worker entry point.
+
+Runs the job queue consumer without the HTTP API, so render workers can be
+scaled independently of API workers::
+
+    python -m app.worker
+"""
+
+import asyncio
+import signal
+
+from prometheus_client import start_http_server
+
+from app.core import database
+from app.core.config import settings
+from app.core.logging import get_logger, setup_logging
+from app.repositories.job_repository import create_job_repository
+from app.repositories.media_probe_repository import create_media_probe_repository
+from app.repositories.render_result_repository import create_render_result_repository
+from app.services import metrics
+from app.services.job_worker import JobWorker
+from app.services.probe_cache import MediaProbeCache
+from app.services.render_engine import get_render_engine
+from app.services.result_cache import ResultCache
+from app.services.video_service import VideoService
+
+setup_logging()
+logger = get_logger(__name__)
+
+
+async def run_worker() -> None:
+    """Consume render jobs until SIGINT/SIGTERM."""
+    await database.connect_to_mongo()
+
+    repository = create_job_repository()
+    await repository.ensure_indexes()
+    if settings.worker_metrics_port:
+        metrics.bind_engine(get_render_engine())
+        start_http_server(settings.worker_metrics_port)
+        logger.info("Worker metrics served on port %d", settings.worker_metrics_port)
+    probe_repository = create_media_probe_repository()
+    if probe_repository is not None:
+        await probe_repository.ensure_indexes()
+    video_service = VideoService(
+        result_cache=ResultCache.from_settings(create_render_result_repository()),
+        probe_cache=MediaProbeCache.from_settings(probe_repository),
+    )
+    # Jobs are consumed once the render processes, templates and music are ready
+    await video_service.warm_up()
+    worker = JobWorker(
+        repository,
+        video_service,
+        concurrency=settings.job_worker_concurrency,
+        poll_interval=settings.job_poll_interval,
+        progress_interval=settings.job_progress_interval,
+        heartbeat_interval=settings.job_heartbeat_interval,
+        stale_after=settings.job_stale_after,
+    )
+
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop_event.set)
+
+    await worker.start()
+    try:
+        await stop_event.wait()
+    finally:
+        logger.info("Stopping render job worker")
+        await worker.stop()
+        await video_service.shutdown()
+        await database.close_mongo_connection()
+
+
+if __name__ == "__main__":
+    asyncio.run(run_worker())
@@ -0,0 +1,439 @@
+#!/usr/bin/env python3
+"""Banc d'essai reproductible du rendu vidéo.
+
+Les entrées (template, voix, musique, images) sont synthétisées localement
+par ffmpeg aux durées et tailles demandées, puis ``VideoService.render_video``
+est exécuté pour chaque combinaison de chemin de rendu, profil d'encodage,
+threads par rendu et nombre de rendus simultanés. Chaque scénario tourne dans
+un processus neuf (caches et compteurs système vierges) et rapporte en JSON:
+temps réel, facteur temps réel, secondes CPU, RSS maximal et taille des sorties.
+
+Exemples::
+
+    python -m benchmarks.render_benchmark --durations 10 60 --backends ffmpeg moviepy
+    python -m benchmarks.render_benchmark --output bench.json
+    python -m benchmarks.render_benchmark --baseline bench.json --tolerance 0.2
+
+Avec ``--baseline``, le code de sortie vaut 1 si un scénario est plus lent
+(temps réel médian ou secondes CPU) que la référence au-delà de la tolérance.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import itertools
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from multiprocessing import get_context
+from typing import Any
+
+# Exécution directe du script (python benchmarks/render_benchmark.py)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Les modules de l'application ne sont importés que dans les fonctions: la
+# configuration est lue à l'import, après l'installation de l'environnement du
+# scénario dans son processus.
+
+BACKENDS = ("ffmpeg", "moviepy", "stream_copy", "slideshow")
+
+# Métriques comparées à la référence (plus petit = meilleur)
+COMPARED_METRICS = ("wall_seconds_median", "render_cpu_seconds")
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """Une configuration de rendu mesurée."""
+
+    backend: str
+    profile: str
+    duration: float
+    threads: int
+    concurrency: int
+    music: bool
+    fps: int
+    repeat: int
+    warmup: bool
+
+    @property
+    def name(self) -> str:
+        music = "+music" if self.music else ""
+        return (
+            f"{self.backend}{music}/{self.profile}/{self.duration:g}s/{self.fps}fps"
+            f"/t{self.threads}/c{self.concurrency}"
+        )
+
+
+@dataclass(frozen=True)
+class Inputs:
+    """Fichiers d'entrée synthétisés, partagés par les scénarios."""
+
+    template: str
+    voices: dict[str, str]
+    music: str
+    images: list[str]
+
+
+def _ffmpeg(args: list[str]) -> None:
+    from app.services.ffmpeg_tools import run_ffmpeg
+
+    run_ffmpeg(args)
+
+
+def _synthesize(path: str, args: list[str]) -> str:
+    """Créer ``path`` avec ffmpeg s'il n'existe pas encore (écriture atomique)."""
+    if not os.path.exists(path):
+        tmp_path = f"{path}.tmp{os.path.splitext(path)[1]}"
+        _ffmpeg([*args, tmp_path])
+        os.replace(tmp_path, path)
+    return path
+
+
+def synthesize_inputs(
+    work_dir: str,
+    durations: list[float],
+    template_size: str,
+    template_duration: float,
+    fps: int,
+    n_images: int,
+) -> Inputs:
+    """Synthétiser les entrées des scénarios dans ``work_dir`` (réutilisées d'une exécution à l'autre).
+
+    Le template est une mire animée en H.264 à la cadence des rendus (la copie
+    de flux est donc possible), la voix une tonalité modulée mono en MP3, la
+    musique un accord stéréo bouclé et les images des mires fixes.
+
+    Args:
+        work_dir: Répertoire des entrées
+        durations: Durées des voix en secondes
+        template_size: Taille du template (LARGEURxHAUTEUR)
+        template_duration: Durée du template en secondes (bouclé par le rendu)
+        fps: Cadence du template
+        n_images: Nombre d'images des diaporamas
+
+    Returns:
+        Inputs: Chemins des entrées
+    """
+    os.makedirs(work_dir, exist_ok=True)
+    width, height = template_size.lower().split("x")
+    template = _synthesize(
+        os.path.join(work_dir, f"template_{width}x{height}_{fps}fps_{template_duration:g}s.mp4"),
+        [
+            "-f", "lavfi", "-i", f"testsrc2=size={width}x{height}:rate={fps}:duration={template_duration:g}",
+            "-c:v", "libx264", "-preset", "veryfast", "-pix_fmt", "yuv420p", "-g", str(2 * fps),
+        ],
+    )
+    voices = {
+        f"{duration:g}": _synthesize(
+            os.path.join(work_dir, f"voice_{duration:g}s.mp3"),
+            [
+                "-f", "lavfi",
+                "-i", f"aevalsrc=0.4*sin(2*PI*180*t)*(0.6+0.4*sin(2*PI*3*t)):s=44100:d={duration:g}",
+                "-ac", "1", "-c:a", "libmp3lame", "-b:a", "128k",
+            ],
+        )
+        for duration in durations
+    }
+    music = _synthesize(
+        os.path.join(work_dir, "music_30s.mp3"),
+        [
+            "-f", "lavfi",
+            "-i", "aevalsrc=0.2*sin(2*PI*262*t)+0.2*sin(2*PI*330*t)|0.2*sin(2*PI*392*t):s=44100:d=30",
+            "-c:a", "libmp3lame", "-b:a", "192k",
+        ],
+    )
+    images = [
+        _synthesize(
+            os.path.join(work_dir, f"image_{index}_{width}x{height}.jpg"),
+            ["-f", "lavfi", "-i", f"testsrc2=size={width}x{height}:rate=1", "-ss", str(index), "-frames:v", "1"],
+        )
+        for index in range(n_images)
+    ]
+    return Inputs(template, voices, music, images)
+
+
+def _cpu_seconds() -> float:
+    """Secondes CPU (utilisateur + système) du processus et de ses enfants terminés."""
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+
+
+def _peak_rss_bytes() -> int:
+    """RSS maximal du processus ou de l'un de ses descendants terminés."""
+    peak = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+    # Kio sous Linux, octets sous macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _noop(threads: int | None = None) -> None:
+    time.sleep(0.2)
+
+
+def _build_request(scenario: Scenario, inputs: Inputs, output_dir: str, index: int) -> Any:
+    from app.models.video_model import ImageScene, VideoGenerationRequest
+
+    name = f"render_{index}.mp4"
+    fields: dict[str, Any] = {
+        "audio_path": inputs.voices[f"{scenario.duration:g}"],
+        "video_absolute_path": os.path.join(output_dir, name),
+        "video_relative_path": name,
+        "profile": scenario.profile,
+        "fps": scenario.fps,
+        "cache": False,
+        "thumbnail": None,
+        "stream_copy": scenario.backend == "stream_copy",
+    }
+    if scenario.backend == "slideshow":
+        fields["images"] = [ImageScene(prompt=f"scene {i}", url=path) for i, path in enumerate(inputs.images)]
+    else:
+        fields["video_template_path"] = inputs.template
+    if scenario.backend in ("ffmpeg", "moviepy"):
+        fields["encoder"] = scenario.backend
+    if scenario.music:
+        fields["background_music"] = inputs.music
+    return VideoGenerationRequest(**fields)
+
+
+async def _measure(scenario: Scenario, inputs: Inputs, output_dir: str) -> dict[str, Any]:
+    from app.services.cpu_budget import CpuBudget
+    from app.services.render_engine import RenderEngine
+    from app.services.video_service import VideoService
+
+    def engine() -> RenderEngine:
+        return RenderEngine(
+            max_workers=scenario.concurrency,
+            max_in_flight=scenario.concurrency,
+            cpu_budget=CpuBudget(scenario.threads * scenario.concurrency, 1, scenario.threads),
+        )
+
+    # Rendu de chauffe (template normalisé en cache, imports faits), hors mesure
+    if scenario.warmup:
+        warmup = engine()
+        try:
+            await VideoService(engine=warmup).render_video(
+                _build_request(scenario, inputs, output_dir, -1), wait=True
+            )
+        finally:
+            await warmup.shutdown()
+
+    # Coût de démarrage des processus de rendu, retiré des secondes CPU des rendus
+    startup_cpu = _cpu_seconds()
+    idle = engine()
+    try:
+        await asyncio.gather(*(idle.submit(_noop, wait=True) for _ in range(scenario.concurrency)))
+    finally:
+        await idle.shutdown()
+    startup_cpu = _cpu_seconds() - startup_cpu
+
+    cpu_start = _cpu_seconds()
+    measured = engine()
+    service = VideoService(engine=measured)
+    walls: list[float] = []
+    responses = []
+    try:
+        for _ in range(scenario.repeat):
+            requests = [_build_request(scenario, inputs, output_dir, i) for i in range(scenario.concurrency)]
+            start = time.perf_counter()
+            responses += await asyncio.gather(*(service.render_video(request, wait=True) for request in requests))
+            walls.append(time.perf_counter() - start)
+            output_bytes = [os.path.getsize(request.video_absolute_path) for request in requests]
+    finally:
+        # Les processus de rendu (et leurs ffmpeg) ne sont comptés qu'une fois terminés
+        await measured.shutdown()
+    cpu = _cpu_seconds() - cpu_start
+
+    video_seconds = sum(response.duration for response in responses)
+    renders = len(responses)
+    stages: dict[str, float] = {}
+    for response in responses:
+        for stage, seconds in (response.timings or {}).items():
+            stages[stage] = stages.get(stage, 0.0) + seconds / renders
+    return {
+        "renders": renders,
+        "render_paths": sorted({response.render_path for response in responses if response.render_path}),
+        "video_seconds": round(video_seconds, 3),
+        "wall_seconds": [round(wall, 3) for wall in walls],
+        "wall_seconds_median": round(statistics.median(walls), 3),
+        # Secondes de vidéo produites par seconde écoulée, tous rendus simultanés confondus
+        "realtime_factor": round(video_seconds / sum(walls), 3),
+        "cpu_seconds": round(cpu, 3),
+        "startup_cpu_seconds": round(startup_cpu, 3),
+        "render_cpu_seconds": round(max(0.0, cpu - startup_cpu), 3),
+        "cpu_seconds_per_video_second": round(max(0.0, cpu - startup_cpu) / video_seconds, 3),
+        "peak_rss_bytes": _peak_rss_bytes(),
+        "output_bytes": round(statistics.mean(output_bytes)),
+        "stage_seconds": {stage: round(seconds, 3) for stage, seconds in stages.items()},
+    }
+
+
+def run_scenario(scenario: Scenario, inputs: Inputs, work_dir: str) -> dict[str, Any]:
+    """Mesurer un scénario (exécuté dans un processus dédié).
+
+    Les caches de l'application sont placés dans un répertoire propre au
+    scénario; le cache des pistes vidéo est désactivé pour que chaque rendu
+    encode réellement sa vidéo. Les journaux des rendus sont redirigés vers
+    la sortie d'erreur, la sortie standard étant réservée au rapport JSON.
+
+    Args:
+        scenario: Configuration à mesurer
+        inputs: Entrées synthétisées
+        work_dir: Répertoire de travail du scénario
+
+    Returns:
+        Mesures du scénario
+    """
+    os.environ.update({
+        "RESOURCES_DIR": os.path.join(work_dir, "resources"),
+        "SCRATCH_DIR": os.path.join(work_dir, "scratch"),
+        "VIDEO_TRACK_CACHE_ENABLED": "false",
+        "RESULT_CACHE_ENABLED": "false",
+    })
+    output_dir = os.path.join(work_dir, "output")
+    os.makedirs(output_dir, exist_ok=True)
+    sys.stdout.flush()
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    return asyncio.run(_measure(scenario, inputs, output_dir))
+
+
+def build_scenarios(args: argparse.Namespace) -> list[Scenario]:
+    """Produit cartésien des configurations demandées."""
+    return [
+        Scenario(backend, profile, duration, threads, concurrency, music, args.fps, args.repeat, not args.no_warmup)
+        for backend, profile, duration, threads, concurrency, music in itertools.product(
+            args.backends, args.profiles, args.durations, args.threads, args.concurrency,
+            [False, True] if args.music == "both" else [args.music == "on"],
+        )
+    ]
+
+
+def environment() -> dict[str, Any]:
+    """Description de la machine et du code mesurés, pour comparer des rapports comparables."""
+    from app.services.cpu_budget import available_cpus
+    from app.services.ffmpeg_tools import get_ffmpeg_binary
+
+    version = subprocess.run([get_ffmpeg_binary(), "-version"], capture_output=True, text=True).stdout
+    commit = subprocess.run(
+        ["git", "rev-parse", "--short", "HEAD"],
+        capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)),
+    ).stdout.strip()
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "available_cpus": available_cpus(),
+        "ffmpeg": version.splitlines()[0] if version else None,
+        "commit": commit or None,
+    }
+
+
+def compare(report: dict[str, Any], baseline: dict[str, Any], tolerance: float) -> list[str]:
+    """Lister les scénarios plus lents que la référence au-delà de la tolérance.
+
+    Args:
+        report: Rapport de l'exécution courante
+        baseline: Rapport de référence
+        tolerance: Dégradation relative admise (0.2 = 20 %)
+
+    Returns:
+        Description des régressions (vide si aucune)
+    """
+    reference = {entry["name"]: entry for entry in baseline.get("scenarios", []) if "error" not in entry}
+    regressions = []
+    for entry in report["scenarios"]:
+        before = reference.get(entry["name"])
+        if before is None or "error" in entry:
+            continue
+        for metric in COMPARED_METRICS:
+            old, new = before[metric], entry[metric]
+            if old > 0 and new > old * (1 + tolerance):
+                regressions.append(f"{entry['name']}: {metric} {old} -> {new} (+{(new / old - 1):.0%})")
+    return regressions
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Banc d'essai du rendu vidéo (rapport JSON)")
+    parser.add_argument("--durations", type=float, nargs="+", default=[10.0, 60.0],
+                        help="Durées des voix en secondes (défaut: 10 60)")
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=["ffmpeg", "moviepy", "stream_copy"],
+                        help="Chemins de rendu (défaut: ffmpeg moviepy stream_copy)")
+    parser.add_argument("--profiles", nargs="+", default=["720p"],
+                        help="Profils d'encodage (résolution, preset, débit), voir encode_profiles (défaut: 720p)")
+    parser.add_argument("--threads", type=int, nargs="+", default=[2],
+                        help="Threads d'encodage par rendu (défaut: 2)")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1],
+                        help="Rendus simultanés (défaut: 1)")
+    parser.add_argument("--music", choices=("off", "on", "both"), default="off",
+                        help="Musique de fond (défaut: off)")
+    parser.add_argument("--fps", type=int, default=30, help="Cadence des rendus et du template (défaut: 30)")
+    parser.add_argument("--template-size", default="1920x1080", help="Taille du template (défaut: 1920x1080)")
+    parser.add_argument("--template-duration", type=float, default=10.0,
+                        help="Durée du template bouclé, en secondes (défaut: 10)")
+    parser.add_argument("--images", type=int, default=5, help="Images des diaporamas (défaut: 5)")
+    parser.add_argument("--repeat", type=int, default=3, help="Mesures par scénario (défaut: 3)")
+    parser.add_argument("--no-warmup", action="store_true", help="Ne pas faire de rendu de chauffe")
+    parser.add_argument("--work-dir", default=os.path.join(tempfile.gettempdir(), "render-benchmark"),
+                        help="Entrées synthétisées et sorties (défaut: <tmp>/render-benchmark)")
+    parser.add_argument("--output", help="Fichier du rapport JSON (défaut: sortie standard)")
+    parser.add_argument("--baseline", help="Rapport de référence à comparer")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="Dégradation admise par rapport à la référence (défaut: 0.2)")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    scenarios = build_scenarios(args)
+    inputs = synthesize_inputs(
+        os.path.join(args.work_dir, "inputs"), args.durations, args.template_size, args.template_duration,
+        args.fps, args.images,
+    )
+
+    results = []
+    for index, scenario in enumerate(scenarios, start=1):
+        print(f"[{index}/{len(scenarios)}] {scenario.name}", file=sys.stderr)
+        entry: dict[str, Any] = {"name": scenario.name, **asdict(scenario)}
+        with tempfile.TemporaryDirectory(dir=args.work_dir, prefix="scenario-") as work_dir:
+            # Un processus par scénario: compteurs rusage et caches vierges
+            with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as executor:
+                try:
+                    entry.update(executor.submit(run_scenario, scenario, inputs, work_dir).result())
+                except Exception as e:
+                    entry["error"] = f"{type(e).__name__}: {e}"
+        summary = {key: entry[key] for key in ("wall_seconds_median", "realtime_factor", "render_cpu_seconds", "error") if key in entry}
+        print(f"    {json.dumps(summary)}", file=sys.stderr)
+        results.append(entry)
+
+    report = {"environment": environment(), "scenarios": results}
+    with open(args.output, "w") if args.output else contextlib.nullcontext(sys.stdout) as out:
+        json.dump(report, out, indent=2)
+        out.write("\n")
+
+    failed = any("error" in entry for entry in results)
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+        if baseline.get("environment", {}).get("cpu_count") != report["environment"]["cpu_count"]:
+            print("WARNING baseline was measured on a different machine", file=sys.stderr)
+        regressions = compare(report, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        failed = failed or bool(regressions)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
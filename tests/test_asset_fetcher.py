@@ -0,0 +1,166 @@
+"""Tests du résolveur d'entrées distantes contre un serveur HTTP local."""
+
+import asyncio
+import hashlib
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from app.services.asset_fetcher import AssetFetchError, AssetFetcher, AssetStore
+
+
+class StandInServer(ThreadingHTTPServer):
+    """Serveur de fichiers en mémoire qui gère ETag, If-None-Match et les redirections."""
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), StandInHandler)
+        self.files: dict[str, bytes] = {}
+        self.redirects: dict[str, str] = {}
+        self.unsized: set[str] = set()
+        self.requests: list[tuple[str, int]] = []
+
+    def url(self, path: str) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}{path}"
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    server: StandInServer
+
+    def do_GET(self) -> None:
+        status = self._respond()
+        self.server.requests.append((self.path, status))
+
+    def _respond(self) -> int:
+        if self.path in self.server.redirects:
+            self.send_response(302)
+            self.send_header("Location", self.server.redirects[self.path])
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return 302
+        body = self.server.files.get(self.path)
+        if body is None:
+            self.send_error(404)
+            return 404
+        etag = f'"{hashlib.md5(body).hexdigest()}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return 304
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        if self.path not in self.server.unsized:
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        return 200
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+@pytest.fixture
+def server() -> Iterator[StandInServer]:
+    stand_in = StandInServer()
+    thread = threading.Thread(target=stand_in.serve_forever, daemon=True)
+    thread.start()
+    yield stand_in
+    stand_in.shutdown()
+    stand_in.server_close()
+
+
+def make_fetcher(
+    cache_dir: Path, max_download_bytes: int = 1024 * 1024, revalidate_after: float = 300.0
+) -> AssetFetcher:
+    return AssetFetcher(
+        AssetStore(str(cache_dir), max_bytes=10 * 1024 * 1024),
+        max_download_bytes=max_download_bytes,
+        timeout=5.0,
+        revalidate_after=revalidate_after,
+    )
+
+
+def fetch_all(fetcher: AssetFetcher, *sources: str) -> list[str]:
+    async def run() -> list[str]:
+        try:
+            return list(await asyncio.gather(*(fetcher.fetch(source) for source in sources)))
+        finally:
+            await fetcher.aclose()
+
+    return asyncio.run(run())
+
+
+def test_cache_hit_is_served_without_a_request(server: StandInServer, tmp_path: Path) -> None:
+    server.files["/music.mp3"] = b"music" * 1000
+    fetcher = make_fetcher(tmp_path)
+
+    first, second = fetch_all(fetcher, server.url("/music.mp3"), server.url("/music.mp3"))
+    third, = fetch_all(fetcher, server.url("/music.mp3"))
+
+    assert first == second == third
+    with open(first, "rb") as cached:
+        assert cached.read() == server.files["/music.mp3"]
+    # Demandes simultanées regroupées, puis URL servie depuis le cache
+    assert server.requests == [("/music.mp3", 200)]
+
+
+def test_stale_entry_is_revalidated_with_its_etag(server: StandInServer, tmp_path: Path) -> None:
+    server.files["/image.jpg"] = b"image-v1"
+    fetcher = make_fetcher(tmp_path, revalidate_after=0.0)
+
+    first, = fetch_all(fetcher, server.url("/image.jpg"))
+    second, = fetch_all(fetcher, server.url("/image.jpg"))
+    assert second == first
+    assert server.requests == [("/image.jpg", 200), ("/image.jpg", 304)]
+
+    server.files["/image.jpg"] = b"image-v2"
+    third, = fetch_all(fetcher, server.url("/image.jpg"))
+    assert third != first
+    with open(third, "rb") as cached:
+        assert cached.read() == b"image-v2"
+
+
+@pytest.mark.parametrize("declared", [True, False], ids=["content-length", "streamed"])
+def test_oversized_download_is_rejected(server: StandInServer, tmp_path: Path, declared: bool) -> None:
+    server.files["/big.mp3"] = b"x" * 4096
+    if not declared:
+        server.unsized.add("/big.mp3")
+    fetcher = make_fetcher(tmp_path, max_download_bytes=1024)
+
+    with pytest.raises(AssetFetchError, match="larger than 1024 bytes"):
+        fetch_all(fetcher, server.url("/big.mp3"))
+    # Ni contenu ni fichier temporaire laissé dans le cache
+    assert not [name for _, _, files in os.walk(tmp_path) for name in files]
+
+
+def test_redirect_is_followed_and_cached_under_the_requested_url(server: StandInServer, tmp_path: Path) -> None:
+    server.files["/final.mp3"] = b"redirected"
+    server.redirects["/short"] = server.url("/final.mp3")
+    fetcher = make_fetcher(tmp_path)
+
+    path, = fetch_all(fetcher, server.url("/short"))
+    again, = fetch_all(fetcher, server.url("/short"))
+
+    assert path == again
+    with open(path, "rb") as cached:
+        assert cached.read() == b"redirected"
+    assert server.requests == [("/short", 302), ("/final.mp3", 200)]
+
+
+def test_http_error_is_reported(server: StandInServer, tmp_path: Path) -> None:
+    fetcher = make_fetcher(tmp_path)
+
+    with pytest.raises(AssetFetchError, match="HTTP 404"):
+        fetch_all(fetcher, server.url("/missing.mp3"))
+
+
+def test_local_paths_are_returned_unchanged(tmp_path: Path) -> None:
+    fetcher = make_fetcher(tmp_path)
+
+    assert fetch_all(fetcher, "/data/voice.mp3", "file:///data/music%20bed.mp3") == [
+        "/data/voice.mp3", "/data/music bed.mp3",
+    ]
@@ -0,0 +1,47 @@
+"""Tests de l'encodage segmenté sur des entrées synthétisées par ffmpeg."""
+
+from pathlib import Path
+
+import pytest
+
+from app.services.audio_mixer import SAMPLE_RATE
+from app.services.ffmpeg_encoder import AudioSource, EncodeSettings, FFmpegEncoder
+from app.services.ffmpeg_tools import MediaInfo, count_video_frames, probe_media, run_ffmpeg
+from app.services.progress import total_frames
+from app.services.segmented_encoder import SegmentedEncoder, plan_segments
+
+FPS = 30
+
+
+@pytest.fixture(scope="module")
+def template(tmp_path_factory: pytest.TempPathFactory) -> MediaInfo:
+    path = tmp_path_factory.mktemp("template") / "template.mp4"
+    run_ffmpeg([
+        "-f", "lavfi", "-i", f"testsrc=size=160x90:rate={FPS}:duration=1",
+        "-c:v", "libx264", "-preset", "ultrafast", "-pix_fmt", "yuv420p", str(path),
+    ])
+    return probe_media(str(path))
+
+
+def make_voice(path: Path, samples: int) -> AudioSource:
+    run_ffmpeg([
+        "-f", "lavfi", "-i", f"sine=frequency=440:sample_rate={SAMPLE_RATE}",
+        "-af", f"atrim=end_sample={samples}", "-c:a", "pcm_s16le", str(path),
+    ])
+    return AudioSource(["-i", str(path)])
+
+
+# 176418 échantillons = 4.000408 s: la dernière image commence avant la fin de l'audio
+@pytest.mark.parametrize("samples", [176400, 176418], ids=["whole-frames", "partial-last-frame"])
+def test_output_has_every_planned_frame(template: MediaInfo, tmp_path: Path, samples: int) -> None:
+    voice = make_voice(tmp_path / "voice.wav", samples)
+    n_frames = total_frames(samples / SAMPLE_RATE, FPS)
+    output = tmp_path / "out.mp4"
+    encode = EncodeSettings(fps=FPS, preset="ultrafast", gop=FPS)
+
+    segments = SegmentedEncoder(FFmpegEncoder()).encode(
+        template, [voice], str(output), n_frames, encode, str(tmp_path), segment_frames=2 * FPS, workers=2,
+    )
+
+    assert segments == len(plan_segments(n_frames, 2 * FPS, FPS))
+    assert count_video_frames(str(output)) == n_frames